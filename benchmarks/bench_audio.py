@@ -0,0 +1,70 @@
+"""Pronunciation clip cache and playback latency.
+
+Times a cache miss (stand-in TTS render plus store) against a hit, what
+opening a player on a new cache directory, ``play`` and ``prewarm`` cost
+the calling (Tk) thread, and replays a
+learning session: each card prewarms the ones after it, the learner reads
+for ``--dwell-ms``, then presses Listen. Reports how often that clip was
+already on disk. Playback uses a silent backend.
+
+Usage: python -m benchmarks.bench_audio [--words 200] [--repeat 200] [--dwell-ms 300]
+"""
+import argparse
+import itertools
+import os
+import tempfile
+import time
+
+from benchmarks.common import time_calls
+from src.audio import AudioCache, AudioPlayer
+from src.vocabulary_app import AUDIO_PREWARM
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--dwell-ms', type=float, default=300, help="time spent on each card")
+    args = parser.parse_args()
+
+    words = [(f"word{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}{chr(97 + i // 676 % 26)}",
+              f"WURD-{chr(97 + i % 26)}") for i in range(args.words)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp)
+        misses = iter(words)
+        cases = [
+            ('clip (miss)', lambda: cache.clip(*next(misses)), min(args.repeat, args.words // 2)),
+            ('clip (hit)', lambda: cache.clip(*words[0]), args.repeat),
+        ]
+        player = AudioPlayer(cache, backend=lambda path: None)
+        fresh = (os.path.join(tmp, f'fresh{n}') for n in itertools.count())
+        opened = []
+        cases += [
+            ('open (caller)', lambda: opened.append(AudioPlayer(AudioCache(next(fresh)),
+                                                                backend=lambda path: None)), args.repeat),
+            ('play (caller)', lambda: player.play(*words[0]), args.repeat),
+            ('prewarm (caller)', lambda: player.prewarm(words[:AUDIO_PREWARM]), args.repeat),
+        ]
+        print(f"{'call':<20}{'p50':>10}{'p99':>10}")
+        for name, fn, repeat in cases:
+            r = time_calls(fn, repeat)
+            print(f"{name:<20}{r['p50_ms']:>8.3f}ms{r['p99_ms']:>8.3f}ms")
+        for opened_player in [player] + opened:
+            opened_player.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        player = AudioPlayer(AudioCache(tmp), backend=lambda path: None)
+        session = words[:min(args.words, 30)]
+        hits = 0
+        for i, word in enumerate(session):
+            player.prewarm(session[i:i + 1 + AUDIO_PREWARM])
+            time.sleep(args.dwell_ms / 1000)
+            hits += player.cache.lookup(*word) is not None
+            player.play(*word)
+        player.close()
+    print(f"\nListen pressed after {args.dwell_ms:.0f}ms on each of {len(session)} cards: "
+          f"{hits}/{len(session)} clips already cached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Per-call latency of connect-per-call access versus the pooled VocabularyDatabase.
+
+Usage: python -m benchmarks.bench_connection_pool [--words 100000] [--repeat 200]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.common import build_database, time_calls
+
+
+def legacy_get_daily_words(db_path: str, count: int = 5):
+    """The pre-pool access pattern: open, query, close"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation,
+               up.mastery_level, up.correct_answers, up.total_attempts
+        FROM vocabulary v
+        LEFT JOIN user_progress up ON v.id = up.word_id
+        WHERE up.mastery_level < 3 OR up.mastery_level IS NULL
+        ORDER BY up.last_reviewed ASC, v.id ASC
+        LIMIT ?
+    ''', (count,))
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def legacy_record_quiz_result(db_path: str, word_id: int):
+    """The pre-pool write pattern: open, insert, commit, close"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        INSERT INTO quiz_results (word_id, answered_at, is_correct, response_time_seconds)
+        VALUES (?, ?, ?, ?)
+    ''', (word_id, int(time.time()), True, 1.0))
+    conn.commit()
+    conn.close()
+
+
+def legacy_user_count(db_path: str):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute('SELECT COUNT(*) FROM user_progress WHERE total_attempts > 0').fetchone()[0]
+    conn.close()
+    return count
+
+
+def pooled_user_count(db):
+    with db.connection() as conn:
+        return conn.execute('SELECT COUNT(*) FROM user_progress WHERE total_attempts > 0').fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        db = build_database(db_path, args.words)
+
+        cases = [
+            ('get_daily_words', lambda: legacy_get_daily_words(db_path), lambda: db.get_daily_words(5)),
+            ('record_quiz_result', lambda: legacy_record_quiz_result(db_path, 1),
+             lambda: db.record_quiz_result(1, True, 1.0)),
+            ('count_learned', lambda: legacy_user_count(db_path), lambda: pooled_user_count(db)),
+        ]
+        print(f"{'call':<22}{'before p50':>12}{'after p50':>12}{'speedup':>10}")
+        for name, before, after in cases:
+            b = time_calls(before, args.repeat)
+            a = time_calls(after, args.repeat)
+            print(f"{name:<22}{b['p50_ms']:>10.3f}ms{a['p50_ms']:>10.3f}ms{b['p50_ms'] / a['p50_ms']:>9.1f}x")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
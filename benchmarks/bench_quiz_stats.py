@@ -0,0 +1,67 @@
+"""Per-answer cost of the legacy whole-file stats.json versus the append-only StatsStore.
+
+Usage: python -m benchmarks.bench_quiz_stats [--words 100000] [--repeat 10000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import time_calls
+from stats_store import StatsStore
+
+
+def legacy_update_stats(path: str, word: str, correct: bool):
+    """The old quiz_manager.update_stats: parse and rewrite the whole file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        stats = json.load(f)
+    if word not in stats:
+        stats[word] = {"correct": 0, "wrong": 0}
+    stats[word]["correct" if correct else "wrong"] += 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=10000)
+    parser.add_argument('--legacy-repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(args.words)]
+    stats = {word: {"correct": rng.randint(0, 9), "wrong": rng.randint(0, 9)} for word in words}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "stats.json")
+        with open(legacy_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+        start = time.perf_counter()
+        store = StatsStore(os.path.join(tmp, "store"), legacy_file=legacy_path)
+        print(f"{'migrate stats.json':<24} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        results = {
+            'legacy update_stats': time_calls(
+                lambda: legacy_update_stats(legacy_path, rng.choice(words), rng.random() < 0.7),
+                args.legacy_repeat),
+            'log record': time_calls(
+                lambda: store.record(rng.choice(words), rng.random() < 0.7), args.repeat),
+            'compact': time_calls(store.compact, 5),
+        }
+        store.close()
+
+        start = time.perf_counter()
+        StatsStore(os.path.join(tmp, "store")).close()
+        print(f"{'reopen + replay':<24} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    print(f"{args.words} distinct words")
+    for name, r in results.items():
+        print(f"{name:<24} mean {r['mean_ms']:8.3f} ms  p50 {r['p50_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Latency of VocabularySearch: autocomplete, full-text, fuzzy and search-box lookup.
+
+Builds a vocabulary of random letter-frequency words with definitions and
+examples drawn from a shared word pool, then times each query type on
+randomly chosen words, their two-letter prefixes and single-typo misspellings.
+Also reports how many misspellings ``fuzzy`` recovers.
+
+Usage: python -m benchmarks.bench_search [--words 500000] [--repeat 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from benchmarks.common import time_calls
+from src.database import VocabularyDatabase
+
+LETTERS = 'etaoinshrdlcumwfgypbvkjxqz'
+WEIGHTS = [12, 9, 8, 7.5, 7, 6.7, 6.3, 6, 5.9, 4.2, 4, 2.8, 2.7, 2.4, 2.3, 2.2, 2, 2, 1.9,
+           1.5, 1, .8, .2, .15, .1, .07]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    def make_word():
+        return ''.join(rng.choices(LETTERS, WEIGHTS, k=rng.randint(4, 12)))
+
+    def typo(word):
+        i = rng.randrange(len(word))
+        return word[:i] + rng.choice(LETTERS) + word[i + 1:]
+
+    pool = [make_word() for _ in range(8000)]
+    words = set()
+    while len(words) < args.words:
+        words.add(make_word())
+    words = sorted(words)
+    rng.shuffle(words)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = VocabularyDatabase(os.path.join(tmp, 'search.db'))
+        report = db.import_words((w, ' '.join(rng.choices(pool, k=8)), ' '.join(rng.choices(pool, k=10)),
+                                  '', 1, 'general') for w in words)
+        print(f"imported {report['inserted']} words in {report['seconds']:.1f}s")
+        search = db.search
+
+        sample = rng.sample(words, args.repeat)
+        cases = [
+            ('autocomplete (2 letters)', search.autocomplete, [w[:2] for w in sample]),
+            ('search (whole word)', search.search, sample),
+            ('search (2 letters)', search.search, [w[:2] for w in sample]),
+            ('search (2 terms)', search.search, [f"{a} {b[:3]}" for a, b in zip(rng.sample(pool, args.repeat),
+                                                                                  rng.sample(pool, args.repeat))]),
+            ('fuzzy (1 typo)', search.fuzzy, [typo(w) for w in sample]),
+            ('lookup (1 typo)', search.lookup, [typo(w) for w in sample]),
+        ]
+        print(f"{'query':<26}{'p50':>10}{'p99':>10}")
+        for name, fn, inputs in cases:
+            queue = iter(inputs)
+            stats = time_calls(lambda: fn(next(queue)), len(inputs))
+            print(f"{name:<26}{stats['p50_ms']:>8.2f}ms{stats['p99_ms']:>8.2f}ms")
+
+        misspelled = [(typo(w), w) for w in sample]
+        recovered = sum(any(r['word'] == w for r in search.fuzzy(t)) for t, w in misspelled)
+        print(f"fuzzy recovered {recovered}/{len(misspelled)} misspellings")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Concurrent learner write throughput: shared progress table versus per-user shards.
+
+Each learner thread records quiz answers in batches as fast as it can. With
+every learner in the main file the writes queue on its single write lock;
+with ``shard=True`` profiles each learner writes to a file of their own.
+
+Usage: python -m benchmarks.bench_shards [--words 20000] [--learners 8] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.common import build_database
+
+
+def run(db, learners, seconds, batch, shard):
+    """Answers per second and p99 batch latency for ``learners`` concurrent writers"""
+    handles = [db.for_user(db.create_user(f"{'shard' if shard else 'main'}-{i}", shard=shard))
+               for i in range(learners)]
+    words = [w['id'] for w in handles[0].browse_words(limit=1000)]
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def learner(handle, seed):
+        rng = random.Random(seed)
+        samples = []
+        while time.perf_counter() < deadline:
+            answers = [{'word_id': rng.choice(words), 'is_correct': rng.random() < 0.7}
+                       for _ in range(batch)]
+            start = time.perf_counter()
+            handle.record_answers(answers)
+            samples.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [threading.Thread(target=learner, args=(h, i)) for i, h in enumerate(handles)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return (len(latencies) * batch / seconds,
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=20000)
+    parser.add_argument('--learners', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--batch', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_database(os.path.join(tmp, 'shards.db'), args.words)
+        print(f"{'layout':<14}{'answers/s':>12}{'p99 batch':>12}")
+        for shard in (False, True):
+            rate, p99 = run(db, args.learners, args.seconds, args.batch, shard)
+            print(f"{'shards' if shard else 'shared table':<14}{rate:>12.0f}{p99:>10.2f}ms")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
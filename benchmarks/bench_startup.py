@@ -0,0 +1,129 @@
+"""Cold-start time of the desktop app, from process launch to first window.
+
+Each run launches a fresh interpreter in a temp directory, as ``python main.py``
+would, and records when each startup phase ends (milliseconds since launch):
+
+  python        interpreter and site initialised
+  imports       src.vocabulary_app and its dependencies imported
+  app           VocabularyApp constructed: database open, widgets built
+  first_window  main window mapped after the first event-loop pass
+  loaded        seeding and the stats bar finished in the background
+
+The first run creates the database; the reported figures are the medians of
+the later runs, which reopen it like an everyday launch; ``--words`` fills it
+with a synthetic bank first, so work that scales with the vocabulary shows.
+One more run under ``-X importtime`` lists the slowest top-level imports.
+Without a display the Tk phases are replaced by the rest of VocabularyApp's
+construction: ``database`` (the VocabularyDatabase open) and ``engine`` (the
+DB executor and QuizEngine).
+
+``--budget-ms`` sets the cold-start budget for the last phase measured
+(first_window, or engine when headless); the exit status is 1 over budget.
+
+Usage: python -m benchmarks.bench_startup [--runs 10] [--words 0] [--budget-ms 400] [--top 12]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.common import build_database
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = '''
+import json, sys, time
+marks = {'python': time.time()}
+import tkinter
+from src.vocabulary_app import VocabularyApp
+marks['imports'] = time.time()
+try:
+    app = VocabularyApp()
+except tkinter.TclError:
+    from src.database import VocabularyDatabase
+    from src.db_executor import DBExecutor
+    from src.quiz_engine import QuizEngine
+    db = VocabularyDatabase()
+    marks['database'] = time.time()
+    executor = DBExecutor(db)
+    engine = QuizEngine(db, record=executor.queue_answers, prefetch=3)
+    marks['engine'] = time.time()
+    engine.close()
+    executor.close()
+    db.close()
+else:
+    marks['app'] = time.time()
+    while not app.root.winfo_viewable():
+        app.root.update()
+    marks['first_window'] = time.time()
+    while app.dispatcher.pending:
+        app.root.update()
+    marks['loaded'] = time.time()
+    app.close()
+print(json.dumps(marks))
+'''
+
+
+def launch(cwd: str, *flags: str) -> Tuple[Dict[str, float], str]:
+    """Run the startup script once; phase times in ms since launch, and stderr"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    start = time.time()
+    proc = subprocess.run([sys.executable, *flags, '-c', _CHILD], cwd=cwd, env=env,
+                          capture_output=True, text=True, check=True)
+    marks = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {phase: (t - start) * 1000 for phase, t in marks.items()}, proc.stderr
+
+
+def slowest_imports(importtime: str, top: int) -> List[Tuple[str, float]]:
+    """Top-level modules by cumulative import time (ms) from ``-X importtime`` output"""
+    totals = []
+    for line in importtime.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):   # nested imports are indented past the one space
+            totals.append((name.strip(), int(cumulative_us) / 1000))
+    return sorted(totals, key=lambda item: -item[1])[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help="launches after the first")
+    parser.add_argument('--words', type=int, default=0, help="synthetic words in the database")
+    parser.add_argument('--budget-ms', type=float, default=400,
+                        help="cold-start budget for the last phase measured")
+    parser.add_argument('--top', type=int, default=12, help="slowest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.words:
+            build_database(os.path.join(tmp, 'vocabulary.db'), args.words).close()
+        first, _ = launch(tmp)
+        runs = [launch(tmp)[0] for _ in range(args.runs)]
+        _, importtime = launch(tmp, '-X', 'importtime')
+
+    phases = list(first)
+    print(f"{'phase':<14}{'first run':>12}{'p50':>10}{'max':>10}")
+    for phase in phases:
+        samples = [run[phase] for run in runs]
+        print(f"{phase:<14}{first[phase]:>10.1f}ms{statistics.median(samples):>8.1f}ms"
+              f"{max(samples):>8.1f}ms")
+
+    print(f"\nSlowest top-level imports (-X importtime, cumulative):")
+    for name, ms in slowest_imports(importtime, args.top):
+        print(f"  {name:<36}{ms:>8.1f}ms")
+
+    budgeted = 'first_window' if 'first_window' in phases else phases[-1]
+    p50 = statistics.median(run[budgeted] for run in runs)
+    verdict = "within" if p50 <= args.budget_ms else "OVER"
+    print(f"\n{budgeted} p50 {p50:.1f}ms, {verdict} the {args.budget_ms:.0f}ms budget")
+    return 0 if p50 <= args.budget_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Translation cache and preloader against a local stub of the translation API.
+
+The stub answers like Lingvanex after ``--latency-ms``; words starting with
+``flaky`` get one 503 and ``busy`` one 429 before succeeding, and ``broken``
+words always fail with 500. Reports the legacy one-at-a-time preload against
+the bounded thread pool, then checks that:
+
+  - a second preload sends no requests
+  - flaky and busy words are translated after a retry
+  - broken words are negatively cached, and fetched again once the TTL expires
+  - a legacy translations.json is imported without its failure markers
+  - quiz_manager.preload_translations fills the cache get_translation reads
+
+The exit status is 1 if any check fails.
+
+Usage: python -m benchmarks.bench_translation_cache [--words 200] [--latency-ms 20] [--workers 8]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import quiz_manager
+from translation_cache import FAILED_MARKER, TranslationCache, Translator
+
+
+class StubAPI(ThreadingHTTPServer):
+    """Lingvanex-shaped translate endpoint that counts requests per text"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.latency = latency
+        self.requests = Counter()
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_port}/translate"
+
+    def total(self) -> int:
+        with self.lock:
+            return sum(self.requests.values())
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        text = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['text']
+        with self.server.lock:
+            self.server.requests[text] += 1
+            attempt = self.server.requests[text]
+        time.sleep(self.server.latency)
+        if text.startswith('broken'):
+            self.reply(500, {'err': 'internal error', 'result': None})
+        elif text.startswith('flaky') and attempt == 1:
+            self.reply(503, {'err': 'unavailable', 'result': None})
+        elif text.startswith('busy') and attempt == 1:
+            self.reply(429, {'err': 'rate limited', 'result': None})
+        else:
+            self.reply(200, {'err': None, 'result': f"뜻-{text}"})
+
+    def reply(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server = StubAPI(args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    words = [f"word{i}" for i in range(args.words)]
+    odd = ['flaky1', 'flaky2', 'busy1', 'busy2', 'broken1', 'broken2']
+    failures = []
+
+    def check(name: str, ok: bool):
+        print(f"  {'ok' if ok else 'FAIL':<6}{name}")
+        if not ok:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def translator(name: str, negative_ttl: float = 3600) -> Translator:
+            cache = TranslationCache(os.path.join(tmp, f"{name}.db"), negative_ttl=negative_ttl)
+            return Translator('stub-key', cache, api_url=server.url, backoff=0.01)
+
+        sequential = translator('sequential')
+        legacy = sequential.preload(words, max_workers=1)
+        sequential.cache.close()
+        pooled = translator('pooled')
+        summary = pooled.preload(words + odd, max_workers=args.workers)
+        print(f"{args.words} words at {args.latency_ms:.0f}ms per request")
+        print(f"{'one at a time':<20}{legacy['seconds'] * 1000:>10.1f}ms")
+        print(f"{f'{args.workers} workers':<20}{summary['seconds'] * 1000:>10.1f}ms"
+              f"  ({legacy['seconds'] / summary['seconds']:.1f}x)\n")
+
+        before = server.total()
+        again = pooled.preload(words + odd, max_workers=args.workers)
+        check("second preload sends no requests", again['requested'] == 0 and server.total() == before)
+        check("flaky and busy words translated after a retry",
+              all(pooled.cache.get(w) == f"뜻-{w}" and server.requests[w] == 2 for w in odd[:4]))
+        check("broken words are negatively cached",
+              all(pooled.cache.lookup(w) == (True, None) for w in odd[4:]))
+        before = server.total()
+        pooled.translate('broken1')
+        check("a fresh negative entry is not fetched again", server.total() == before)
+        pooled.cache.close()
+
+        expired = translator('pooled', negative_ttl=-1)
+        expired.translate('broken1')
+        check("an expired negative entry is fetched again", server.total() == before + 1 + expired.retries)
+        expired.cache.close()
+
+        legacy_json = os.path.join(tmp, 'translations.json')
+        with open(legacy_json, 'w', encoding='utf-8') as f:
+            json.dump({'apple': '사과', 'banana': FAILED_MARKER}, f, ensure_ascii=False)
+        imported = TranslationCache(os.path.join(tmp, 'imported.db'), legacy_json=legacy_json)
+        check("legacy translations.json imported without failure markers",
+              imported.get('apple') == '사과' and not imported.lookup('banana')[0])
+        imported.close()
+
+        # quiz_manager's paths are module constants, read when it first opens them
+        listed = words[:50]
+        word_list = os.path.join(tmp, 'word_list.txt')
+        with open(word_list, 'w', encoding='utf-8') as f:
+            f.writelines(f"{w}\n" for w in listed)
+        quiz_manager.WORD_LIST_FILE = word_list
+        quiz_manager.TRANSLATION_DB = os.path.join(tmp, 'quiz_manager.db')
+        quiz_manager.LEGACY_TRANSLATIONS = os.path.join(tmp, 'missing.json')
+        os.environ['LINGVANEX_API_URL'] = server.url
+        loaded = quiz_manager.preload_translations()
+        before = server.total()
+        check("quiz_manager preload fills the cache get_translation reads",
+              loaded['translated'] == len(listed)
+              and quiz_manager.get_translation(listed[-1]) == f"뜻-{listed[-1]}"
+              and server.total() == before)
+        quiz_manager.get_translator().cache.close()
+        quiz_manager.get_words().close()
+
+    server.shutdown()
+    print(f"\n{len(failures)} check(s) failed" if failures else "\nAll checks passed.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Per-transition latency and Tk object counts for VocabularyApp screens.
+
+Drives the real app (needs a display) against a fresh database in a temp
+directory: flips through learning cards, answers quiz questions and bounces
+between screens, timing each transition through ``update_idletasks`` and
+counting widgets and Tcl commands before and after. Transitions that start
+background database work are timed until their results reach the UI.
+
+Usage: python -m benchmarks.bench_ui_transitions [--repeat 200]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import time_calls
+
+
+def widget_count(widget) -> int:
+    """Widgets in the tree rooted at ``widget``, including itself"""
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def wait_idle(app):
+    """Pump the event loop until every background database call has been delivered"""
+    while app.dispatcher.pending:
+        app.root.update()
+    app.root.update_idletasks()
+
+
+def tk_objects(app):
+    """(widgets, Tcl commands); leaked widgets and variables show up in the latter"""
+    return widget_count(app.root), len(app.root.tk.call('info', 'commands'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    from src.vocabulary_app import VocabularyApp
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            app = VocabularyApp()
+            root = app.root
+            root.update()
+            wait_idle(app)   # seeding and the stats bar load after the first frame
+
+            def flip_word():
+                if app.current_word_index >= len(app.current_words) - 1:
+                    app.current_word_index = -1
+                app.next_word()
+                root.update_idletasks()
+
+            def quiz_step():
+                if app.quiz.session is None or app.quiz.current_question() is None:
+                    app.start_quiz_with_words(app.db.get_daily_words(10))
+                question = app.quiz.current_question()
+                app.quiz_view.selected.set(question.choices[0])
+                app.submit_quiz_answer()
+                wait_idle(app)
+                app.next_quiz_question()
+                wait_idle(app)
+
+            def switch_screens():
+                app.show_word_management()
+                root.update_idletasks()
+                app.show_welcome_screen()
+                root.update_idletasks()
+
+            def stats_refresh():
+                app.update_stats_display()
+                wait_idle(app)
+
+            app.start_daily_session()
+            wait_idle(app)
+            cases = [('learning card flip', flip_word), ('quiz answer + next', quiz_step),
+                     ('management <-> welcome', switch_screens), ('stats bar refresh', stats_refresh)]
+
+            print(f"{'transition':<26}{'p50':>10}{'p99':>10}{'widgets':>16}{'tcl cmds':>18}")
+            for name, fn in cases:
+                fn()  # warm up: the first render packs optional widgets
+                widgets_before, commands_before = tk_objects(app)
+                stats = time_calls(fn, args.repeat)
+                widgets_after, commands_after = tk_objects(app)
+                print(f"{name:<26}{stats['p50_ms']:>8.2f}ms{stats['p99_ms']:>8.2f}ms"
+                      f"{widgets_before:>8} -> {widgets_after:<5}{commands_before:>8} -> {commands_after:<7}")
+
+            app.close()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
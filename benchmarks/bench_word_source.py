@@ -0,0 +1,68 @@
+"""Startup and lookup cost of the legacy in-memory word list versus WordSource.
+
+Usage: python -m benchmarks.bench_word_source [--words 2000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import time_calls
+from word_source import WordSource
+
+
+def legacy_load(path: str):
+    """The old quiz_manager import: read every line into a list"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def measure(fn):
+    """(seconds, peak traced bytes, result) of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=2000000)
+    parser.add_argument('--repeat', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'word_list.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(f"word{i}\n" for i in range(args.words))
+
+        def open_source():
+            source = WordSource(path)
+            len(source)
+            return source
+
+        rows = [('legacy list', measure(lambda: legacy_load(path)))]
+        rows.append(('index build', measure(open_source)))
+        rows[-1][1][2].close()
+        rows.append(('cached index open', measure(open_source)))
+
+        print(f"{args.words} words")
+        for name, (seconds, peak, _result) in rows:
+            print(f"{name:<20} {seconds * 1000:10.1f} ms  peak {peak / 2 ** 20:8.1f} MiB")
+
+        words = rows[0][1][2]
+        source = rows[-1][1][2]
+        legacy = time_calls(lambda: random.choice(words), args.repeat)
+        mapped = time_calls(source.random, args.repeat)
+        print(f"{'random word':<20} legacy p50 {legacy['p50_ms'] * 1000:.2f} us  "
+              f"mmap p50 {mapped['p50_ms'] * 1000:.2f} us")
+        source.close()
+
+
+if __name__ == '__main__':
+    main()
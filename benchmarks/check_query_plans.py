@@ -0,0 +1,37 @@
+"""Fail if any hot query's plan falls back to a full-table scan or temp sort.
+
+Usage: python -m benchmarks.check_query_plans [--words 10000]
+
+Exits with status 1 and prints the offending plan steps on regression.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmarks.common import build_database
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--words', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_database(os.path.join(tmp, 'plans.db'), args.words)
+        with db.connection() as conn:
+            conn.execute('ANALYZE')
+        problems = db.query_plan_problems()
+        db.close()
+
+    for name, details in problems.items():
+        for detail in details:
+            print(f"{name}: {detail}")
+    if problems:
+        return 1
+    print("All hot queries are index-backed.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Shared helpers for the benchmark scripts.
+
+Run the scripts from the repository root, e.g. ``python -m benchmarks.bench_connection_pool``.
+"""
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from src.database import VocabularyDatabase
+
+
+def build_database(db_path: str, n_words: int, seed: int = 0) -> VocabularyDatabase:
+    """Create a synthetic vocabulary database with ``n_words`` words"""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    rng = random.Random(seed)
+    db = VocabularyDatabase(db_path)
+    now = datetime.now()
+
+    def progress_rows():
+        for i in range(n_words):
+            correct = rng.randint(0, 5)
+            attempts = correct + rng.randint(0, 3)
+            reviewed = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+            interval = rng.choice([0, 1, 6, 15, 40]) if attempts else 0
+            due = reviewed + timedelta(days=interval)
+            yield (i + 1, correct, attempts, rng.randint(0, 3), reviewed.isoformat(),
+                   float(interval), int(due.timestamp()),
+                   int(reviewed.timestamp()) if attempts else None)
+
+    with db.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO vocabulary (word, definition, example_sentence, pronunciation, difficulty_level, category)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', ((f"word{i}", f"definition of word {i}", f"An example using word{i}.", "",
+               rng.randint(1, 5), rng.choice(['general', 'science', 'business']))
+              for i in range(n_words)))
+        conn.executemany('''
+            INSERT INTO user_progress (word_id, correct_answers, total_attempts, mastery_level,
+                                       last_reviewed, interval_days, due_at, last_review_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', progress_rows())
+    return db
+
+
+def add_history(db: VocabularyDatabase, days: int = 90, seed: int = 0):
+    """Back-fill answer history and daily sessions matching the progress counters
+
+    Each word gets one quiz_results row per recorded attempt, spread over the
+    ``days`` before its last review, and the learner gets a session on most
+    of those days.
+    """
+    rng = random.Random(seed)
+    today = datetime.now().date()
+
+    def answers(rows):
+        for word_id, correct, attempts, last_reviewed in rows:
+            last = datetime.fromisoformat(last_reviewed).timestamp()
+            for k in range(attempts):
+                answered = int(last) - rng.randint(0, 86400 * days)
+                yield (word_id, answered, k < correct, round(rng.uniform(1.0, 12.0), 2))
+
+    with db.transaction() as conn:
+        rows = conn.execute('''
+            SELECT word_id, correct_answers, total_attempts, last_reviewed
+            FROM user_progress WHERE total_attempts > 0
+        ''').fetchall()
+        conn.executemany('''
+            INSERT INTO quiz_results (word_id, answered_at, is_correct, response_time_seconds)
+            VALUES (?, ?, ?, ?)
+        ''', answers(rows))
+        conn.executemany('''
+            INSERT INTO daily_sessions (session_date, words_learned, quiz_score, session_completed)
+            VALUES (?, ?, ?, TRUE)
+        ''', (((today - timedelta(days=d)).isoformat(), rng.randint(3, 10), round(rng.uniform(40, 100), 1))
+              for d in range(days, 0, -1) if rng.random() < 0.8))
+
+
+def time_calls(fn: Callable, repeat: int = 200) -> Dict[str, float]:
+    """Call ``fn`` repeatedly and return latency statistics in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'mean_ms': statistics.fmean(samples),
+        'p50_ms': samples[len(samples) // 2],
+        'p99_ms': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
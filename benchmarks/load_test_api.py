@@ -0,0 +1,187 @@
+"""Load test for the HTTP/JSON API: many simulated learners on one machine.
+
+Starts ``python -m src.api_server`` on a synthetic database (or targets a
+running server with ``--url``), creates a profile per learner, then has every
+learner loop over next-card / submit-answer on its own keep-alive connection
+for ``--seconds``. Reports requests/sec and p50/p99 latency per endpoint.
+
+Usage: python -m benchmarks.load_test_api [--learners 1000] [--seconds 20] [--words 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from benchmarks.common import build_database
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection speaking JSON"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = b'' if payload is None else json.dumps(payload).encode()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                          .encode('latin-1') + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else 0.0
+
+
+async def setup(host, port, learners, shard, prefix):
+    """Create the learner profiles over a handful of connections"""
+    names = [f"{prefix}{i}" for i in range(learners)]
+    clients = [Client(host, port) for _ in range(8)]
+
+    async def create(client, chunk):
+        for name in chunk:
+            status, data = await client.request('POST', '/users', {'name': name, 'shard': shard})
+            if status not in (201, 409):
+                raise RuntimeError(f"Creating {name} failed with {status}: {data.get('error')}")
+
+    await asyncio.gather(*(create(c, names[i::len(clients)]) for i, c in enumerate(clients)))
+    for client in clients:
+        client.close()
+    return names
+
+
+async def load(host, port, names, seconds, seed):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + seconds
+
+    async def timed(client, endpoint, method, path, payload=None):
+        start = time.perf_counter()
+        status, data = await client.request(method, path, payload)
+        latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        if status != 200:
+            errors[endpoint] += 1
+        return data
+
+    async def learner(name, rng):
+        client = Client(host, port)
+        try:
+            # Spread the first requests out instead of sending them all at once
+            await asyncio.sleep(rng.random())
+            while time.perf_counter() < deadline:
+                cards = (await timed(client, 'next', 'GET', f'/users/{name}/next')).get('cards')
+                if not cards:
+                    continue
+                card = cards[0]
+                choice = rng.choice(card['choices'])
+                await timed(client, 'answer', 'POST', f'/users/{name}/answers',
+                            {'word_id': card['word_id'], 'choice': choice,
+                             'response_time': rng.uniform(1, 8)})
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            errors['connection'] += 1
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(learner(n, random.Random(seed + i)) for i, n in enumerate(names)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(host, port, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("API server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--learners', type=int, default=1000)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--words', type=int, default=2000, help="size of the synthetic word bank")
+    parser.add_argument('--workers', type=int, default=8, help="server database threads")
+    parser.add_argument('--shard', action='store_true', help="give every learner a shard")
+    parser.add_argument('--url', help="target a running server instead of starting one")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # One socket per learner on each side of the connection
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = 2 * args.learners + 256
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            db_path = os.path.join(tmp, 'api.db')
+            build_database(db_path, args.words).close()
+            host, port = '127.0.0.1', free_port()
+            server = subprocess.Popen([sys.executable, '-m', 'src.api_server', '--db', db_path,
+                                       '--port', str(port), '--workers', str(args.workers)],
+                                      stdout=subprocess.DEVNULL)
+            wait_for_port(host, port, server)
+        try:
+            started = time.perf_counter()
+            names = asyncio.run(setup(host, port, args.learners, args.shard, f"load-{args.seed}-"))
+            print(f"Created {len(names)} learners in {time.perf_counter() - started:.1f}s")
+            latencies, errors, elapsed = asyncio.run(
+                load(host, port, names, args.seconds, args.seed))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{args.learners} learners, {elapsed:.1f}s: {total} requests, {total / elapsed:.0f} req/s")
+    for endpoint, samples in sorted(latencies.items()):
+        print(f"  {endpoint:<7} {len(samples):>8} req  p50 {percentile(samples, 50):7.1f}ms  "
+              f"p99 {percentile(samples, 99):7.1f}ms")
+    if errors:
+        print(f"  errors: {dict(errors)}")
+
+
+if __name__ == '__main__':
+    main()
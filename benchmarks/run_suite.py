@@ -0,0 +1,192 @@
+"""Benchmark suite for the database and quiz hot paths, with JSON results.
+
+For each word-bank size it builds a synthetic database with progress and
+answer history for every word, then times the calls a quiz session makes:
+picking daily and review words, recording answers, reading stats, opening
+the daily session, building questions, and the quiz_manager stats store.
+
+Usage: python -m benchmarks.run_suite [--sizes 1k,100k,1m] [--output results.json]
+                                      [--compare baseline.json] [--threshold 1.5]
+
+With ``--compare`` every case whose p50 grew by more than ``--threshold``
+times (and by more than ``--min-delta-ms``) against the baseline file is
+printed and the exit status is 1, so a CI job can fail on regressions.
+Generated databases are reused from ``--cache-dir`` when given; each run
+works on a fresh copy so results don't drift with earlier runs' answers.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.common import add_history, build_database, time_calls
+from src.database import VocabularyDatabase
+from src.distractors import DistractorIndex
+from src.quiz_engine import QuestionGenerator
+from stats_store import StatsStore
+
+_SUFFIXES = {'k': 1000, 'm': 1000000}
+
+
+def parse_size(text: str) -> int:
+    """'1k' -> 1000, '1m' -> 1000000, '2500' -> 2500"""
+    text = text.strip().lower()
+    if text[-1:] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+def size_label(n: int) -> str:
+    for suffix, scale in sorted(_SUFFIXES.items(), key=lambda item: -item[1]):
+        if n >= scale and n % scale == 0:
+            return f"{n // scale}{suffix}"
+    return str(n)
+
+
+def prepare_database(n_words: int, work_dir: str, cache_dir: Optional[str]) -> str:
+    """Path of a fresh copy of the synthetic database for ``n_words``"""
+    path = os.path.join(work_dir, f"suite-{size_label(n_words)}.db")
+    cached = os.path.join(cache_dir, os.path.basename(path)) if cache_dir else None
+    if cached and os.path.exists(cached):
+        shutil.copyfile(cached, path)
+        return path
+
+    db = build_database(path, n_words)
+    add_history(db)
+    with db.connection() as conn:
+        conn.execute('ANALYZE')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    db.close()
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        shutil.copyfile(path, cached)
+    return path
+
+
+def cases(db: VocabularyDatabase, stats_dir: str, n_words: int,
+          rng: random.Random) -> Dict[str, Callable]:
+    """The timed calls, keyed by case name"""
+    word_ids = [rng.randint(1, n_words) for _ in range(1000)]
+    generator = QuestionGenerator(db.distractors, rng=rng)
+    quiz_words = db.get_review_words(200)
+    store = StatsStore(stats_dir)
+    stats_words = [f"word{i}" for i in range(n_words)]
+    for word in stats_words[:min(n_words, 100000)]:
+        store.record(word, rng.random() < 0.7)
+
+    return {
+        'get_daily_words': lambda: db.get_daily_words(5),
+        'get_review_words': lambda: db.get_review_words(10),
+        'get_due_words': lambda: db.get_due_words(10),
+        'update_word_progress': lambda: db.update_word_progress(
+            rng.choice(word_ids), rng.random() < 0.7, rng.uniform(1, 10)),
+        'record_answers_10': lambda: db.record_answers(
+            [{'word_id': rng.choice(word_ids), 'is_correct': rng.random() < 0.7,
+              'response_time': rng.uniform(1, 10)} for _ in range(10)]),
+        'get_user_stats': db.get_user_stats,
+        'create_daily_session': db.create_daily_session,
+        'question_generation': lambda: generator.make(rng.choice(quiz_words), 1, 10),
+        'quiz_manager.update_stats': lambda: store.record(rng.choice(stats_words), rng.random() < 0.7),
+        'quiz_manager.load_stats': store.snapshot,
+    }
+
+
+def run_size(n_words: int, repeat: int, cache_dir: Optional[str], seed: int) -> Dict:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        path = prepare_database(n_words, tmp, cache_dir)
+        setup_seconds = time.perf_counter() - start
+
+        results: Dict[str, Dict] = {}
+        with VocabularyDatabase(path) as db:
+            results['distractor_index_build'] = time_calls(lambda: DistractorIndex.from_database(db), 3)
+            timed = cases(db, os.path.join(tmp, 'stats'), n_words, rng)
+            for name, fn in timed.items():
+                fn()   # warm statement caches and lazily built state
+                # Snapshotting the whole stats store is slow at large sizes; a few samples suffice
+                results[name] = time_calls(fn, repeat if name != 'quiz_manager.load_stats'
+                                           else max(3, repeat // 20))
+    return {'words': n_words, 'setup_seconds': round(setup_seconds, 2), 'cases': results}
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Cases whose p50 regressed against ``baseline`` beyond the threshold"""
+    regressions = []
+    for label, size in results['sizes'].items():
+        old_cases = baseline.get('sizes', {}).get(label, {}).get('cases', {})
+        for name, new in size['cases'].items():
+            old = old_cases.get(name)
+            if old is None:
+                continue
+            ratio = new['p50_ms'] / old['p50_ms'] if old['p50_ms'] else float('inf')
+            if ratio > threshold and new['p50_ms'] - old['p50_ms'] > min_delta_ms:
+                regressions.append(f"{label} {name}: p50 {old['p50_ms']:.3f} -> {new['p50_ms']:.3f} ms "
+                                   f"({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1k,100k,1m', help="comma-separated word-bank sizes")
+    parser.add_argument('--repeat', type=int, default=200, help="timed calls per case")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--cache-dir', help="keep generated databases here between runs")
+    parser.add_argument('--compare', help="baseline results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.5, help="allowed p50 slowdown ratio")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'repeat': args.repeat, 'sizes': {}}
+    for n_words in (parse_size(s) for s in args.sizes.split(',')):
+        label = size_label(n_words)
+        size = run_size(n_words, args.repeat, args.cache_dir, args.seed)
+        results['sizes'][label] = size
+        print(f"{label} words (setup {size['setup_seconds']:.1f}s)")
+        for name, r in size['cases'].items():
+            print(f"  {name:<28} mean {r['mean_ms']:9.3f} ms  p50 {r['p50_ms']:9.3f} ms  "
+                  f"p99 {r['p99_ms']:9.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,39 +1,71 @@
-import json
-import random
 import os
 
+from stats_store import StatsStore
+from word_source import WordSource
+
 DATA_DIR = "data"
-STATS_FILE = os.path.join(DATA_DIR, "stats.json")
+STATS_FILE = os.path.join(DATA_DIR, "stats.json")  # legacy format, migrated on first use
 WORD_LIST_FILE = os.path.join(DATA_DIR, "word_list.txt")
+TRANSLATION_DB = os.path.join(DATA_DIR, "translations.db")
+LEGACY_TRANSLATIONS = "translations.json"  # 이전 번역 캐시, 처음 사용할 때 한 번 가져옴
+
+# 단어 목록과 학습 기록은 처음 사용할 때 연다 (import 시 파일 작업 없음)
+_words = None
+_store = None
+_translator = None
+
+def get_words():
+    """단어 목록 (mmap + 오프셋 인덱스, 필요한 단어만 디코딩)"""
+    global _words
+    if _words is None:
+        _words = WordSource(WORD_LIST_FILE)
+    return _words
+
+def __getattr__(name):
+    # 이전 코드의 quiz_manager.words 접근 호환
+    if name == "words":
+        return get_words()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_store():
+    """학습 기록 저장소 (처음 사용할 때 열고 stats.json을 이전)"""
+    global _store
+    if _store is None:
+        _store = StatsStore(DATA_DIR, legacy_file=STATS_FILE)
+    return _store
+
+def get_translator():
+    """번역기 (SQLite 캐시, 처음 사용할 때 열고 translations.json을 이전)
 
-# 초기화
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+    API 키와 주소는 LINGVANEX_API_KEY, LINGVANEX_API_URL 환경 변수에서 읽는다.
+    """
+    global _translator
+    if _translator is None:
+        # requests(HTTP 스택)는 번역기를 처음 쓸 때만 불러온다
+        from translation_cache import API_URL, TranslationCache, Translator
+        cache = TranslationCache(TRANSLATION_DB, legacy_json=LEGACY_TRANSLATIONS)
+        _translator = Translator(os.environ.get("LINGVANEX_API_KEY", ""), cache,
+                                 api_url=os.environ.get("LINGVANEX_API_URL", API_URL))
+    return _translator
 
-if not os.path.exists(STATS_FILE):
-    with open(STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump({}, f, ensure_ascii=False, indent=2)
+def get_translation(word):
+    """단어의 한국어 뜻 (캐시 우선, 실패하면 None)"""
+    return get_translator().translate(word)
 
-with open(WORD_LIST_FILE, 'r', encoding='utf-8') as f:
-    words = [line.strip() for line in f if line.strip()]
+def preload_translations(limit=None):
+    """단어 목록 중 캐시에 없는 단어를 병렬로 미리 번역하고 요약을 반환"""
+    words = get_words()
+    count = len(words) if limit is None else min(limit, len(words))
+    return get_translator().preload(words[i] for i in range(count))
 
 def get_random_word():
-    return random.choice(words)
+    return get_words().random()
 
 def load_stats():
-    with open(STATS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_store().snapshot()
 
 def save_stats(stats):
-    with open(STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, ensure_ascii=False, indent=2)
+    get_store().replace(stats)
 
 def update_stats(word, correct):
-    stats = load_stats()
-    if word not in stats:
-        stats[word] = {"correct": 0, "wrong": 0}
-    if correct:
-        stats[word]["correct"] += 1
-    else:
-        stats[word]["wrong"] += 1
-    save_stats(stats)
+    get_store().record(word, correct)
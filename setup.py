@@ -3,25 +3,43 @@ import os
 # 프로젝트 폴더
 PROJECT_NAME = "VocabTrainer"
 DATA_DIR = os.path.join(PROJECT_NAME, "data")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_source(name):
+    """이 저장소의 모듈 소스를 그대로 복사 (생성본이 오래된 사본이 되지 않도록)"""
+    with open(os.path.join(BASE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
 
 # 파일 내용
 files = {
     os.path.join(PROJECT_NAME, "main.py"): '''import tkinter as tk
 from tkinter import messagebox
-from vocab_api import get_meaning
+from vocab_api import get_client
 from quiz_manager import get_random_word, update_stats, load_stats
 
 current_word = ""
+dictionary = get_client()
 
 def new_quiz():
     global current_word
     current_word = get_random_word()
+    dictionary.prefetch(current_word)  # 사용자가 답하는 동안 뜻을 미리 가져옴
     word_label.config(text=current_word)
     answer_entry.delete(0, tk.END)
 
 def check_answer():
     user_ans = answer_entry.get().strip()
-    correct_meaning = get_meaning(current_word)
+    future = dictionary.prefetch(current_word)
+    if not future.done():
+        # 아직 응답 전이면 UI를 멈추지 않고 잠시 후 다시 확인
+        check_btn.config(state=tk.DISABLED)
+        root.after(50, check_answer)
+        return
+    check_btn.config(state=tk.NORMAL)
+    entry = future.result()
+    correct_meaning = dictionary.get_meaning(current_word) if entry else None
     if not correct_meaning:
         messagebox.showwarning("알림", f"{current_word} 단어 뜻을 찾을 수 없습니다.")
         new_quiz()
@@ -59,64 +77,15 @@ new_quiz()
 root.mainloop()
 ''',
 
-    os.path.join(PROJECT_NAME, "vocab_api.py"): '''import requests
-
-def get_meaning(word):
-    """Free Dictionary API에서 단어 뜻 가져오기"""
-    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        try:
-            meaning = data[0]['meanings'][0]['definitions'][0]['definition']
-            return meaning
-        except (IndexError, KeyError):
-            return None
-    return None
-''',
-
-    os.path.join(PROJECT_NAME, "quiz_manager.py"): '''import json
-import random
-import os
-
-DATA_DIR = "data"
-STATS_FILE = os.path.join(DATA_DIR, "stats.json")
-WORD_LIST_FILE = os.path.join(DATA_DIR, "word_list.txt")
-
-# stats.json 초기화
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
-
-if not os.path.exists(STATS_FILE):
-    stats = {}
-    with open(STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, ensure_ascii=False, indent=2)
-
-# 로컬 단어 리스트 불러오기
-with open(WORD_LIST_FILE, 'r', encoding='utf-8') as f:
-    words = [line.strip() for line in f if line.strip()]
+    os.path.join(PROJECT_NAME, "vocab_api.py"): read_source("vocab_api.py"),
 
-def get_random_word():
-    return random.choice(words)
+    os.path.join(PROJECT_NAME, "quiz_manager.py"): read_source("quiz_manager.py"),
 
-def load_stats():
-    with open(STATS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    os.path.join(PROJECT_NAME, "stats_store.py"): read_source("stats_store.py"),
 
-def save_stats(stats):
-    with open(STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, ensure_ascii=False, indent=2)
+    os.path.join(PROJECT_NAME, "word_source.py"): read_source("word_source.py"),
 
-def update_stats(word, correct):
-    stats = load_stats()
-    if word not in stats:
-        stats[word] = {"correct": 0, "wrong": 0}
-    if correct:
-        stats[word]["correct"] += 1
-    else:
-        stats[word]["wrong"] += 1
-    save_stats(stats)
-''',
+    os.path.join(PROJECT_NAME, "translation_cache.py"): read_source("translation_cache.py"),
 
     os.path.join(DATA_DIR, "word_list.txt"): '''apple
 banana
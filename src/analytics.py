@@ -0,0 +1,155 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .migrations import LATENCY_BOUNDS, RETENTION_BOUNDS
+
+# Bucket index -> (answers, correct, time_sum)
+Histogram = Dict[int, Tuple[int, int, float]]
+
+
+def histogram_percentile(histogram: Histogram, q: float,
+                         bounds: Sequence[float] = LATENCY_BOUNDS) -> Optional[float]:
+    """Estimate the ``q`` quantile (0-1) of a bucketed response-time histogram
+
+    Answers are assumed spread evenly across their bucket; the open-ended
+    last bucket is represented by its mean.
+    """
+    total = sum(answers for answers, _, _ in histogram.values())
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for bucket in sorted(histogram):
+        answers, _, time_sum = histogram[bucket]
+        if not answers:
+            continue
+        if seen + answers >= rank:
+            if bucket >= len(bounds):
+                return time_sum / answers
+            low = bounds[bucket - 1] if bucket else 0
+            return low + (bounds[bucket] - low) * (rank - seen) / answers
+        seen += answers
+    bucket = max(histogram)
+    answers, _, time_sum = histogram[bucket]
+    return time_sum / answers
+
+
+def summarize(histogram: Histogram) -> Dict:
+    """Answer count, accuracy, mean and p50/p90 response time of a histogram"""
+    answers = sum(a for a, _, _ in histogram.values())
+    correct = sum(c for _, c, _ in histogram.values())
+    time_sum = sum(t for _, _, t in histogram.values())
+    return {
+        'answers': answers,
+        'accuracy': correct / answers if answers else None,
+        'mean_time': time_sum / answers if answers else None,
+        'p50_time': histogram_percentile(histogram, 0.5),
+        'p90_time': histogram_percentile(histogram, 0.9),
+    }
+
+
+class ResponseAnalytics:
+    """Response-time and retention analytics for one learner
+
+    Reads only the rollup tables kept current by the quiz_results trigger
+    (migration 8), so each call touches a learner's pre-aggregated rows,
+    never the raw answer history.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def latency(self, word_id: Optional[int] = None, since: Optional[date] = None) -> Dict:
+        """Response-time summary for one word (all time) or the learner (since a day)"""
+        if word_id is None:
+            return summarize(self._user_histogram(since))
+        with self.db.connection() as conn:
+            rows = conn.execute('''
+                SELECT bucket, answers, correct, time_sum FROM rollup_word_latency
+                WHERE user_id = ? AND word_id = ?
+            ''', (self.db.user_id, word_id)).fetchall()
+        return summarize({bucket: (answers, correct, time_sum)
+                          for bucket, answers, correct, time_sum in rows})
+
+    def trend(self, word_id: Optional[int] = None, days: int = 30) -> List[Dict]:
+        """Daily answers, accuracy and response times over the last ``days`` days
+
+        The learner-wide trend includes p50/p90 per day; a single word's only
+        has the mean, as its daily rows are not bucketed.
+        """
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        with self.db.connection() as conn:
+            if word_id is not None:
+                rows = conn.execute('''
+                    SELECT day, answers, correct, time_sum FROM rollup_word_daily
+                    WHERE user_id = ? AND word_id = ? AND day >= ?
+                    ORDER BY day
+                ''', (self.db.user_id, word_id, since)).fetchall()
+                return [{'day': day, 'answers': answers, 'accuracy': correct / answers,
+                         'mean_time': time_sum / answers}
+                        for day, answers, correct, time_sum in rows]
+            rows = conn.execute('''
+                SELECT day, bucket, answers, correct, time_sum FROM rollup_user_latency
+                WHERE user_id = ? AND day >= ?
+                ORDER BY day
+            ''', (self.db.user_id, since)).fetchall()
+
+        by_day: Dict[str, Histogram] = {}
+        for day, bucket, answers, correct, time_sum in rows:
+            by_day.setdefault(day, {})[bucket] = (answers, correct, time_sum)
+        return [dict(summarize(histogram), day=day) for day, histogram in by_day.items()]
+
+    def leeches(self, min_answers: int = 5, min_accuracy: float = 0.8,
+                slow_share: float = 0.5, limit: int = 20) -> List[Dict]:
+        """Words answered correctly but slowly: recognized, not yet fluent
+
+        A correct answer is slow if it took longer than the learner's own
+        p75 response time. Words with at least ``min_answers`` answers, at
+        least ``min_accuracy`` correct, and at least ``slow_share`` of their
+        correct answers slow are returned, the slowest share first.
+        """
+        p75 = histogram_percentile(self._user_histogram(None), 0.75)
+        if p75 is None:
+            return []
+        # First bucket whose every answer is slower than p75
+        slow_bucket = next((i + 1 for i, bound in enumerate(LATENCY_BOUNDS) if bound >= p75),
+                           len(LATENCY_BOUNDS))
+        with self.db.connection() as conn:
+            rows = conn.execute('''
+                SELECT r.word_id, v.word, SUM(r.answers), SUM(r.correct), SUM(r.time_sum),
+                       SUM(CASE WHEN r.bucket >= ? THEN r.correct ELSE 0 END) AS slow_correct
+                FROM rollup_word_latency r
+                JOIN vocabulary v ON v.id = r.word_id
+                WHERE r.user_id = ?
+                GROUP BY r.word_id
+                HAVING SUM(r.answers) >= ? AND SUM(r.correct) >= ? * SUM(r.answers)
+                   AND slow_correct >= ? * SUM(r.correct) AND slow_correct > 0
+                ORDER BY slow_correct * 1.0 / SUM(r.correct) DESC, SUM(r.time_sum) / SUM(r.answers) DESC
+                LIMIT ?
+            ''', (slow_bucket, self.db.user_id, min_answers, min_accuracy, slow_share,
+                  limit)).fetchall()
+        return [{'word_id': word_id, 'word': word, 'answers': answers,
+                 'accuracy': correct / answers, 'mean_time': time_sum / answers,
+                 'slow_share': slow / correct}
+                for word_id, word, answers, correct, time_sum, slow in rows]
+
+    def retention_curve(self) -> List[Dict]:
+        """Share of answers correct by days since the word was last answered"""
+        with self.db.connection() as conn:
+            rows = conn.execute('''
+                SELECT bucket, answers, correct FROM rollup_retention
+                WHERE user_id = ? ORDER BY bucket
+            ''', (self.db.user_id,)).fetchall()
+        return [{'min_days': RETENTION_BOUNDS[bucket - 1] if bucket else 0,
+                 'max_days': RETENTION_BOUNDS[bucket] if bucket < len(RETENTION_BOUNDS) else None,
+                 'answers': answers, 'retention': correct / answers}
+                for bucket, answers, correct in rows if answers]
+
+    def _user_histogram(self, since: Optional[date]) -> Histogram:
+        with self.db.connection() as conn:
+            rows = conn.execute('''
+                SELECT bucket, SUM(answers), SUM(correct), SUM(time_sum) FROM rollup_user_latency
+                WHERE user_id = ? AND day >= ?
+                GROUP BY bucket
+            ''', (self.db.user_id, since.isoformat() if since else '')).fetchall()
+        return {bucket: (answers, correct, time_sum) for bucket, answers, correct, time_sum in rows}
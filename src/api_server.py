@@ -0,0 +1,400 @@
+"""Local HTTP/JSON API over VocabularyDatabase.
+
+A small asyncio HTTP/1.1 server (keep-alive, Content-Length bodies only)
+for driving the word bank from other programs on this machine:
+
+    GET  /users                      learner profiles
+    POST /users                      {"name": ..., "shard": false} -> {"id": ...}
+    GET  /users/<user>/next?count=1  multiple-choice cards, due ones first
+    POST /users/<user>/answers       {"word_id": ..., "choice": ..., "response_time": ...}
+                                     (or {"answers": [...]}) -> graded results
+    GET  /users/<user>/stats         progress statistics
+    GET  /users/<user>/analytics     response times, trend, slow words, retention
+    POST /import                     JSON array or JSON lines of word records
+
+``<user>`` is a profile id or name. Database calls run on a thread pool
+sized to the connection pool; answers from concurrent requests are
+coalesced by AnswerBatcher into a few write transactions.
+
+Usage: python -m src.api_server [--db vocabulary.db] [--port 8765] [--workers 8]
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .importer import normalize
+from .quiz_engine import MAX_QUESTIONS, QuestionGenerator
+
+MAX_BODY = 64 * 1024 * 1024
+
+_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+            500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Abort a request with this status and message"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AnswerBatcher:
+    """Coalesces answer submissions from concurrent requests into few transactions
+
+    Submissions arriving within ``window`` seconds of each other (or until
+    ``max_batch`` answers are waiting) are written together: every learner
+    in the main file inside one transaction on ``writer`` (a single thread),
+    and each sharded learner in a transaction of their own on
+    ``shard_executor``, since those never contend for the main file's write
+    lock. Each ``submit`` resolves once its answers are committed.
+    """
+
+    def __init__(self, db, writer: ThreadPoolExecutor, shard_executor: ThreadPoolExecutor,
+                 window: float = 0.002, max_batch: int = 1000):
+        self.db = db
+        self.window = window
+        self.max_batch = max_batch
+        self._writer = writer
+        self._shards = shard_executor
+        self._pending: List[Tuple[object, List[Dict], asyncio.Future]] = []
+        self._count = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, handle, answers: List[Dict]):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((handle, answers, future))
+        self._count += len(answers)
+        if self._count >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._count = self._pending, [], 0
+        if not pending:
+            return
+
+        main: Dict[object, List] = defaultdict(list)
+        shards: Dict[object, List] = defaultdict(list)
+        for entry in pending:
+            (main if entry[0].shard_path is None else shards)[entry[0]].append(entry)
+
+        loop = asyncio.get_running_loop()
+        if main:
+            self._dispatch(loop.run_in_executor(self._writer, self._write_main, main), main)
+        for handle, entries in shards.items():
+            self._dispatch(loop.run_in_executor(self._shards, self._write, handle, entries),
+                           {handle: entries})
+
+    @staticmethod
+    def _dispatch(task: asyncio.Future, groups: Dict[object, List]):
+        def done(task):
+            error = task.exception()
+            for entries in groups.values():
+                for _, _, future in entries:
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+        task.add_done_callback(done)
+
+    def _write_main(self, groups: Dict[object, List]):
+        with self.db.transaction():
+            for handle, entries in groups.items():
+                self._write(handle, entries)
+
+    @staticmethod
+    def _write(handle, entries: List):
+        handle.record_answers([answer for _, answers, _ in entries for answer in answers])
+
+
+class VocabularyAPI:
+    """Routes HTTP requests to a VocabularyDatabase
+
+    Reads run on a pool of ``workers`` threads. Writes to the main file
+    (profiles, imports, batched answers) go to a single writer thread, so
+    they queue in order rather than contending for SQLite's write lock.
+    """
+
+    def __init__(self, db, workers: int = 8, batch_window: float = 0.002):
+        self.db = db
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-db")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-writer")
+        self.batcher = AnswerBatcher(db, self.writer, self.executor, window=batch_window)
+        self.generator = QuestionGenerator(lambda: db.distractors)
+        self._handles: Dict[str, object] = {}
+        self.routes = [
+            ('GET', re.compile(r'/users'), self.list_users),
+            ('POST', re.compile(r'/users'), self.create_user),
+            ('GET', re.compile(r'/users/([^/]+)/next'), self.next_cards),
+            ('POST', re.compile(r'/users/([^/]+)/answers'), self.submit_answers),
+            ('GET', re.compile(r'/users/([^/]+)/stats'), self.stats),
+            ('GET', re.compile(r'/users/([^/]+)/analytics'), self.analytics),
+            ('POST', re.compile(r'/import'), self.import_words),
+        ]
+
+    def _run(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _write(self, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(self.writer, fn, *args)
+
+    async def _distractors(self):
+        """The distractor index; a missing one is built on the writer, never on the loop"""
+        index = self.db.cached_distractors()
+        if index is None:
+            index = await self._write(lambda: self.db.distractors)
+        return index
+
+    async def _user(self, user: str):
+        """The database handle for a profile id or name, cached after first use"""
+        handle = self._handles.get(user)
+        if handle is None:
+            try:
+                handle = await self._run(self.db.for_user, int(user) if user.isdigit() else user)
+            except ValueError as e:
+                raise HTTPError(404, str(e))
+            self._handles[user] = handle
+        return handle
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                return await handler(*match.groups(), query=query, body=body)
+            except HTTPError as e:
+                return e.status, {'error': str(e)}
+        if allowed:
+            return 405, {'error': f"{method} not allowed on {url.path}"}
+        return 404, {'error': f"No route for {url.path}"}
+
+    @staticmethod
+    def _json(body: bytes):
+        try:
+            return json.loads(body or b'null')
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+
+    async def list_users(self, query, body):
+        return 200, {'users': await self._run(self.db.get_users)}
+
+    async def create_user(self, query, body):
+        data = self._json(body)
+        if not isinstance(data, dict) or not str(data.get('name') or '').strip():
+            raise HTTPError(400, "A profile needs a name")
+        user_id = await self._write(self.db.create_user, str(data['name']).strip(),
+                                  bool(data.get('shard')))
+        if user_id is None:
+            raise HTTPError(409, f"Profile {data['name']!r} already exists")
+        return 201, {'id': user_id}
+
+    async def next_cards(self, user, query, body):
+        try:
+            count = max(1, min(int(query.get('count', 1)), MAX_QUESTIONS))
+        except ValueError:
+            raise HTTPError(400, "count must be an integer")
+        handle = await self._user(user)
+        cards = await self._run(self._pick, handle, count)
+        return 200, {'cards': cards}
+
+    def _pick(self, handle, count: int) -> List[Dict]:
+        """Due cards first, topped up with the learner's daily words"""
+        words = handle.get_due_words(count)
+        if len(words) < count:
+            seen = {w['id'] for w in words}
+            words += [w for w in handle.get_daily_words(count) if w['id'] not in seen][:count - len(words)]
+        cards = []
+        for word in words:
+            question = self.generator.make(word, 1, 1)
+            cards.append({'word_id': question.word_id, 'word': question.word,
+                          'prompt': question.prompt, 'choices': question.choices})
+        return cards
+
+    async def submit_answers(self, user, query, body):
+        data = self._json(body)
+        submitted = data.get('answers', [data]) if isinstance(data, dict) else data
+        if not isinstance(submitted, list) or not submitted:
+            raise HTTPError(400, "Expected an answer object or {\"answers\": [...]}")
+        handle = await self._user(user)
+
+        distractors = await self._distractors()
+        answers, results = [], []
+        for item in submitted:
+            try:
+                word_id = int(item['word_id'])
+                choice = item['choice']
+                response_time = float(item.get('response_time', 0.0))
+            except (KeyError, TypeError, ValueError):
+                raise HTTPError(400, "Each answer needs word_id, choice and optionally response_time")
+            correct_answer = distractors.definition(word_id)
+            if correct_answer is None:
+                raise HTTPError(404, f"Unknown word: {word_id}")
+            correct = choice == correct_answer
+            answers.append({'word_id': word_id, 'is_correct': correct, 'response_time': response_time})
+            results.append({'word_id': word_id, 'correct': correct, 'correct_answer': correct_answer})
+
+        await self.batcher.submit(handle, answers)
+        return 200, {'results': results}
+
+    async def stats(self, user, query, body):
+        handle = await self._user(user)
+        return 200, await self._run(handle.get_user_stats)
+
+    async def analytics(self, user, query, body):
+        try:
+            days = max(1, int(query.get('days', 30)))
+        except ValueError:
+            raise HTTPError(400, "days must be an integer")
+        handle = await self._user(user)
+        return 200, await self._run(self._analytics, handle.analytics, days)
+
+    @staticmethod
+    def _analytics(analytics, days: int) -> Dict:
+        return {
+            'latency': analytics.latency(),
+            'trend': analytics.trend(days=days),
+            'leeches': analytics.leeches(),
+            'retention': analytics.retention_curve(),
+        }
+
+    async def import_words(self, query, body):
+        category = query.get('category', 'general')
+        try:
+            difficulty = int(query.get('difficulty', 1))
+        except ValueError:
+            raise HTTPError(400, "difficulty must be an integer")
+        text = body.decode('utf-8', errors='replace').strip()
+        if text.startswith('['):
+            records = self._json(body)
+        else:
+            try:
+                records = [json.loads(line) for line in text.splitlines() if line.strip()]
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON line: {e}")
+        rows = [row for row in (normalize(r, difficulty, category) for r in records
+                                if isinstance(r, dict)) if row is not None]
+        report = await self._write(self._import, rows)
+        # Records without a text word and definition are skipped, not fatal
+        report['rejected'] = len(records) - len(rows)
+        return 200, report
+
+    def _import(self, rows: List[Dict]) -> Dict:
+        """Import on the writer thread, then rebuild the distractor index it dropped"""
+        report = self.db.import_words(rows)
+        self.db.distractors   # rebuild now, before a request on the event loop needs it
+        return report
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one keep-alive connection until the client closes it"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                if version == 'HTTP/1.1':
+                    keep_alive = connection != 'close'
+                else:
+                    keep_alive = connection == 'keep-alive'
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY:
+                    status, payload = 413, {'error': "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = await self.dispatch(method, target, body)
+                    except Exception as e:
+                        status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, backlog: int = 2048,
+                    ready: Optional[asyncio.Future] = None):
+        """Serve until cancelled; ``ready`` receives the bound port"""
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=backlog)
+        bound = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set_result(bound)
+        print(f"Serving on http://{host}:{bound}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.writer.shutdown(wait=True)
+        self.executor.shutdown(wait=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .database import VocabularyDatabase
+
+    parser = argparse.ArgumentParser(description="Serve the vocabulary database over HTTP/JSON")
+    parser.add_argument('--db', default='vocabulary.db', help="database path")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help="0 picks a free port")
+    parser.add_argument('--workers', type=int, default=8, help="database threads (and pooled connections)")
+    parser.add_argument('--batch-window', type=float, default=0.002,
+                        help="seconds to collect answers before writing them together")
+    args = parser.parse_args(argv)
+
+    with VocabularyDatabase(args.db, pool_size=args.workers + 2) as db:
+        api = VocabularyAPI(db, workers=args.workers, batch_window=args.batch_window)
+        try:
+            asyncio.run(api.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            api.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
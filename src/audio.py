@@ -0,0 +1,278 @@
+"""Pronunciation audio: clip cache and background playback.
+
+Clips come from a ``source`` callable, ``(word, pronunciation) -> WAV bytes``.
+The default, synthesize_clip, is a local stand-in for a TTS service: it
+renders a short deterministic tone sequence per word, so the whole audio
+path runs offline and in tests. AudioCache keeps rendered clips on disk,
+and AudioPlayer plays them on a background thread so the Tk loop only ever
+enqueues.
+"""
+import hashlib
+import io
+import math
+import os
+import queue
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import wave
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SAMPLE_RATE = 16000
+
+ClipSource = Callable[[str, str], bytes]
+
+
+def synthesize_clip(word: str, pronunciation: str = "", rate: int = SAMPLE_RATE) -> bytes:
+    """Stand-in TTS: a 16-bit mono WAV with one tone per letter
+
+    Pitches follow the letters of the respelling (or the word), and stressed
+    upper-case syllables are held longer, so different words sound different
+    and the same word always renders to the same bytes.
+    """
+    samples = array('h')
+    fade = rate // 200
+    for syllable in (pronunciation or word).split('-'):
+        length = rate * (12 if syllable.isupper() else 8) // 100
+        for letter in syllable.lower():
+            if not letter.isalpha():
+                continue
+            step = 2 * math.pi * 220 * 2 ** ((ord(letter) - ord('a')) / 12) / rate
+            for i in range(length):
+                envelope = min(1.0, i / fade, (length - i) / fade)
+                samples.append(int(12000 * envelope * math.sin(step * i)))
+        samples.extend([0] * (rate // 20))   # gap between syllables
+    if sys.byteorder == 'big':
+        samples.byteswap()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class AudioCache:
+    """Content-addressed on-disk clip cache with an LRU size cap
+
+    Each distinct clip is stored once, as ``<digest[:2]>/<digest>.wav``
+    under ``directory``, named by the SHA-256 of its bytes; an SQLite index
+    maps (word, pronunciation) to a digest and records when each clip was
+    last used. Storing a clip that takes the cache past ``max_bytes`` evicts
+    the least recently used clips and every word mapped to them. The
+    directory and index are created on first use rather than construction,
+    so a cache can be set up on the Tk thread and opened by a player thread.
+    """
+
+    def __init__(self, directory: str, source: ClipSource = synthesize_clip,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.source = source
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total = 0
+
+    def _index(self) -> sqlite3.Connection:
+        """The index connection, creating the directory and index on first use; hold the lock"""
+        if self._conn is not None:
+            return self._conn
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(self.directory, 'index.db'), isolation_level=None,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                used_at REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS clips (
+                key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_blobs_used ON blobs(used_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_clips_digest ON clips(digest)')
+        self._total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        self._conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        """Distinct clips on disk"""
+        with self._lock:
+            return self._index().execute('SELECT COUNT(*) FROM blobs').fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._index()
+            return self._total
+
+    def close(self):
+        """Close the index; a later lookup or store (a late prewarm) reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _key(word: str, pronunciation: str) -> str:
+        return f"{word}\x1f{pronunciation or ''}"
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.wav")
+
+    def lookup(self, word: str, pronunciation: str = "") -> Optional[str]:
+        """Path of the cached clip for a word, marking it used, or None on a miss"""
+        with self._lock:
+            conn = self._index()
+            row = conn.execute('SELECT digest FROM clips WHERE key = ?',
+                               (self._key(word, pronunciation),)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE blobs SET used_at = ? WHERE digest = ?', (time.time(), row[0]))
+        path = self._blob_path(row[0])
+        return path if os.path.exists(path) else None
+
+    def clip(self, word: str, pronunciation: str = "") -> str:
+        """Path of the clip for a word, rendering it through ``source`` on a miss"""
+        path = self.lookup(word, pronunciation)
+        if path is None:
+            # Rendering happens outside the lock; a race just renders identical bytes twice
+            path = self.store(word, pronunciation, self.source(word, pronunciation))
+        return path
+
+    def store(self, word: str, pronunciation: str, data: bytes) -> str:
+        """Add a clip for a word (e.g. a real recording) and return its path"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{threading.get_ident()}.tmp"
+            with open(partial, 'wb') as f:
+                f.write(data)
+            os.replace(partial, path)
+
+        with self._lock:
+            conn = self._index()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                added = conn.execute('INSERT OR IGNORE INTO blobs (digest, size, used_at) VALUES (?, ?, ?)',
+                                     (digest, len(data), time.time())).rowcount
+                if not added:
+                    conn.execute('UPDATE blobs SET used_at = ? WHERE digest = ?', (time.time(), digest))
+                conn.execute('INSERT OR REPLACE INTO clips (key, digest) VALUES (?, ?)',
+                             (self._key(word, pronunciation), digest))
+                self._total += len(data) if added else 0
+                evicted = self._evict(digest)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        for victim in evicted:
+            try:
+                os.remove(self._blob_path(victim))
+            except OSError:
+                pass   # already gone, or still open by a player (Windows); only the disk space lingers
+        return path
+
+    def _evict(self, keep: str) -> list:
+        """Drop least recently used clips until under the cap; returns their digests"""
+        if self._total <= self.max_bytes:
+            return []
+        victims, freed = [], 0
+        for digest, size in self._conn.execute(
+                'SELECT digest, size FROM blobs WHERE digest != ? ORDER BY used_at', (keep,)):
+            if self._total - freed <= self.max_bytes:
+                break
+            victims.append(digest)
+            freed += size
+        for digest in victims:
+            self._conn.execute('DELETE FROM clips WHERE digest = ?', (digest,))
+            self._conn.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+        self._total -= freed
+        return victims
+
+
+def system_backend() -> Callable[[str], None]:
+    """Blocking WAV player for this platform, or a silent one if there is none"""
+    if sys.platform == 'win32':
+        import winsound
+        return lambda path: winsound.PlaySound(path, winsound.SND_FILENAME)
+    for command in (['afplay'], ['paplay'], ['aplay', '-q']):
+        if shutil.which(command[0]):
+            return lambda path: subprocess.run(command + [path], stdout=subprocess.DEVNULL,
+                                               stderr=subprocess.DEVNULL, check=False)
+    return lambda path: None
+
+
+class AudioPlayer:
+    """Plays cached clips on a background thread; callers only enqueue
+
+    ``play`` never blocks: rendering a missing clip and playing it happen
+    on the player thread. Requests that pile up while a clip is playing
+    collapse to the newest, so flicking through cards never leaves a
+    backlog of stale words to sit through. ``prewarm`` renders clips ahead
+    on a separate worker so playback of the next cards is a cache hit.
+    Playback errors go to ``on_error`` (on the player thread) if given.
+    """
+
+    def __init__(self, cache: AudioCache, backend: Optional[Callable[[str], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self.cache = cache
+        self.backend = backend or system_backend()
+        self.on_error = on_error
+        self.played = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._warmer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='audio-warm')
+        self._thread = threading.Thread(target=self._run, name='audio-play', daemon=True)
+        self._thread.start()
+
+    def play(self, word: str, pronunciation: str = ""):
+        """Queue a word's clip for playback"""
+        self._queue.put((word, pronunciation))
+
+    def prewarm(self, words: Iterable[Tuple[str, str]]) -> Future:
+        """Render (word, pronunciation) clips in the background; resolves to the count"""
+        return self._warmer.submit(self._warm, list(words))
+
+    def _warm(self, words) -> int:
+        for word, pronunciation in words:
+            self.cache.clip(word, pronunciation)
+        return len(words)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            while item is not None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if item is None:
+                return
+            try:
+                self.backend(self.cache.clip(*item))
+                self.played += 1
+            except Exception as error:
+                if self.on_error:
+                    self.on_error(error)
+
+    def close(self):
+        """Stop after the clip playing now; pending plays are dropped"""
+        self._queue.put(None)
+        self._thread.join()
+        self._warmer.shutdown(wait=True)
+        self.cache.close()
@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Pragmas applied to every pooled connection. WAL lets readers run alongside the
+# single writer, and the cache/mmap sizes keep hot pages warm between calls.
+# auto_vacuum only takes effect on a new file (or after a VACUUM); it lets
+# compact_history return freed pages to the filesystem incrementally.
+DEFAULT_PRAGMAS = {
+    'auto_vacuum': 'INCREMENTAL',
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,       # negative = KiB, so ~16 MB per connection
+    'mmap_size': 268435456,     # 256 MB
+    'temp_store': 'MEMORY',
+}
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections with thread affinity.
+
+    A thread checks a connection out on its first ``connection()`` call and keeps
+    it until the outermost block exits, so nested calls on the same thread share
+    one connection (and one transaction). Connections are opened in autocommit
+    mode; ``transaction()`` issues the BEGIN/COMMIT explicitly.
+
+    ``attach_readonly`` maps schema names to database files attached to every
+    connection in read-only mode. Read-only attachments take no write locks, so
+    a transaction here never blocks writers of the attached files.
+
+    Every connection to ``':memory:'`` is a separate empty database, so an
+    in-memory pool holds a single connection, the one that owns the data;
+    other threads wait for it.
+    """
+
+    def __init__(self, db_path: str, max_connections: int = 8,
+                 pragmas: Optional[Dict] = None, statement_cache_size: int = 256,
+                 timeout: float = 5.0, attach_readonly: Optional[Dict[str, str]] = None):
+        self.db_path = db_path
+        self.max_connections = 1 if db_path == ':memory:' else max_connections
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.statement_cache_size = statement_cache_size
+        self.timeout = timeout
+        self.attach_readonly = dict(attach_readonly or {})
+
+        self._local = threading.local()
+        self._idle: List[sqlite3.Connection] = []
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                               isolation_level=None, check_same_thread=False,
+                               cached_statements=self.statement_cache_size,
+                               uri=bool(self.attach_readonly))
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        if self.attach_readonly:
+            # urllib.request is slow to import; only shard pools need it
+            from urllib.request import pathname2url
+        for name, path in self.attach_readonly.items():
+            uri = 'file:{}?mode=ro'.format(pathname2url(os.path.abspath(path)))
+            conn.execute(f'ATTACH DATABASE ? AS {name}', (uri,))
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one if the pool has room"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._open()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the idle list"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.append(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow this thread's connection for the duration of the block"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """Run the block in a transaction, joining an outer one if already open"""
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def close(self):
+        """Close every idle connection; busy ones close when released"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
@@ -1,118 +1,499 @@
 import sqlite3
+import copy
 import json
+import os
+import threading
+import time
+from itertools import islice
 from datetime import datetime, date
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Optional, Tuple, Union
+from .analytics import ResponseAnalytics
+from .connection_pool import ConnectionPool
+from .distractors import DistractorIndex
+from .migrations import SHARD_MIGRATIONS, migrate
+from .scheduler import CardState, Scheduler, get_scheduler, grade_answer
+from .search import VocabularySearch
+
+# The original single learner; every pre-profile row belongs to this user
+DEFAULT_USER_ID = 1
+
+# Read-modify-write of a word's progress as a single statement. Column references
+# in the UPDATE branch see the old row, so mastery moves up once accuracy reaches
+# 80% over at least three attempts and down when it drops below 50%. Scheduling
+# columns are computed in Python by the scheduler and written as-is.
+_UPSERT_PROGRESS_SQL = '''
+    INSERT INTO user_progress (user_id, word_id, correct_answers, total_attempts, mastery_level,
+                               last_reviewed, ease, interval_days, repetitions, lapses, stability,
+                               difficulty, due_at, last_review_at)
+    VALUES (:user_id, :word_id, :correct, 1, :correct,
+            :now, :ease, :interval_days, :repetitions, :lapses, :stability,
+            :difficulty, :due_at, :last_review_at)
+    ON CONFLICT(user_id, word_id) DO UPDATE SET
+        correct_answers = correct_answers + excluded.correct_answers,
+        total_attempts = total_attempts + 1,
+        mastery_level = CASE
+            WHEN total_attempts + 1 >= 3
+                 AND 5 * (correct_answers + excluded.correct_answers) >= 4 * (total_attempts + 1)
+                THEN MIN(mastery_level + 1, 3)
+            WHEN 2 * (correct_answers + excluded.correct_answers) < total_attempts + 1
+                THEN MAX(mastery_level - 1, 0)
+            ELSE mastery_level
+        END,
+        last_reviewed = excluded.last_reviewed,
+        ease = excluded.ease,
+        interval_days = excluded.interval_days,
+        repetitions = excluded.repetitions,
+        lapses = excluded.lapses,
+        stability = excluded.stability,
+        difficulty = excluded.difficulty,
+        due_at = excluded.due_at,
+        last_review_at = excluded.last_review_at
+'''
+
+_CARD_STATE_SQL = '''
+    SELECT word_id, ease, interval_days, repetitions, lapses, stability, difficulty,
+           due_at, last_review_at
+    FROM user_progress WHERE user_id = ? AND word_id IN ({})
+'''
+
+_INSERT_RESULT_SQL = '''
+    INSERT INTO quiz_results (user_id, word_id, answered_at, is_correct, response_time_seconds)
+    VALUES (:user_id, :word_id, :answered_at, :is_correct, :response_time)
+'''
+
+# The pickers walk a learner's slice of a due-date index on user_progress in
+# order and stop at LIMIT, so choosing the next cards never sorts anything.
+# The partial indexes are named because the planner otherwise prefers the
+# (user_id, mastery_level) browse index and sorts the learner's whole deck.
+_DAILY_WORDS_SQL = '''
+    SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation,
+           up.mastery_level, up.correct_answers, up.total_attempts
+    FROM user_progress up INDEXED BY idx_progress_learning_due
+    JOIN vocabulary v ON v.id = up.word_id
+    WHERE up.user_id = ? AND up.mastery_level < 3
+    ORDER BY up.due_at ASC, up.word_id ASC
+    LIMIT ?
+'''
+
+_REVIEW_WORDS_SQL = '''
+    SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation,
+           up.mastery_level, up.last_reviewed, up.due_at
+    FROM user_progress up INDEXED BY idx_progress_review_due
+    JOIN vocabulary v ON v.id = up.word_id
+    WHERE up.user_id = ? AND up.total_attempts > 0
+    ORDER BY up.due_at ASC, up.word_id ASC
+    LIMIT ?
+'''
+
+_DUE_WORDS_SQL = '''
+    SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation,
+           up.mastery_level, up.due_at, up.interval_days
+    FROM user_progress up
+    JOIN vocabulary v ON v.id = up.word_id
+    WHERE up.user_id = ? AND up.due_at <= ?
+    ORDER BY up.due_at ASC, up.word_id ASC
+    LIMIT ?
+'''
+
+_WORD_HISTORY_SQL = '''
+    SELECT answered_at, is_correct, response_time_seconds
+    FROM quiz_results
+    WHERE user_id = ? AND word_id = ?
+    ORDER BY answered_at DESC
+    LIMIT ?
+'''
+
+# Words for a quiz pack; {where} holds the optional category/difficulty/due filters
+_SELECT_WORDS_SQL = '''
+    SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation,
+           v.category, v.difficulty_level, up.mastery_level, up.due_at
+    FROM user_progress up
+    JOIN vocabulary v ON v.id = up.word_id
+    WHERE up.user_id = ? {where}
+    ORDER BY up.due_at ASC, up.word_id ASC
+    LIMIT ?
+'''
+
+# Word browser orders: name -> sort key over user_progress. Each key has a
+# (user_id, key, word_id) index and pages are keyset range scans on
+# (key, word_id), so no page ever counts or skips rows with OFFSET. The
+# cursor test is spelled out rather than a row-value comparison because
+# SQLite only turns the plain ``key >= ?`` form into an expression-index range.
+BROWSE_ORDERS = {
+    'added': 'up.word_id',
+    'mastery': 'up.mastery_level',
+    'accuracy': 'up.correct_answers * 1.0 / MAX(up.total_attempts, 1)',
+    'last_reviewed': 'COALESCE(up.last_review_at, 0)',
+}
+
+_BROWSE_SQL = '''
+    SELECT v.id, v.word, v.definition, v.category, v.difficulty_level,
+           up.mastery_level, up.correct_answers, up.total_attempts, up.last_review_at, {key}
+    FROM user_progress up
+    JOIN vocabulary v ON v.id = up.word_id
+    WHERE up.user_id = ? {where}
+    ORDER BY {order_by}
+    LIMIT ?
+'''
+
+_BROWSE_AFTER = 'AND {key} >= ? AND ({key} > ? OR up.word_id > ?)'
+_BROWSE_BEFORE = 'AND {key} <= ? AND ({key} < ? OR up.word_id < ?)'
+
+# Bulk edits take the word ids as one JSON array parameter, so each is a
+# single statement however many words are selected.
+_IDS = 'SELECT value FROM json_each(?)'
+
+# Above this many words a bulk edit drops the distractor index for a lazy
+# rebuild; patching it word by word would cost more.
+_DISTRACTOR_PATCH_LIMIT = 50
+
+# A learner's per-word rows in a shard, removed when their words are deleted;
+# the main file's delete cascade does the same for learners stored there
+_SHARD_WORD_TABLES = ('user_progress', 'quiz_results', 'rollup_word_latency', 'rollup_word_daily')
+
+# Answers older than the cutoff that are not their word's latest for the
+# learner, in id order from a resume point, for retention batches
+_EXPIRED_RESULTS_SQL = '''
+    SELECT id FROM quiz_results q
+    WHERE id > ? AND answered_at < ?
+      AND EXISTS (SELECT 1 FROM quiz_results n
+                  WHERE n.user_id = q.user_id AND n.word_id = q.word_id AND n.answered_at > q.answered_at)
+    ORDER BY id
+    LIMIT ?
+'''
+
+# Raw answers older than this are dropped by compact_history; the rollup
+# tables keep their totals
+HISTORY_TTL_DAYS = 365
+
+_USER_STATS_SQL = '''
+    SELECT (SELECT vocabulary_size FROM vocabulary_stats WHERE id = 1),
+           us.total_words, us.mastered_words, us.completed_sessions, us.score_sum,
+           us.current_streak, us.longest_streak, us.last_streak_date
+    FROM user_stats us
+    WHERE us.user_id = ?
+'''
+
+# Progress rows for every word a learner has no row for yet. Word ids only
+# grow, so the learner's highest enrolled word id marks where to resume.
+_ENROLL_SQL = '''
+    INSERT INTO user_progress (user_id, word_id, last_reviewed, due_at)
+    SELECT ?, id, ?, ? FROM vocabulary
+    WHERE id > (SELECT COALESCE(MAX(word_id), 0) FROM user_progress WHERE user_id = ?)
+'''
+
+# Queries on the quiz/session hot paths, with sample parameters, checked by
+# VocabularyDatabase.query_plan_problems() against full-table scans.
+HOT_QUERIES = {
+    'get_daily_words': (_DAILY_WORDS_SQL, (1, 5)),
+    'get_review_words': (_REVIEW_WORDS_SQL, (1, 10)),
+    'get_word_history': (_WORD_HISTORY_SQL, (1, 1, 20)),
+    'create_daily_session': ('SELECT id FROM daily_sessions WHERE user_id = ? AND session_date = ?',
+                             (1, '2000-01-01')),
+    'get_due_words': (_DUE_WORDS_SQL, (1, 0, 10)),
+    'update_word_progress': (_UPSERT_PROGRESS_SQL, dict.fromkeys(
+        ['user_id', 'word_id', 'correct', 'now', 'due_at', 'last_review_at'] + list(CardState._fields), 0)),
+    'get_user_stats': (_USER_STATS_SQL, (1,)),
+    'browse_words': (_BROWSE_SQL.format(
+        key=BROWSE_ORDERS['accuracy'], where=_BROWSE_AFTER.format(key=BROWSE_ORDERS['accuracy']),
+        order_by=BROWSE_ORDERS['accuracy'] + ', up.word_id'), (1, 0.5, 0.5, 0, 100)),
+    'autocomplete': ('SELECT word FROM vocabulary WHERE word >= ? COLLATE NOCASE '
+                     'AND word < ? COLLATE NOCASE ORDER BY word COLLATE NOCASE LIMIT ?', ('ab', 'ac', 10)),
+}
+
+def _file_bytes(path: str) -> int:
+    """Size of a database file plus its write-ahead log"""
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p))
+
 
 class VocabularyDatabase:
-    def __init__(self, db_path: str = "vocabulary.db"):
+    """The shared word bank plus one learner's progress
+    
+    A new instance works as the default learner; ``for_user`` returns a
+    handle on the same word bank for another learner. A learner created with
+    ``shard=True`` keeps progress, sessions and history in a file of their
+    own next to the main database, with the word bank attached read-only, so
+    their writes never lock the main file or anyone else's shard.
+    """
+    
+    def __init__(self, db_path: str = "vocabulary.db", pool_size: int = 8,
+                 pragmas: Optional[Dict] = None, scheduler: Union[str, Scheduler] = "sm2"):
         self.db_path = db_path
+        self.scheduler = get_scheduler(scheduler)
+        self.pool = ConnectionPool(db_path, max_connections=pool_size, pragmas=pragmas)
+        self.user_id = DEFAULT_USER_ID
+        self.shard_path = None
+        self._root = self
+        self._handles: Dict[int, 'VocabularyDatabase'] = {}
+        self._handles_lock = threading.Lock()
+        self._distractors = None
+        self._distractors_lock = threading.Lock()
+        self._distractors_generation = 0   # bumped whenever the index is dropped
+        self._search = None
         self.init_database()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def connection(self):
+        """Borrow a pooled connection (shared by nested calls on this thread)"""
+        return self.pool.connection()
+    
+    def transaction(self):
+        """Borrow a pooled connection inside a single write transaction"""
+        return self.pool.transaction()
+    
+    def close(self):
+        """Close all pooled connections, including every open learner shard
+        
+        On a learner handle this only closes that learner's shard, if any.
+        """
+        if self._root is not self:
+            if self.shard_path is not None:
+                self._root._handles.pop(self.user_id, None)
+                self.pool.close()
+            return
+        for handle in list(self._handles.values()):
+            handle.close()
+        self.pool.close()
+    
+    @property
+    def distractors(self) -> DistractorIndex:
+        """Wrong-answer index for quiz questions, built on first use
+        
+        Bulk edits drop the index rather than patch it, so hold on to the
+        database rather than the index to see the rebuilt one. Threads that
+        race for a missing index wait for a single build.
+        """
+        root = self._root
+        index = root._distractors
+        if index is None:
+            with root._distractors_lock:
+                index = root._distractors
+                if index is None:
+                    generation = root._distractors_generation
+                    index = DistractorIndex.from_database(root)
+                    # A bulk edit that landed mid-build leaves this index stale
+                    if generation == root._distractors_generation:
+                        root._distractors = index
+        return index
+    
+    def cached_distractors(self) -> Optional[DistractorIndex]:
+        """The distractor index if it is built, without building it"""
+        return self._root._distractors
+    
+    def _drop_distractors(self):
+        """Discard the distractor index so the next use rebuilds it"""
+        self._distractors_generation += 1
+        self._distractors = None
+    
+    @property
+    def analytics(self) -> ResponseAnalytics:
+        """Response-time and retention analytics for this learner"""
+        return ResponseAnalytics(self)
+    
+    @property
+    def search(self) -> VocabularySearch:
+        """Full-text, fuzzy and prefix word search"""
+        root = self._root
+        if root._search is None:
+            root._search = VocabularySearch(root)
+        return root._search
+    
+    def create_user(self, name: str, shard: bool = False) -> Optional[int]:
+        """Add a learner profile, enrolled in every word; None if the name is taken"""
+        root = self._root
+        if shard and root.db_path == ':memory:':
+            raise ValueError("An in-memory database cannot have progress shards")
+        try:
+            with root.transaction() as conn:
+                user_id = conn.execute('INSERT INTO users (name) VALUES (?)', (name,)).lastrowid
+                if shard:
+                    base = os.path.splitext(os.path.basename(root.db_path))[0]
+                    conn.execute('UPDATE users SET shard = ? WHERE id = ?',
+                                 (f'{base}.user{user_id}.db', user_id))
+        except sqlite3.IntegrityError:
+            return None  # Name already exists
+        
+        # Shard handles enroll as they are opened
+        handle = self.for_user(user_id)
+        if not shard:
+            handle._enroll()
+        return user_id
+    
+    def get_users(self) -> List[Dict]:
+        """Every learner profile"""
+        with self._root.connection() as conn:
+            rows = conn.execute('SELECT id, name, shard, created_date FROM users ORDER BY id').fetchall()
+        return [{'id': row[0], 'name': row[1], 'shard': row[2], 'created_date': row[3]} for row in rows]
+    
+    def for_user(self, user: Union[int, str]) -> 'VocabularyDatabase':
+        """A handle on this word bank for the learner with this id or name
+        
+        Handles share the word bank, distractor index and search. A sharded
+        learner's file is attached on first use and brought up to date with
+        words added since it was last open.
+        """
+        root = self._root
+        column = 'id' if isinstance(user, int) else 'name'
+        with root.connection() as conn:
+            row = conn.execute(f'SELECT id, shard FROM users WHERE {column} = ?', (user,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown user: {user!r}")
+        user_id, shard = row
+        if user_id == root.user_id:
+            return root
+        with root._handles_lock:
+            if user_id not in root._handles:
+                root._handles[user_id] = root._open_handle(user_id, shard)
+            return root._handles[user_id]
+    
+    def _open_handle(self, user_id: int, shard: Optional[str]) -> 'VocabularyDatabase':
+        root = self
+        handle = copy.copy(root)
+        handle.user_id = user_id
+        handle._root = root
+        if shard is not None:
+            handle.shard_path = os.path.join(os.path.dirname(root.db_path), shard)
+            handle.pool = ConnectionPool(handle.shard_path, max_connections=root.pool.max_connections,
+                                         pragmas=root.pool.pragmas, attach_readonly={'bank': root.db_path})
+            with handle.connection() as conn:
+                migrate(conn, SHARD_MIGRATIONS)
+            handle._enroll(prune=True)
+        return handle
+    
+    def _enroll(self, prune: bool = False):
+        """Create this learner's progress rows for words they have none for yet
+        
+        With ``prune`` it also drops progress and history for words deleted from
+        the bank while a shard was closed; the delete cascade only reaches the
+        main file.
+        """
+        with self.transaction() as conn:
+            conn.execute('INSERT OR IGNORE INTO user_stats (user_id) VALUES (?)', (self.user_id,))
+            conn.execute(_ENROLL_SQL, (self.user_id, datetime.now().isoformat(), int(time.time()),
+                                       self.user_id))
+            if prune:
+                gone = [row[0] for row in conn.execute('''
+                    SELECT word_id FROM user_progress
+                    WHERE user_id = ? AND NOT EXISTS (SELECT 1 FROM vocabulary v WHERE v.id = word_id)
+                ''', (self.user_id,))]
+                if gone:
+                    self._delete_word_rows(conn, gone)
+    
+    def _open_shards(self) -> List['VocabularyDatabase']:
+        return [h for h in self._root._handles.values() if h.shard_path is not None]
+    
     def init_database(self):
-        """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Vocabulary words table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS vocabulary (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL UNIQUE,
-                definition TEXT NOT NULL,
-                example_sentence TEXT,
-                pronunciation TEXT,
-                difficulty_level INTEGER DEFAULT 1,
-                category TEXT DEFAULT 'general',
-                created_date TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # User progress table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word_id INTEGER UNIQUE,
-                correct_answers INTEGER DEFAULT 0,
-                total_attempts INTEGER DEFAULT 0,
-                last_reviewed TEXT,
-                mastery_level INTEGER DEFAULT 0,
-                FOREIGN KEY (word_id) REFERENCES vocabulary (id)
-            )
-        ''')
-        
-        # Daily sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS daily_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_date TEXT NOT NULL,
-                words_learned INTEGER DEFAULT 0,
-                quiz_score REAL DEFAULT 0.0,
-                total_time_minutes INTEGER DEFAULT 0,
-                session_completed BOOLEAN DEFAULT FALSE
-            )
-        ''')
-        
-        # Quiz results table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS quiz_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word_id INTEGER,
-                session_date TEXT,
-                is_correct BOOLEAN,
-                response_time_seconds REAL,
-                FOREIGN KEY (word_id) REFERENCES vocabulary (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Initialize the database, applying any pending schema migrations"""
+        with self.connection() as conn:
+            migrate(conn)
     
     def add_vocabulary_word(self, word: str, definition: str, example: str = "", 
                            pronunciation: str = "", difficulty: int = 1, category: str = "general"):
         """Add a new vocabulary word to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        if self._root is not self:
+            return self._root.add_vocabulary_word(word, definition, example, pronunciation,
+                                                  difficulty, category)
         try:
-            cursor.execute('''
-                INSERT INTO vocabulary (word, definition, example_sentence, pronunciation, difficulty_level, category)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (word, definition, example, pronunciation, difficulty, category))
-            
-            word_id = cursor.lastrowid
-            
-            # Initialize user progress entry
-            cursor.execute('''
-                INSERT INTO user_progress (word_id, last_reviewed)
-                VALUES (?, ?)
-                ON CONFLICT(word_id) DO NOTHING
-            ''', (word_id, datetime.now().isoformat()))
-            
-            conn.commit()
-            return word_id
+            with self.transaction() as conn:
+                cursor = conn.execute('''
+                    INSERT INTO vocabulary (word, definition, example_sentence, pronunciation, difficulty_level, category)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (word, definition, example, pronunciation, difficulty, category))
+                
+                word_id = cursor.lastrowid
+                
+                # Initialize progress for every learner kept in this file
+                conn.execute('''
+                    INSERT OR IGNORE INTO user_progress (user_id, word_id, last_reviewed, due_at)
+                    SELECT id, ?, ?, ? FROM users WHERE shard IS NULL
+                ''', (word_id, datetime.now().isoformat(), int(time.time())))
         except sqlite3.IntegrityError:
             return None  # Word already exists
-        finally:
-            conn.close()
+        
+        for handle in self._open_shards():
+            handle._enroll()
+        if self._distractors is not None:
+            self._distractors.add_word(word_id, definition, category, difficulty)
+        return word_id
+    
+    def import_words(self, rows: Iterable[Tuple], chunk_size: int = 50000) -> Dict:
+        """Bulk-insert words in one transaction, skipping words that already exist
+        
+        ``rows`` yields (word, definition, example, pronunciation, difficulty,
+        category) tuples and is consumed in chunks of ``chunk_size``, so it can
+        stream from a file. Progress rows for the new words are created with a
+        single INSERT ... SELECT at the end. Returns a throughput report.
+        """
+        if self._root is not self:
+            return self._root.import_words(rows, chunk_size)
+        start = time.perf_counter()
+        read = inserted = 0
+        rows = iter(rows)
+        
+        with self.transaction() as conn:
+            last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM vocabulary').fetchone()[0]
+            conn.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS import_staging (
+                    word TEXT, definition TEXT, example_sentence TEXT,
+                    pronunciation TEXT, difficulty_level INTEGER, category TEXT
+                )
+            ''')
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                read += len(chunk)
+                # Stage the chunk, then insert it set-wise. The NOT EXISTS probe
+                # skips known words without burning AUTOINCREMENT ids; OR IGNORE
+                # catches repeats within the deck itself.
+                conn.execute('DELETE FROM temp.import_staging')
+                conn.executemany('INSERT INTO temp.import_staging VALUES (?, ?, ?, ?, ?, ?)', chunk)
+                inserted += conn.execute('''
+                    INSERT OR IGNORE INTO vocabulary
+                        (word, definition, example_sentence, pronunciation, difficulty_level, category)
+                    SELECT s.word, s.definition, s.example_sentence, s.pronunciation,
+                           s.difficulty_level, s.category
+                    FROM temp.import_staging s
+                    WHERE NOT EXISTS (SELECT 1 FROM vocabulary v WHERE v.word = s.word)
+                ''').rowcount
+            conn.execute('DROP TABLE temp.import_staging')
+            
+            # AUTOINCREMENT ids only grow, so every new word has id > last_id
+            conn.execute('''
+                INSERT OR IGNORE INTO user_progress (user_id, word_id, last_reviewed, due_at)
+                SELECT u.id, v.id, ?, ? FROM users u, vocabulary v
+                WHERE u.shard IS NULL AND v.id > ?
+            ''', (datetime.now().isoformat(), int(time.time()), last_id))
+        
+        for handle in self._open_shards():
+            handle._enroll()
+        # Patching the distractor pools word by word would dominate a bulk
+        # import; rebuild the index on next use instead.
+        if inserted:
+            self._drop_distractors()
+        
+        seconds = time.perf_counter() - start
+        return {
+            'read': read,
+            'inserted': inserted,
+            'duplicates': read - inserted,
+            'seconds': seconds,
+            'rows_per_second': read / seconds if seconds > 0 else 0.0
+        }
     
     def get_daily_words(self, count: int = 5) -> List[Dict]:
         """Get words for daily learning session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get words that haven't been mastered yet
-        cursor.execute('''
-            SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation, 
-                   up.mastery_level, up.correct_answers, up.total_attempts
-            FROM vocabulary v
-            LEFT JOIN user_progress up ON v.id = up.word_id
-            WHERE up.mastery_level < 3 OR up.mastery_level IS NULL
-            ORDER BY up.last_reviewed ASC, v.id ASC
-            LIMIT ?
-        ''', (count,))
+        with self.connection() as conn:
+            # Get words that haven't been mastered yet
+            rows = conn.execute(_DAILY_WORDS_SQL, (self.user_id, count)).fetchall()
         
         words = []
-        for row in cursor.fetchall():
+        for row in rows:
             words.append({
                 'id': row[0],
                 'word': row[1],
@@ -124,85 +505,132 @@ class VocabularyDatabase:
                 'total_attempts': row[7] or 0
             })
         
-        conn.close()
         return words
     
     def record_quiz_result(self, word_id: int, is_correct: bool, response_time: float = 0.0):
         """Record a quiz result"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO quiz_results (word_id, session_date, is_correct, response_time_seconds)
-            VALUES (?, ?, ?, ?)
-        ''', (word_id, datetime.now().isoformat(), is_correct, response_time))
-        
-        conn.commit()
-        conn.close()
-    
-    def update_word_progress(self, word_id: int, is_correct: bool, response_time: float = 0.0):
-        """Update progress for a specific word"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get current progress
-        cursor.execute('''
-            SELECT correct_answers, total_attempts, mastery_level
-            FROM user_progress WHERE word_id = ?
-        ''', (word_id,))
-        
-        result = cursor.fetchone()
-        if result:
-            correct, total, mastery = result
-            correct += 1 if is_correct else 0
-            total += 1
-            
-            # Update mastery level based on performance
-            accuracy = correct / total if total > 0 else 0
-            if total >= 3 and accuracy >= 0.8:
-                mastery = min(mastery + 1, 3)
-            elif accuracy < 0.5:
-                mastery = max(mastery - 1, 0)
-        else:
-            correct = 1 if is_correct else 0
-            total = 1
-            mastery = 1 if is_correct else 0
-        
-        # Update or insert progress
-        cursor.execute('''
-            INSERT INTO user_progress 
-            (word_id, correct_answers, total_attempts, mastery_level, last_reviewed)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(word_id) DO UPDATE SET
-                correct_answers = excluded.correct_answers,
-                total_attempts = excluded.total_attempts,
-                mastery_level = excluded.mastery_level,
-                last_reviewed = excluded.last_reviewed
-        ''', (word_id, correct, total, mastery, datetime.now().isoformat()))
-        
-        # Record quiz result
-        self.record_quiz_result(word_id, is_correct, response_time)
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            conn.execute(_INSERT_RESULT_SQL, {
+                'user_id': self.user_id, 'word_id': word_id, 'answered_at': int(time.time()),
+                'is_correct': bool(is_correct), 'response_time': response_time
+            })
+    
+    def _answer_params(self, conn: sqlite3.Connection, results: List[Dict],
+                       skip_stale: bool = False) -> List[Dict]:
+        """Build upsert/insert parameters for answers, running the scheduler in order
+        
+        With ``skip_stale`` answers older than their card's last review are left out.
+        """
+        now = time.time()
+        now_iso = datetime.now().isoformat()
+        word_ids = list({r['word_id'] for r in results})
+        states = {}
+        for row in conn.execute(_CARD_STATE_SQL.format(','.join('?' * len(word_ids))),
+                                [self.user_id] + word_ids):
+            states[row[0]] = CardState(*row[1:])
+        
+        params = []
+        for r in results:
+            word_id = r['word_id']
+            response_time = r.get('response_time', 0.0)
+            # Answers given offline (quiz packs) carry the time they were made
+            at = int(r.get('answered_at') or now)
+            at_iso = datetime.fromtimestamp(at).isoformat() if 'answered_at' in r else now_iso
+            state = states.get(word_id) or CardState(due_at=at)
+            if skip_stale and state.last_review_at is not None and at < state.last_review_at:
+                continue
+            state = self.scheduler.review(state, grade_answer(r['is_correct'], response_time), at)
+            states[word_id] = state
+            params.append(dict(state._asdict(), user_id=self.user_id, word_id=word_id, now=at_iso,
+                               answered_at=at, is_correct=bool(r['is_correct']), correct=1 if r['is_correct'] else 0,
+                               response_time=response_time))
+        return params
+    
+    def update_word_progress(self, word_id: int, is_correct: bool, response_time: float = 0.0) -> Dict:
+        """Update progress for a specific word and record the answer atomically"""
+        with self.transaction() as conn:
+            params = self._answer_params(conn, [{
+                'word_id': word_id, 'is_correct': is_correct, 'response_time': response_time
+            }])[0]
+            correct, total, mastery = conn.execute(
+                _UPSERT_PROGRESS_SQL + 'RETURNING correct_answers, total_attempts, mastery_level',
+                params).fetchone()
+            conn.execute(_INSERT_RESULT_SQL, params)
+        
+        return {
+            'correct_answers': correct,
+            'total_attempts': total,
+            'mastery_level': mastery,
+            'due_at': params['due_at'],
+            'interval_days': params['interval_days']
+        }
+    
+    def record_answers(self, results: List[Dict]) -> int:
+        """Record a whole quiz submission in one transaction
+        
+        Each result is a dict with 'word_id', 'is_correct' and optionally
+        'response_time' and 'answered_at' (epoch seconds, default now).
+        Answers are applied in order, so repeated words see each other's
+        progress updates.
+        """
+        if not results:
+            return 0
+        
+        with self.transaction() as conn:
+            params = self._answer_params(conn, results)
+            conn.executemany(_UPSERT_PROGRESS_SQL, params)
+            conn.executemany(_INSERT_RESULT_SQL, params)
+        return len(params)
+    
+    def merge_pack_answers(self, pack_id: str, results: List[Dict]) -> Optional[int]:
+        """Record answers given offline from a quiz pack, at most once per pack
+        
+        Results are as for record_answers, oldest first. Answers older than
+        their card's last review are skipped, so progress made since the export
+        stands. Returns how many answers were applied, or None if this learner
+        has already merged ``pack_id``.
+        """
+        with self.transaction() as conn:
+            if not conn.execute('INSERT OR IGNORE INTO merged_packs (user_id, pack_id, merged_at) '
+                                'VALUES (?, ?, ?)', (self.user_id, pack_id, int(time.time()))).rowcount:
+                return None
+            params = self._answer_params(conn, results, skip_stale=True) if results else []
+            conn.executemany(_UPSERT_PROGRESS_SQL, params)
+            conn.executemany(_INSERT_RESULT_SQL, params)
+        return len(params)
+    
+    def get_due_words(self, count: int = 10, now: Optional[float] = None) -> List[Dict]:
+        """Get the next cards whose scheduled review time has passed"""
+        now = int(time.time() if now is None else now)
+        with self.connection() as conn:
+            rows = conn.execute(_DUE_WORDS_SQL, (self.user_id, now, count)).fetchall()
+        
+        return [{
+            'id': row[0],
+            'word': row[1],
+            'definition': row[2],
+            'example': row[3],
+            'pronunciation': row[4],
+            'mastery_level': row[5],
+            'due_at': row[6],
+            'interval_days': row[7]
+        } for row in rows]
+    
+    def get_word_history(self, word_id: int, limit: int = 20) -> List[Dict]:
+        """Get the most recent quiz results for a word"""
+        with self.connection() as conn:
+            rows = conn.execute(_WORD_HISTORY_SQL, (self.user_id, word_id, limit)).fetchall()
+        
+        return [{'session_date': datetime.fromtimestamp(row[0]).isoformat(), 'is_correct': bool(row[1]),
+                 'response_time': row[2]} for row in rows]
     
     def get_review_words(self, count: int = 10) -> List[Dict]:
         """Get words for review session"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT v.id, v.word, v.definition, v.example_sentence, v.pronunciation,
-                   up.mastery_level, up.last_reviewed
-            FROM vocabulary v
-            JOIN user_progress up ON v.id = up.word_id
-            WHERE up.total_attempts > 0
-            ORDER BY up.last_reviewed ASC
-            LIMIT ?
-        ''', (count,))
+        with self.connection() as conn:
+            rows = conn.execute(_REVIEW_WORDS_SQL, (self.user_id, count)).fetchall()
         
         words = []
-        for row in cursor.fetchall():
+        for row in rows:
             words.append({
                 'id': row[0],
                 'word': row[1],
@@ -210,80 +638,275 @@ class VocabularyDatabase:
                 'example': row[3],
                 'pronunciation': row[4],
                 'mastery_level': row[5],
-                'last_reviewed': row[6]
+                'last_reviewed': row[6],
+                'due_at': row[7]
             })
         
-        conn.close()
         return words
     
+    def select_words(self, category: Optional[str] = None, difficulty: Optional[int] = None,
+                     due: bool = False, limit: int = 100, now: Optional[float] = None) -> List[Dict]:
+        """Words matching a selection, soonest due first
+        
+        ``category`` and ``difficulty`` filter the word bank; ``due`` keeps
+        only cards whose scheduled review time has passed.
+        """
+        where, params = [], [self.user_id]
+        if category is not None:
+            where.append('AND v.category = ?')
+            params.append(category)
+        if difficulty is not None:
+            where.append('AND v.difficulty_level = ?')
+            params.append(difficulty)
+        if due:
+            where.append('AND up.due_at <= ?')
+            params.append(int(time.time() if now is None else now))
+        with self.connection() as conn:
+            rows = conn.execute(_SELECT_WORDS_SQL.format(where=' '.join(where)),
+                                params + [limit]).fetchall()
+        
+        return [{
+            'id': row[0],
+            'word': row[1],
+            'definition': row[2],
+            'example': row[3],
+            'pronunciation': row[4],
+            'category': row[5],
+            'difficulty': row[6],
+            'mastery_level': row[7],
+            'due_at': row[8]
+        } for row in rows]
+    
+    def browse_words(self, order: str = 'added', descending: bool = False,
+                     after: Optional[Tuple] = None, before: Optional[Tuple] = None,
+                     seek: Optional[float] = None, limit: int = 100) -> List[Dict]:
+        """One page of the word browser in ``order`` (a BROWSE_ORDERS key)
+        
+        Rows come back in display order, each with a 'cursor'. Passing a row's
+        cursor as ``after`` gives the page following it, as ``before`` the page
+        preceding it. ``seek`` jumps to a fraction of the way through the sort
+        key's range (1.0 is the last page); it interpolates between the key's
+        smallest and largest values, so the position is approximate.
+        """
+        key = BROWSE_ORDERS[order]
+        backward = before is not None or (seek is not None and seek >= 1)
+        ascending = backward == descending
+        cursor = before if before is not None else after
+        
+        with self.connection() as conn:
+            if seek is not None and 0 < seek < 1:
+                ends = [conn.execute(f'SELECT {key} FROM user_progress up WHERE up.user_id = ? '
+                                     f'ORDER BY {key} {d} LIMIT 1', (self.user_id,)).fetchone()
+                        for d in ('ASC', 'DESC')]
+                if ends[0] is not None:
+                    low, high = ends[0][0], ends[1][0]
+                    target = high - seek * (high - low) if descending else low + seek * (high - low)
+                    # Just outside the id range, so the seek lands on the first row at ``target``
+                    cursor = (target, 2 ** 63 - 1) if descending else (target, -1)
+            
+            if cursor is None:
+                where, params = '', [self.user_id]
+            else:
+                where = (_BROWSE_AFTER if ascending else _BROWSE_BEFORE).format(key=key)
+                params = [self.user_id, cursor[0], cursor[0], cursor[1]]
+            direction = 'ASC' if ascending else 'DESC'
+            order_by = [f'{key} {direction}']
+            if key != 'up.word_id':
+                order_by.append(f'up.word_id {direction}')
+            rows = conn.execute(_BROWSE_SQL.format(key=key, where=where, order_by=', '.join(order_by)),
+                                params + [limit]).fetchall()
+        
+        if backward:
+            rows.reverse()
+        return [{
+            'id': row[0],
+            'word': row[1],
+            'definition': row[2],
+            'category': row[3],
+            'difficulty': row[4],
+            'mastery_level': row[5],
+            'accuracy': row[6] / row[7] if row[7] else None,
+            'last_review_at': row[8],
+            'cursor': (row[9], row[0])
+        } for row in rows]
+    
+    def _patch_distractors(self, conn: sqlite3.Connection, word_ids: List[int], removed: bool):
+        """Bring the distractor index in line with a bulk edit of ``word_ids``"""
+        if self._distractors is None:
+            return
+        if len(word_ids) > _DISTRACTOR_PATCH_LIMIT:
+            self._drop_distractors()
+            return
+        for word_id in word_ids:
+            self._distractors.remove_word(word_id)
+        if not removed:
+            for row in conn.execute(f'SELECT id, definition, category, difficulty_level FROM vocabulary '
+                                    f'WHERE id IN ({_IDS})', (json.dumps(word_ids),)):
+                self._distractors.add_word(*row)
+    
+    def delete_words(self, word_ids: List[int]) -> int:
+        """Delete words along with every learner's progress and quiz history"""
+        if self._root is not self:
+            return self._root.delete_words(word_ids)
+        word_ids = list(word_ids)
+        with self.transaction() as conn:
+            deleted = conn.execute(f'DELETE FROM vocabulary WHERE id IN ({_IDS})',
+                                   (json.dumps(word_ids),)).rowcount
+            self._patch_distractors(conn, word_ids, removed=True)
+        
+        # Shards closed now are pruned when next opened
+        for handle in self._open_shards():
+            with handle.transaction() as conn:
+                handle._delete_word_rows(conn, word_ids)
+        return deleted
+    
+    def _delete_word_rows(self, conn: sqlite3.Connection, word_ids: List[int]):
+        """Drop this learner's shard progress, answers and rollups for ``word_ids``"""
+        for table in _SHARD_WORD_TABLES:
+            conn.execute(f'DELETE FROM {table} WHERE user_id = ? AND word_id IN ({_IDS})',
+                         (self.user_id, json.dumps(word_ids)))
+    
+    def update_words(self, word_ids: List[int], category: Optional[str] = None,
+                     difficulty: Optional[int] = None) -> int:
+        """Set the category and/or difficulty of many words at once"""
+        if self._root is not self:
+            return self._root.update_words(word_ids, category, difficulty)
+        word_ids = list(word_ids)
+        if category is None and difficulty is None:
+            return 0
+        with self.transaction() as conn:
+            updated = conn.execute(f'''
+                UPDATE vocabulary SET
+                    category = COALESCE(?, category),
+                    difficulty_level = COALESCE(?, difficulty_level)
+                WHERE id IN ({_IDS})
+            ''', (category, difficulty, json.dumps(word_ids))).rowcount
+            self._patch_distractors(conn, word_ids, removed=False)
+        return updated
+    
+    def reset_progress(self, word_ids: List[int]) -> int:
+        """Forget this learner's progress on many words; they become new and due now"""
+        with self.transaction() as conn:
+            return conn.execute(f'''
+                UPDATE user_progress SET
+                    correct_answers = 0, total_attempts = 0, mastery_level = 0, last_reviewed = ?,
+                    ease = 2.5, interval_days = 0, repetitions = 0, lapses = 0,
+                    stability = 0, difficulty = 0, due_at = ?, last_review_at = NULL
+                WHERE user_id = ? AND word_id IN ({_IDS})
+            ''', (datetime.now().isoformat(), int(time.time()), self.user_id,
+                  json.dumps(list(word_ids)))).rowcount
+    
+    def compact_history(self, max_age_days: int = HISTORY_TTL_DAYS, batch_size: int = 20000,
+                        vacuum_pages: int = 0) -> Dict:
+        """Delete raw answers older than ``max_age_days`` and hand the space back
+    
+        Works on the file this handle writes to: the main database (every
+        learner in it) or this learner's shard. Expired answers are already
+        counted in the rollup tables that analytics read, and each word's
+        latest answer is kept so the next one still has a retention gap.
+        Deletes run in batches, a transaction each, so quiz writes only ever
+        wait for one batch. Free pages are then released with an incremental
+        vacuum (``vacuum_pages`` at most, 0 for all); a file created before
+        incremental auto_vacuum gets a one-off full VACUUM to convert it.
+        """
+        path = self.shard_path or self.db_path
+        size_before = _file_bytes(path)
+        start = time.perf_counter()
+        cutoff = int(time.time()) - max_age_days * 86400
+        deleted, last_id = 0, 0
+        while True:
+            with self.transaction() as conn:
+                ids = [row[0] for row in conn.execute(_EXPIRED_RESULTS_SQL, (last_id, cutoff, batch_size))]
+                if not ids:
+                    break
+                conn.execute(f'DELETE FROM quiz_results WHERE id IN ({_IDS})', (json.dumps(ids),))
+            deleted += len(ids)
+            last_id = ids[-1]
+    
+        with self.connection() as conn:
+            full_vacuum = conn.execute('PRAGMA main.auto_vacuum').fetchone()[0] != 2
+            if full_vacuum:
+                conn.execute('PRAGMA main.auto_vacuum = INCREMENTAL')
+                conn.execute('VACUUM main')
+            else:
+                conn.execute(f'PRAGMA main.incremental_vacuum({vacuum_pages})').fetchall()
+            # main only: a shard's attached word bank is read-only
+            conn.execute('PRAGMA main.wal_checkpoint(TRUNCATE)')
+        size_after = _file_bytes(path)
+    
+        return {
+            'deleted': deleted,
+            'bytes_before': size_before,
+            'bytes_after': size_after,
+            'reclaimed_bytes': size_before - size_after,
+            'full_vacuum': full_vacuum,
+            'seconds': time.perf_counter() - start
+        }
+    
     def create_daily_session(self) -> int:
         """Create a new daily session record"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         today = date.today().isoformat()
         
-        # Check if session already exists for today
-        cursor.execute('SELECT id FROM daily_sessions WHERE session_date = ?', (today,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            conn.close()
-            return existing[0]
-        
-        cursor.execute('''
-            INSERT INTO daily_sessions (session_date)
-            VALUES (?)
-        ''', (today,))
-        
-        session_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            # Check if session already exists for today
+            existing = conn.execute('SELECT id FROM daily_sessions WHERE user_id = ? AND session_date = ?',
+                                    (self.user_id, today)).fetchone()
+            
+            if existing:
+                return existing[0]
+            
+            cursor = conn.execute('''
+                INSERT INTO daily_sessions (user_id, session_date)
+                VALUES (?, ?)
+            ''', (self.user_id, today))
+            
+            session_id = cursor.lastrowid
         return session_id if session_id is not None else 0
     
     def update_session_stats(self, session_id: int, words_learned: int, quiz_score: float):
         """Update daily session statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE daily_sessions 
-            SET words_learned = ?, quiz_score = ?, session_completed = TRUE
-            WHERE id = ?
-        ''', (words_learned, quiz_score, session_id))
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            conn.execute('''
+                UPDATE daily_sessions 
+                SET words_learned = ?, quiz_score = ?, session_completed = TRUE
+                WHERE id = ?
+            ''', (words_learned, quiz_score, session_id))
     
     def get_user_stats(self) -> Dict:
-        """Get overall user statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total words learned
-        cursor.execute('SELECT COUNT(*) FROM user_progress WHERE total_attempts > 0')
-        total_words = cursor.fetchone()[0]
-        
-        # Mastered words
-        cursor.execute('SELECT COUNT(*) FROM user_progress WHERE mastery_level >= 3')
-        mastered_words = cursor.fetchone()[0]
+        """Get overall user statistics from the materialized user_stats row"""
+        with self.connection() as conn:
+            row = conn.execute(_USER_STATS_SQL, (self.user_id,)).fetchone()
         
-        # Average quiz score
-        cursor.execute('SELECT AVG(quiz_score) FROM daily_sessions WHERE session_completed = TRUE')
-        avg_score = cursor.fetchone()[0] or 0.0
+        (vocabulary_size, total_words, mastered_words, completed_sessions, score_sum,
+         current_streak, longest_streak, last_streak_date) = row
         
-        # Streak (consecutive days)
-        cursor.execute('''
-            SELECT COUNT(*) FROM daily_sessions 
-            WHERE session_completed = TRUE AND session_date >= date('now', '-7 days')
-        ''')
-        recent_sessions = cursor.fetchone()[0]
-        
-        conn.close()
+        # A streak is only current if the last session was today or yesterday
+        if last_streak_date is None or (date.today() - date.fromisoformat(last_streak_date)).days > 1:
+            current_streak = 0
         
         return {
+            'vocabulary_size': vocabulary_size,
             'total_words': total_words,
             'mastered_words': mastered_words,
-            'average_score': round(avg_score, 1),
-            'recent_sessions': recent_sessions
-        }
\ No newline at end of file
+            'average_score': round(score_sum / completed_sessions, 1) if completed_sessions else 0.0,
+            'current_streak': current_streak,
+            'longest_streak': longest_streak
+        }
+    
+    def query_plan_problems(self) -> Dict[str, List[str]]:
+        """Return EXPLAIN QUERY PLAN lines of hot queries that scan a whole table
+        
+        A plan step is a problem if it scans a table without an index or sorts
+        through a temporary B-tree. An empty dict means every hot query is
+        served from an index.
+        """
+        problems = {}
+        with self.connection() as conn:
+            for name, (sql, params) in HOT_QUERIES.items():
+                plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+                bad = [detail for detail in plan
+                       if (detail.startswith('SCAN ') and ' USING ' not in detail)
+                       or 'USE TEMP B-TREE' in detail]
+                if bad:
+                    problems[name] = bad
+        return problems
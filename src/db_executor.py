@@ -0,0 +1,110 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class DBExecutor:
+    """Runs VocabularyDatabase calls off the caller's thread
+
+    Writes go to a single writer thread, so they never contend for SQLite's
+    write lock and are applied in submission order. Reads run on a small pool
+    (WAL lets them proceed while a write is in progress); a read that must see
+    earlier writes can be queued behind them with ``after_writes=True``.
+    Quiz answers are write-behind: ``queue_answers`` returns immediately and
+    everything queued before the writer gets to it is stored with a single
+    ``record_answers`` transaction.
+    """
+
+    def __init__(self, db, read_workers: int = 2):
+        self.db = db
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-reader")
+        self._lock = threading.Lock()
+        self._answers: List[Dict] = []
+        self._flush: Optional[Future] = None
+
+    def read(self, fn: Callable, *args, after_writes: bool = False, **kwargs) -> Future:
+        """Run a read; with ``after_writes`` it waits for every write queued so far"""
+        pool = self._writer if after_writes else self._readers
+        return pool.submit(fn, *args, **kwargs)
+
+    def write(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a write on the writer thread"""
+        return self._writer.submit(fn, *args, **kwargs)
+
+    def queue_answers(self, answers: List[Dict]) -> Future:
+        """Queue answers for the next batched write; the future resolves to the batch size"""
+        with self._lock:
+            self._answers.extend(answers)
+            if self._flush is None:
+                self._flush = self._writer.submit(self._write_answers)
+            return self._flush
+
+    def _write_answers(self) -> int:
+        with self._lock:
+            answers, self._answers = self._answers, []
+            self._flush = None
+        return self.db.record_answers(answers)
+
+    def close(self):
+        """Finish every queued write, then stop the threads"""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+
+
+class TkDispatcher:
+    """Deliver future results to callbacks on the Tk main thread
+
+    Tk must only be touched from the thread running mainloop, so finished
+    futures are handed over through a queue that is drained by a
+    ``root.after`` poll. ``on_busy`` is called with True/False whenever work
+    starts or the last outstanding future finishes.
+    """
+
+    def __init__(self, root, poll_ms: int = 16, on_busy: Optional[Callable[[bool], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy
+        self.on_error = on_error
+        self._done: "queue.Queue" = queue.Queue()
+        self._outstanding = 0
+        self._poll_id = None
+
+    @property
+    def pending(self) -> int:
+        """Futures whose callbacks have not run yet"""
+        return self._outstanding
+
+    def call(self, future: Future, callback: Optional[Callable] = None,
+             on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Run ``callback(result)`` on the Tk thread once ``future`` is done"""
+        self._outstanding += 1
+        if self._outstanding == 1 and self.on_busy:
+            self.on_busy(True)
+        future.add_done_callback(lambda f: self._done.put((f, callback, on_error)))
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+        return future
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                future, callback, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            error = future.exception()
+            if error is not None:
+                handler = on_error or self.on_error
+                if handler:
+                    handler(error)
+            elif callback:
+                callback(future.result())
+        if self._outstanding:
+            if self._poll_id is None:  # a callback may already have rescheduled
+                self._poll_id = self.root.after(self.poll_ms, self._poll)
+        elif self.on_busy:
+            self.on_busy(False)
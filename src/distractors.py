@@ -0,0 +1,209 @@
+import bisect
+import random
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Used only when the whole vocabulary has fewer distinct definitions than needed
+GENERIC_DISTRACTORS = [
+    "A type of musical instrument",
+    "A cooking utensil",
+    "A building material",
+    "A weather phenomenon"
+]
+
+
+class DistractorIndex:
+    """In-memory ranked pools of wrong answers for multiple-choice questions
+
+    Candidates for a word come from the same category and difficulty first,
+    then the same category, then the whole vocabulary, and within each level
+    are ranked by how close the definition length is to the correct one.
+    Pools are precomputed by ``build`` and patched incrementally by
+    ``add_word``/``remove_word``, so a question needs no database queries.
+    A lock makes patches and lookups safe across threads: the writer thread
+    patches the index while question prefetch threads read it.
+    """
+
+    def __init__(self, pool_size: int = 8):
+        self.pool_size = pool_size
+        self._words: Dict[int, Tuple[str, str, int]] = {}   # id -> (definition, category, difficulty)
+        self._levels: Dict[tuple, List[Tuple[int, int]]] = {}  # key -> sorted [(length, id)]
+        self._pools: Dict[int, List[int]] = {}
+        self._offered_in: Dict[int, Set[int]] = {}   # id -> words whose pools offer it
+        self._short_pools: Set[int] = set()  # pools that fell back past their own bucket
+        self._radius: Dict[int, int] = {}    # widest length gap inside each pool
+        self._reach = 0                      # upper bound of every radius
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_database(cls, db, pool_size: int = 8) -> 'DistractorIndex':
+        """Build an index from every word in a VocabularyDatabase"""
+        index = cls(pool_size)
+        with db.connection() as conn:
+            index.build(conn.execute(
+                'SELECT id, definition, category, difficulty_level FROM vocabulary'))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @staticmethod
+    def _level_keys(category: str, difficulty: int) -> List[tuple]:
+        """Level keys from most to least specific"""
+        return [('bucket', category, difficulty), ('category', category), ('all',)]
+
+    def build(self, rows: Iterable[Tuple[int, str, str, int]]):
+        """Index (id, definition, category, difficulty) rows and precompute all pools"""
+        with self._lock:
+            self._build(rows)
+
+    def _build(self, rows: Iterable[Tuple[int, str, str, int]]):
+        self._words.clear()
+        self._levels.clear()
+        for word_id, definition, category, difficulty in rows:
+            self._words[word_id] = (definition, category, difficulty)
+            for key in self._level_keys(category, difficulty):
+                self._levels.setdefault(key, []).append((len(definition), word_id))
+        for entries in self._levels.values():
+            entries.sort()
+
+        self._pools.clear()
+        self._offered_in.clear()
+        self._short_pools.clear()
+        self._radius.clear()
+        self._reach = 0
+        for word_id in self._words:
+            self._set_pool(word_id, self._rank(word_id))
+
+    def _set_pool(self, word_id: int, pool: List[int]):
+        """Store a word's pool, keeping the reverse map of who offers whom"""
+        self._drop_pool(word_id)
+        self._pools[word_id] = pool
+        for other in pool:
+            self._offered_in.setdefault(other, set()).add(word_id)
+
+    def _drop_pool(self, word_id: int):
+        for other in self._pools.pop(word_id, ()):
+            offered = self._offered_in.get(other)
+            if offered is not None:
+                offered.discard(word_id)
+
+    def _nearest(self, key: tuple, length: int, exclude: Set[int], seen: Set[str],
+                 limit: int) -> List[int]:
+        """Ids in a level ordered by length distance, skipping duplicate definitions"""
+        entries = self._levels.get(key, [])
+        right = bisect.bisect_left(entries, (length, -1))
+        left = right - 1
+        found = []
+        while len(found) < limit and (left >= 0 or right < len(entries)):
+            if right >= len(entries) or (left >= 0 and length - entries[left][0] <= entries[right][0] - length):
+                candidate = entries[left][1]
+                left -= 1
+            else:
+                candidate = entries[right][1]
+                right += 1
+            definition = self._words[candidate][0]
+            if candidate in exclude or definition in seen:
+                continue
+            exclude.add(candidate)
+            seen.add(definition)
+            found.append(candidate)
+        return found
+
+    def _rank(self, word_id: int) -> List[int]:
+        """Compute the ranked candidate pool for a word"""
+        definition, category, difficulty = self._words[word_id]
+        exclude = {word_id}
+        seen = {definition}
+        pool: List[int] = []
+        for depth, key in enumerate(self._level_keys(category, difficulty)):
+            pool += self._nearest(key, len(definition), exclude, seen, self.pool_size - len(pool))
+            if len(pool) >= self.pool_size:
+                break
+        if depth > 0:
+            self._short_pools.add(word_id)
+        else:
+            self._short_pools.discard(word_id)
+        radius = max((abs(len(self._words[other][0]) - len(definition)) for other in pool), default=0)
+        self._radius[word_id] = radius
+        self._reach = max(self._reach, radius)
+        return pool
+
+    def add_word(self, word_id: int, definition: str, category: str = 'general', difficulty: int = 1):
+        """Add a word and refresh only the pools it can affect"""
+        with self._lock:
+            self._add_word(word_id, definition, category, difficulty)
+
+    def _add_word(self, word_id: int, definition: str, category: str, difficulty: int):
+        if word_id in self._words:
+            self._remove_word(word_id)
+        self._words[word_id] = (definition, category, difficulty)
+        length = len(definition)
+        for key in self._level_keys(category, difficulty):
+            bisect.insort(self._levels.setdefault(key, []), (length, word_id))
+
+        # Bucket neighbours whose pool reaches this length, plus pools that had
+        # to fall back to wider levels, may now rank the new word.
+        bucket = self._levels[self._level_keys(category, difficulty)[0]]
+        pos = bisect.bisect_left(bucket, (length, word_id))
+        reach = self._reach
+        affected = set(self._short_pools)
+        affected.add(word_id)
+        for step in (-1, 1):
+            i = pos + step
+            while 0 <= i < len(bucket) and abs(bucket[i][0] - length) <= reach:
+                other = bucket[i][1]
+                if abs(bucket[i][0] - length) <= self._radius.get(other, 0):
+                    affected.add(other)
+                i += step
+        for other in affected:
+            self._set_pool(other, self._rank(other))
+
+    def remove_word(self, word_id: int):
+        """Drop a word from the index and from every pool that offered it"""
+        with self._lock:
+            self._remove_word(word_id)
+
+    def _remove_word(self, word_id: int):
+        entry = self._words.pop(word_id, None)
+        if entry is None:
+            return
+        definition, category, difficulty = entry
+        for key in self._level_keys(category, difficulty):
+            entries = self._levels[key]
+            pos = bisect.bisect_left(entries, (len(definition), word_id))
+            if pos < len(entries) and entries[pos][1] == word_id:
+                del entries[pos]
+        self._drop_pool(word_id)
+        self._radius.pop(word_id, None)
+        self._short_pools.discard(word_id)
+        for other in self._offered_in.pop(word_id, set()):
+            self._set_pool(other, self._rank(other))
+
+    def definition(self, word_id: int) -> Optional[str]:
+        """The correct definition of an indexed word"""
+        with self._lock:
+            entry = self._words.get(word_id)
+        return entry[0] if entry is not None else None
+
+    def candidates(self, word_id: int) -> List[str]:
+        """Ranked wrong-answer definitions for a word"""
+        with self._lock:
+            return self._candidates(word_id)
+
+    def _candidates(self, word_id: int) -> List[str]:
+        return [self._words[other][0] for other in self._pools.get(word_id, [])]
+
+    def choices(self, word_id: int, count: int = 3, rng: Optional[random.Random] = None) -> List[str]:
+        """Pick ``count`` wrong answers from the word's pool, padding with generic ones"""
+        rng = rng or random
+        with self._lock:
+            pool = self._candidates(word_id)
+            correct = self._words[word_id][0] if word_id in self._words else None
+        picked = rng.sample(pool, min(count, len(pool)))
+        for generic in GENERIC_DISTRACTORS:
+            if len(picked) >= count:
+                break
+            if generic not in picked and generic != correct:
+                picked.append(generic)
+        return picked
@@ -0,0 +1,180 @@
+"""Streaming vocabulary deck importer.
+
+Reads CSV, TSV, JSONL and Anki decks (text exports or .apkg packages) and
+feeds them to VocabularyDatabase.import_words in chunks, so memory stays flat
+however large the deck is.
+
+Usage: python -m src.importer deck.csv [--db vocabulary.db] [--category general]
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Column order used when a file has no header row
+FIELDS = ['word', 'definition', 'example', 'pronunciation', 'difficulty', 'category']
+
+# Header spellings accepted for each field
+ALIASES = {
+    'word': 'word', 'term': 'word', 'front': 'word',
+    'definition': 'definition', 'meaning': 'definition', 'back': 'definition',
+    'example': 'example', 'example_sentence': 'example', 'sentence': 'example',
+    'pronunciation': 'pronunciation', 'ipa': 'pronunciation',
+    'difficulty': 'difficulty', 'difficulty_level': 'difficulty', 'level': 'difficulty',
+    'category': 'category', 'deck': 'category', 'tags': 'category',
+}
+
+FORMATS = ('csv', 'tsv', 'jsonl', 'anki', 'apkg')
+
+WordRow = Tuple[str, str, str, str, int, str]
+
+
+def _text(record: Dict, field: str) -> str:
+    """A stripped text field; anything but a string (e.g. from JSON) counts as missing"""
+    value = record.get(field)
+    return value.strip() if isinstance(value, str) else ''
+
+
+def normalize(record: Dict, difficulty: int = 1, category: str = 'general') -> Optional[WordRow]:
+    """Turn a field dict into an insert row, or None if it lacks a word or definition"""
+    word = _text(record, 'word')
+    definition = _text(record, 'definition')
+    if not word or not definition:
+        return None
+    try:
+        level = int(record.get('difficulty') or difficulty)
+    except (TypeError, ValueError):
+        level = difficulty
+    return (word, definition, _text(record, 'example'), _text(record, 'pronunciation'), level,
+            _text(record, 'category') or category)
+
+
+def _records_from_rows(rows: Iterator[List[str]]) -> Iterator[Dict]:
+    """Map delimited rows to field dicts, using the header row if there is one"""
+    first = next(rows, None)
+    if first is None:
+        return
+    header = [ALIASES.get(cell.strip().lower()) for cell in first]
+    if 'word' in header and 'definition' in header:
+        columns = header
+    else:
+        columns = FIELDS
+        yield dict(zip(columns, first))
+    for row in rows:
+        yield {name: value for name, value in zip(columns, row) if name}
+
+
+def read_delimited(path: str, delimiter: str = ',') -> Iterator[Dict]:
+    """Stream records from a CSV/TSV file"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from _records_from_rows(csv.reader(f, delimiter=delimiter))
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    """Stream records from a JSON-lines file"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                obj = json.loads(line)
+                yield {ALIASES.get(key.lower(), key): value for key, value in obj.items()}
+
+
+def read_anki_text(path: str) -> Iterator[Dict]:
+    """Stream records from an Anki "Notes in Plain Text" export"""
+    delimiter = '\t'
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for line in f:
+            if line.startswith('#'):
+                # Export headers such as "#separator:tab"
+                key, _, value = line[1:].strip().partition(':')
+                if key == 'separator':
+                    delimiter = {'tab': '\t', 'comma': ',', 'semicolon': ';',
+                                 'pipe': '|', 'space': ' '}.get(value.lower(), value)
+                continue
+            row = next(csv.reader([line.rstrip('\r\n')], delimiter=delimiter))
+            yield dict(zip(FIELDS, row))
+
+
+def read_apkg(path: str) -> Iterator[Dict]:
+    """Stream notes from an Anki .apkg package (first field = word, second = definition)"""
+    with zipfile.ZipFile(path) as package, tempfile.TemporaryDirectory() as tmp:
+        names = package.namelist()
+        collection = next((n for n in ('collection.anki21', 'collection.anki2') if n in names), None)
+        if collection is None:
+            raise ValueError(f"{path} does not contain an Anki collection")
+        db_path = package.extract(collection, tmp)
+        conn = sqlite3.connect(db_path)
+        try:
+            for flds, tags in conn.execute('SELECT flds, tags FROM notes ORDER BY id'):
+                fields = flds.split('\x1f')
+                record = dict(zip(FIELDS[:4], fields))
+                if tags.strip():
+                    record['category'] = tags.split()[0]
+                yield record
+        finally:
+            conn.close()
+
+
+def detect_format(path: str) -> str:
+    """Guess the deck format from the file extension"""
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext in ('txt', 'anki'):
+        return 'anki'
+    if ext in ('json', 'ndjson'):
+        return 'jsonl'
+    if ext in FORMATS:
+        return ext
+    raise ValueError(f"Cannot tell the format of '{path}', pass one of {FORMATS}")
+
+
+def read_deck(path: str, fmt: Optional[str] = None, difficulty: int = 1,
+              category: str = 'general') -> Iterator[WordRow]:
+    """Stream normalized word rows from a deck file"""
+    fmt = fmt or detect_format(path)
+    if fmt == 'csv':
+        records = read_delimited(path, ',')
+    elif fmt == 'tsv':
+        records = read_delimited(path, '\t')
+    elif fmt == 'jsonl':
+        records = read_jsonl(path)
+    elif fmt == 'anki':
+        records = read_anki_text(path)
+    elif fmt == 'apkg':
+        records = read_apkg(path)
+    else:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    for record in records:
+        row = normalize(record, difficulty, category)
+        if row is not None:
+            yield row
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .database import VocabularyDatabase
+
+    parser = argparse.ArgumentParser(description="Import a vocabulary deck")
+    parser.add_argument('deck', help="deck file (.csv, .tsv, .jsonl, Anki .txt or .apkg)")
+    parser.add_argument('--db', default='vocabulary.db', help="database path")
+    parser.add_argument('--format', choices=FORMATS, help="override format detection")
+    parser.add_argument('--category', default='general', help="category for rows without one")
+    parser.add_argument('--difficulty', type=int, default=1, help="difficulty for rows without one")
+    parser.add_argument('--chunk-size', type=int, default=50000, help="rows per executemany batch")
+    args = parser.parse_args(argv)
+
+    with VocabularyDatabase(args.db) as db:
+        report = db.import_words(read_deck(args.deck, args.format, args.difficulty, args.category),
+                                 chunk_size=args.chunk_size)
+    print(f"Read {report['read']} rows, inserted {report['inserted']}, "
+          f"skipped {report['duplicates']} duplicates in {report['seconds']:.2f}s "
+          f"({report['rows_per_second']:.0f} rows/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
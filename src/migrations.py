@@ -0,0 +1,803 @@
+import sqlite3
+from datetime import date
+from typing import Callable, Dict, List, Tuple, Union
+
+# Each migration is (version, description, steps). A step is either an SQL
+# statement or a callable taking the connection. The schema version lives in
+# PRAGMA user_version, so a database that is already current skips all DDL.
+Step = Union[str, Callable[[sqlite3.Connection], None]]
+
+
+def streak_lengths(session_dates: List[str]) -> Tuple[int, int]:
+    """Return (streak ending at the last date, longest streak) for ISO dates"""
+    current = longest = 0
+    previous = None
+    for day in sorted({date.fromisoformat(d) for d in session_dates}):
+        current = current + 1 if previous and (day - previous).days == 1 else 1
+        longest = max(longest, current)
+        previous = day
+    return current, longest
+
+
+def _backfill_user_stats(conn: sqlite3.Connection):
+    """Seed the user_stats row from the existing tables"""
+    dates = [row[0] for row in conn.execute(
+        'SELECT session_date FROM daily_sessions WHERE session_completed = TRUE')]
+    current, longest = streak_lengths(dates)
+    conn.execute('''
+        INSERT OR REPLACE INTO user_stats
+            (id, vocabulary_size, total_words, mastered_words, completed_sessions, score_sum,
+             current_streak, longest_streak, last_streak_date)
+        SELECT 1,
+               (SELECT COUNT(*) FROM vocabulary),
+               (SELECT COUNT(*) FROM user_progress WHERE total_attempts > 0),
+               (SELECT COUNT(*) FROM user_progress WHERE mastery_level >= 3),
+               (SELECT COUNT(*) FROM daily_sessions WHERE session_completed = TRUE),
+               (SELECT COALESCE(SUM(quiz_score), 0) FROM daily_sessions WHERE session_completed = TRUE),
+               ?, ?, ?
+    ''', (current, longest, max(dates) if dates else None))
+
+
+# External-content FTS5 tables over vocabulary: one tokenized on words for
+# full-text search, one on trigrams of the word for typo-tolerant lookup.
+# Triggers keep both in step with the base table.
+SEARCH_TABLES = {
+    'vocabulary_fts': ("word, definition, example_sentence", 'unicode61',
+                       "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"),
+    'vocabulary_trigram': ("word", 'trigram', "tokenize='trigram'"),
+}
+
+
+def fts5_available(conn: sqlite3.Connection, tokenizer: str = 'unicode61') -> bool:
+    """Whether this SQLite build has FTS5 with the given tokenizer"""
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize='{tokenizer}')")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute('DROP TABLE temp.fts5_probe')
+    return True
+
+
+def _create_search_tables(conn: sqlite3.Connection):
+    """Create, fill and attach triggers to the search tables this build supports
+
+    Builds without FTS5 (or without the trigram tokenizer) skip the table and
+    search falls back to LIKE scans.
+    """
+    for table, (columns, tokenizer, options) in SEARCH_TABLES.items():
+        if not fts5_available(conn, tokenizer):
+            continue
+        names = [c.strip() for c in columns.split(',')]
+        old_values = ', '.join(f'old.{c}' for c in names)
+        new_values = ', '.join(f'new.{c}' for c in names)
+        delete_old = (f"INSERT INTO {table} ({table}, rowid, {columns}) "
+                      f"VALUES ('delete', old.id, {old_values});")
+        insert_new = f"INSERT INTO {table} (rowid, {columns}) VALUES (new.id, {new_values});"
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} "
+                     f"USING fts5({columns}, content='vocabulary', content_rowid='id', {options})")
+        conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON vocabulary "
+                     f"BEGIN {insert_new} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON vocabulary "
+                     f"BEGIN {delete_old} END")
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_update "
+                     f"AFTER UPDATE OF {columns} ON vocabulary "
+                     f"BEGIN {delete_old} {insert_new} END")
+
+
+# Per-learner schema, shared by migration 7 of the main database and by
+# progress shard files. Every per-learner table is keyed by user_id and every
+# index leads with it, so a learner's queries only touch that learner's rows.
+_PROGRESS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL DEFAULT 1,
+        word_id INTEGER NOT NULL,
+        correct_answers INTEGER DEFAULT 0,
+        total_attempts INTEGER DEFAULT 0,
+        last_reviewed TEXT,
+        mastery_level INTEGER DEFAULT 0,
+        ease REAL DEFAULT 2.5,
+        interval_days REAL DEFAULT 0,
+        repetitions INTEGER DEFAULT 0,
+        lapses INTEGER DEFAULT 0,
+        stability REAL DEFAULT 0,
+        difficulty REAL DEFAULT 0,
+        due_at INTEGER DEFAULT 0,
+        last_review_at INTEGER,
+        UNIQUE (user_id, word_id)
+    )
+'''
+
+_USER_STATS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        user_id INTEGER PRIMARY KEY,
+        total_words INTEGER NOT NULL DEFAULT 0,
+        mastered_words INTEGER NOT NULL DEFAULT 0,
+        completed_sessions INTEGER NOT NULL DEFAULT 0,
+        score_sum REAL NOT NULL DEFAULT 0,
+        current_streak INTEGER NOT NULL DEFAULT 0,
+        longest_streak INTEGER NOT NULL DEFAULT 0,
+        last_streak_date TEXT
+    )
+'''
+
+_PER_USER_INDEXES = [
+    '''
+    CREATE INDEX IF NOT EXISTS idx_progress_learning_due
+    ON user_progress (user_id, due_at, word_id) WHERE mastery_level < 3
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_progress_review_due
+    ON user_progress (user_id, due_at, word_id) WHERE total_attempts > 0
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_progress_due ON user_progress (user_id, due_at, word_id)',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_progress_browse_mastery
+    ON user_progress (user_id, mastery_level, word_id)
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_progress_browse_accuracy
+    ON user_progress (user_id, correct_answers * 1.0 / MAX(total_attempts, 1), word_id)
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_progress_browse_reviewed
+    ON user_progress (user_id, COALESCE(last_review_at, 0), word_id)
+    ''',
+    # Word deletes cascade by word_id across every learner
+    'CREATE INDEX IF NOT EXISTS idx_progress_word ON user_progress (word_id)',
+    'CREATE INDEX IF NOT EXISTS idx_sessions_user_date ON daily_sessions (user_id, session_date)',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_sessions_user_completed
+    ON daily_sessions (user_id, session_date, quiz_score) WHERE session_completed = TRUE
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_results_user_word ON quiz_results (user_id, word_id, session_date)',
+]
+
+_PER_USER_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_stats_progress_insert AFTER INSERT ON user_progress
+    BEGIN
+        UPDATE user_stats SET
+            total_words = total_words + (NEW.total_attempts > 0),
+            mastered_words = mastered_words + (NEW.mastery_level >= 3)
+        WHERE user_id = NEW.user_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_stats_progress_update
+    AFTER UPDATE OF total_attempts, mastery_level ON user_progress
+    BEGIN
+        UPDATE user_stats SET
+            total_words = total_words + (NEW.total_attempts > 0) - (OLD.total_attempts > 0),
+            mastered_words = mastered_words + (NEW.mastery_level >= 3) - (OLD.mastery_level >= 3)
+        WHERE user_id = NEW.user_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_stats_progress_delete AFTER DELETE ON user_progress
+    BEGIN
+        UPDATE user_stats SET
+            total_words = total_words - (OLD.total_attempts > 0),
+            mastered_words = mastered_words - (OLD.mastery_level >= 3)
+        WHERE user_id = OLD.user_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_stats_session_update
+    AFTER UPDATE OF session_completed, quiz_score ON daily_sessions
+    BEGIN
+        UPDATE user_stats SET
+            completed_sessions = completed_sessions
+                + (NEW.session_completed = TRUE) - (OLD.session_completed = TRUE),
+            score_sum = score_sum
+                + (CASE WHEN NEW.session_completed = TRUE THEN NEW.quiz_score ELSE 0 END)
+                - (CASE WHEN OLD.session_completed = TRUE THEN OLD.quiz_score ELSE 0 END)
+        WHERE user_id = NEW.user_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_stats_session_streak
+    AFTER UPDATE OF session_completed ON daily_sessions
+    WHEN NEW.session_completed = TRUE AND OLD.session_completed IS NOT TRUE
+    BEGIN
+        UPDATE user_stats SET
+            current_streak = CASE
+                WHEN last_streak_date IS NULL THEN 1
+                WHEN NEW.session_date <= last_streak_date THEN current_streak
+                WHEN julianday(NEW.session_date) - julianday(last_streak_date) = 1 THEN current_streak + 1
+                ELSE 1
+            END,
+            last_streak_date = MAX(COALESCE(last_streak_date, ''), NEW.session_date)
+        WHERE user_id = NEW.user_id;
+        UPDATE user_stats SET longest_streak = MAX(longest_streak, current_streak)
+        WHERE user_id = NEW.user_id;
+    END
+    ''',
+]
+
+_PROGRESS_COLUMNS = ('word_id, correct_answers, total_attempts, last_reviewed, mastery_level, ease, '
+                     'interval_days, repetitions, lapses, stability, difficulty, due_at, last_review_at')
+
+# Response-time histogram buckets: bucket i counts answers faster than
+# LATENCY_BOUNDS[i] seconds (and no faster than the bound before it); the
+# last bucket is everything slower. Retention buckets do the same for the
+# days since the learner last answered the word. Both are baked into the
+# rollup trigger, so changing them needs a migration that rebuilds the rollups.
+LATENCY_BOUNDS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 60)
+RETENTION_BOUNDS = (1, 2, 4, 7, 14, 30, 60, 120)
+
+
+def _bucket(value: str, bounds: Tuple) -> str:
+    """SQL expression for the bucket index of ``value``"""
+    cases = ' '.join(f'WHEN {value} < {bound} THEN {i}' for i, bound in enumerate(bounds))
+    return f'CASE {cases} ELSE {len(bounds)} END'
+
+
+_RESPONSE_TIME = 'COALESCE({row}response_time_seconds, 0)'
+_IS_CORRECT = '({row}is_correct = 1)'
+_DAY = 'substr({row}session_date, 1, 10)'
+
+# How quiz_results stores answer times: ISO text in session_date up to
+# migration 8, integer epoch seconds in answered_at from migration 9 on.
+_ISO_CLOCK = {'column': 'session_date', 'day': _DAY,
+              'days_between': 'julianday({later}) - julianday({earlier})'}
+_EPOCH_CLOCK = {'column': 'answered_at', 'day': "date({row}answered_at, 'unixepoch', 'localtime')",
+                'days_between': '({later} - {earlier}) / 86400.0'}
+
+# Answer rollups, maintained per answer by a trigger on quiz_results so the
+# analytics read a few pre-aggregated rows instead of the raw history:
+# all-time latency histogram per word, daily totals per word, daily latency
+# histogram per learner, and correct rate by days since the previous answer.
+_ANALYTICS_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_word_latency (
+        user_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        answers INTEGER NOT NULL DEFAULT 0,
+        correct INTEGER NOT NULL DEFAULT 0,
+        time_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, word_id, bucket)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_word_daily (
+        user_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        answers INTEGER NOT NULL DEFAULT 0,
+        correct INTEGER NOT NULL DEFAULT 0,
+        time_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, word_id, day)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_user_latency (
+        user_id INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        answers INTEGER NOT NULL DEFAULT 0,
+        correct INTEGER NOT NULL DEFAULT 0,
+        time_sum REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day, bucket)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_retention (
+        user_id INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        answers INTEGER NOT NULL DEFAULT 0,
+        correct INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, bucket)
+    ) WITHOUT ROWID
+    ''',
+]
+
+_ROLLUP_ADD = ('DO UPDATE SET answers = answers + excluded.answers, correct = correct + excluded.correct'
+               '{extra}')
+_ROLLUP_ADD_TIME = _ROLLUP_ADD.format(extra=', time_sum = time_sum + excluded.time_sum')
+
+
+def _rollup_trigger(clock: Dict[str, str]) -> str:
+    """The trigger adding each new answer to the rollups, for a quiz_results time format"""
+    time, correct, day = (_RESPONSE_TIME.format(row='NEW.'), _IS_CORRECT.format(row='NEW.'),
+                          clock['day'].format(row='NEW.'))
+    latency = _bucket(time, LATENCY_BOUNDS)
+    column = clock['column']
+    previous = (f'(SELECT {column} FROM quiz_results '
+                f'WHERE user_id = NEW.user_id AND word_id = NEW.word_id AND id < NEW.id '
+                f'ORDER BY {column} DESC LIMIT 1)')
+    gap = clock['days_between'].format(later=f'NEW.{column}', earlier=previous)
+    return f'''
+    CREATE TRIGGER IF NOT EXISTS trg_results_rollup AFTER INSERT ON quiz_results
+    BEGIN
+        INSERT INTO rollup_word_latency (user_id, word_id, bucket, answers, correct, time_sum)
+        VALUES (NEW.user_id, NEW.word_id, {latency}, 1, {correct}, {time})
+        ON CONFLICT (user_id, word_id, bucket) {_ROLLUP_ADD_TIME};
+        INSERT INTO rollup_word_daily (user_id, word_id, day, answers, correct, time_sum)
+        VALUES (NEW.user_id, NEW.word_id, {day}, 1, {correct}, {time})
+        ON CONFLICT (user_id, word_id, day) {_ROLLUP_ADD_TIME};
+        INSERT INTO rollup_user_latency (user_id, day, bucket, answers, correct, time_sum)
+        VALUES (NEW.user_id, {day}, {latency}, 1, {correct}, {time})
+        ON CONFLICT (user_id, day, bucket) {_ROLLUP_ADD_TIME};
+        INSERT INTO rollup_retention (user_id, bucket, answers, correct)
+        SELECT NEW.user_id, {_bucket('gap', RETENTION_BOUNDS)}, 1, {correct}
+        FROM (SELECT {gap} AS gap)
+        WHERE gap IS NOT NULL
+        ON CONFLICT (user_id, bucket) {_ROLLUP_ADD.format(extra='')};
+    END
+    '''
+
+
+def _backfill_analytics(conn: sqlite3.Connection):
+    """Fill the answer rollups from the existing quiz_results"""
+    time, correct, day = (_RESPONSE_TIME.format(row=''), _IS_CORRECT.format(row=''),
+                          _DAY.format(row=''))
+    latency = _bucket(time, LATENCY_BOUNDS)
+    conn.execute(f'''
+        INSERT INTO rollup_word_latency (user_id, word_id, bucket, answers, correct, time_sum)
+        SELECT user_id, word_id, {latency}, COUNT(*), SUM({correct}), SUM({time})
+        FROM quiz_results GROUP BY 1, 2, 3
+    ''')
+    conn.execute(f'''
+        INSERT INTO rollup_word_daily (user_id, word_id, day, answers, correct, time_sum)
+        SELECT user_id, word_id, {day}, COUNT(*), SUM({correct}), SUM({time})
+        FROM quiz_results GROUP BY 1, 2, 3
+    ''')
+    conn.execute(f'''
+        INSERT INTO rollup_user_latency (user_id, day, bucket, answers, correct, time_sum)
+        SELECT user_id, {day}, {latency}, COUNT(*), SUM({correct}), SUM({time})
+        FROM quiz_results GROUP BY 1, 2, 3
+    ''')
+    conn.execute(f'''
+        INSERT INTO rollup_retention (user_id, bucket, answers, correct)
+        SELECT user_id, {_bucket('gap', RETENTION_BOUNDS)}, COUNT(*), SUM(correct)
+        FROM (SELECT user_id, {correct} AS correct,
+                     julianday(session_date) - julianday(LAG(session_date) OVER (
+                         PARTITION BY user_id, word_id ORDER BY session_date, id)) AS gap
+              FROM quiz_results)
+        WHERE gap IS NOT NULL
+        GROUP BY 1, 2
+    ''')
+
+
+_WORD_DELETE_CASCADE = '''
+    CREATE TRIGGER IF NOT EXISTS trg_vocabulary_delete_cascade AFTER DELETE ON vocabulary
+    BEGIN
+        DELETE FROM user_progress WHERE word_id = OLD.id;
+        DELETE FROM quiz_results WHERE word_id = OLD.id;
+        DELETE FROM rollup_word_latency
+        WHERE user_id IN (SELECT id FROM users) AND word_id = OLD.id;
+        DELETE FROM rollup_word_daily
+        WHERE user_id IN (SELECT id FROM users) AND word_id = OLD.id;
+    END
+'''
+
+# quiz_results with answer times as integer epoch seconds instead of ISO
+# text (at most 8 bytes per row instead of 26), so the retention cutoff is a
+# plain integer comparison. Rebuilt rather than altered so the old column goes.
+_RESULTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL DEFAULT 1,
+        word_id INTEGER,
+        answered_at INTEGER NOT NULL,
+        is_correct BOOLEAN,
+        response_time_seconds REAL
+    )
+'''
+
+_EPOCH_RESULTS = [
+    'DROP TRIGGER IF EXISTS trg_results_rollup',
+    _RESULTS_TABLE.format(name='quiz_results_v9'),
+    # session_date was local time from datetime.now().isoformat()
+    '''
+    INSERT INTO quiz_results_v9 (id, user_id, word_id, answered_at, is_correct, response_time_seconds)
+    SELECT id, user_id, word_id, COALESCE(CAST(strftime('%s', session_date, 'utc') AS INTEGER), 0),
+           is_correct, response_time_seconds
+    FROM quiz_results
+    ''',
+    'DROP TABLE quiz_results',
+    'ALTER TABLE quiz_results_v9 RENAME TO quiz_results',
+    'CREATE INDEX IF NOT EXISTS idx_results_user_word ON quiz_results (user_id, word_id, answered_at)',
+    # Word deletes cascade by word_id
+    'CREATE INDEX IF NOT EXISTS idx_results_word ON quiz_results (word_id)',
+    _rollup_trigger(_EPOCH_CLOCK),
+]
+
+
+# Quiz packs whose offline answers a learner has merged, so a file merged
+# twice is refused instead of counting its answers again
+_MERGED_PACKS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS merged_packs (
+        user_id INTEGER NOT NULL,
+        pack_id TEXT NOT NULL,
+        merged_at INTEGER NOT NULL,
+        PRIMARY KEY (user_id, pack_id)
+    ) WITHOUT ROWID
+'''
+
+MIGRATIONS: List[Tuple[int, str, List[Step]]] = [
+    (1, "Base schema", [
+        '''
+        CREATE TABLE IF NOT EXISTS vocabulary (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL UNIQUE,
+            definition TEXT NOT NULL,
+            example_sentence TEXT,
+            pronunciation TEXT,
+            difficulty_level INTEGER DEFAULT 1,
+            category TEXT DEFAULT 'general',
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER UNIQUE,
+            correct_answers INTEGER DEFAULT 0,
+            total_attempts INTEGER DEFAULT 0,
+            last_reviewed TEXT,
+            mastery_level INTEGER DEFAULT 0,
+            FOREIGN KEY (word_id) REFERENCES vocabulary (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS daily_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_date TEXT NOT NULL,
+            words_learned INTEGER DEFAULT 0,
+            quiz_score REAL DEFAULT 0.0,
+            total_time_minutes INTEGER DEFAULT 0,
+            session_completed BOOLEAN DEFAULT FALSE
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS quiz_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER,
+            session_date TEXT,
+            is_correct BOOLEAN,
+            response_time_seconds REAL,
+            FOREIGN KEY (word_id) REFERENCES vocabulary (id)
+        )
+        ''',
+    ]),
+    (2, "Indexes for the daily/review/session/history access paths", [
+        # Every word gets a progress row, so the word pickers can walk the
+        # progress indexes instead of LEFT JOINing the whole vocabulary table.
+        '''
+        INSERT INTO user_progress (word_id, last_reviewed)
+        SELECT v.id, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+        FROM vocabulary v
+        WHERE NOT EXISTS (SELECT 1 FROM user_progress up WHERE up.word_id = v.id)
+        ''',
+        'UPDATE user_progress SET mastery_level = 0 WHERE mastery_level IS NULL',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_progress_learning
+        ON user_progress (last_reviewed, word_id) WHERE mastery_level < 3
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_progress_reviewed
+        ON user_progress (last_reviewed, word_id) WHERE total_attempts > 0
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_progress_mastery ON user_progress (mastery_level)',
+        'CREATE INDEX IF NOT EXISTS idx_progress_attempts ON user_progress (total_attempts)',
+        'CREATE INDEX IF NOT EXISTS idx_sessions_date ON daily_sessions (session_date)',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_sessions_completed
+        ON daily_sessions (session_date, quiz_score) WHERE session_completed = TRUE
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_results_word ON quiz_results (word_id, session_date)',
+    ]),
+    (3, "Spaced-repetition scheduling state and due-date indexes", [
+        'ALTER TABLE user_progress ADD COLUMN ease REAL DEFAULT 2.5',
+        'ALTER TABLE user_progress ADD COLUMN interval_days REAL DEFAULT 0',
+        'ALTER TABLE user_progress ADD COLUMN repetitions INTEGER DEFAULT 0',
+        'ALTER TABLE user_progress ADD COLUMN lapses INTEGER DEFAULT 0',
+        'ALTER TABLE user_progress ADD COLUMN stability REAL DEFAULT 0',
+        'ALTER TABLE user_progress ADD COLUMN difficulty REAL DEFAULT 0',
+        'ALTER TABLE user_progress ADD COLUMN due_at INTEGER DEFAULT 0',
+        'ALTER TABLE user_progress ADD COLUMN last_review_at INTEGER',
+        # Existing cards are due as of their last review (epoch seconds, UTC)
+        '''
+        UPDATE user_progress SET
+            due_at = COALESCE(CAST(strftime('%s', last_reviewed, 'utc') AS INTEGER),
+                              CAST(strftime('%s', 'now') AS INTEGER)),
+            last_review_at = CASE WHEN total_attempts > 0
+                                  THEN CAST(strftime('%s', last_reviewed, 'utc') AS INTEGER) END
+        ''',
+        'DROP INDEX IF EXISTS idx_progress_learning',
+        'DROP INDEX IF EXISTS idx_progress_reviewed',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_progress_learning_due
+        ON user_progress (due_at, word_id) WHERE mastery_level < 3
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_progress_review_due
+        ON user_progress (due_at, word_id) WHERE total_attempts > 0
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_progress_due ON user_progress (due_at, word_id)',
+    ]),
+    (4, "Materialized user_stats maintained by triggers", [
+        '''
+        CREATE TABLE IF NOT EXISTS user_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            vocabulary_size INTEGER NOT NULL DEFAULT 0,
+            total_words INTEGER NOT NULL DEFAULT 0,
+            mastered_words INTEGER NOT NULL DEFAULT 0,
+            completed_sessions INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            current_streak INTEGER NOT NULL DEFAULT 0,
+            longest_streak INTEGER NOT NULL DEFAULT 0,
+            last_streak_date TEXT
+        )
+        ''',
+        _backfill_user_stats,
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_vocabulary_insert AFTER INSERT ON vocabulary
+        BEGIN
+            UPDATE user_stats SET vocabulary_size = vocabulary_size + 1 WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_vocabulary_delete AFTER DELETE ON vocabulary
+        BEGIN
+            UPDATE user_stats SET vocabulary_size = vocabulary_size - 1 WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_progress_insert AFTER INSERT ON user_progress
+        BEGIN
+            UPDATE user_stats SET
+                total_words = total_words + (NEW.total_attempts > 0),
+                mastered_words = mastered_words + (NEW.mastery_level >= 3)
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_progress_update
+        AFTER UPDATE OF total_attempts, mastery_level ON user_progress
+        BEGIN
+            UPDATE user_stats SET
+                total_words = total_words + (NEW.total_attempts > 0) - (OLD.total_attempts > 0),
+                mastered_words = mastered_words + (NEW.mastery_level >= 3) - (OLD.mastery_level >= 3)
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_progress_delete AFTER DELETE ON user_progress
+        BEGIN
+            UPDATE user_stats SET
+                total_words = total_words - (OLD.total_attempts > 0),
+                mastered_words = mastered_words - (OLD.mastery_level >= 3)
+            WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_session_update
+        AFTER UPDATE OF session_completed, quiz_score ON daily_sessions
+        BEGIN
+            UPDATE user_stats SET
+                completed_sessions = completed_sessions
+                    + (NEW.session_completed = TRUE) - (OLD.session_completed = TRUE),
+                score_sum = score_sum
+                    + (CASE WHEN NEW.session_completed = TRUE THEN NEW.quiz_score ELSE 0 END)
+                    - (CASE WHEN OLD.session_completed = TRUE THEN OLD.quiz_score ELSE 0 END)
+            WHERE id = 1;
+        END
+        ''',
+        # Consecutive-day streak: extended by a session completed the day after
+        # the last streak day, restarted after a gap. Back-dated sessions are ignored.
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_session_streak
+        AFTER UPDATE OF session_completed ON daily_sessions
+        WHEN NEW.session_completed = TRUE AND OLD.session_completed IS NOT TRUE
+        BEGIN
+            UPDATE user_stats SET
+                current_streak = CASE
+                    WHEN last_streak_date IS NULL THEN 1
+                    WHEN NEW.session_date <= last_streak_date THEN current_streak
+                    WHEN julianday(NEW.session_date) - julianday(last_streak_date) = 1 THEN current_streak + 1
+                    ELSE 1
+                END,
+                last_streak_date = MAX(COALESCE(last_streak_date, ''), NEW.session_date)
+            WHERE id = 1;
+            UPDATE user_stats SET longest_streak = MAX(longest_streak, current_streak) WHERE id = 1;
+        END
+        ''',
+    ]),
+    (5, "Full-text, trigram and prefix search over vocabulary", [
+        _create_search_tables,
+        # Case-insensitive prefix range scans for autocomplete
+        'CREATE INDEX IF NOT EXISTS idx_vocabulary_word_nocase ON vocabulary (word COLLATE NOCASE)',
+    ]),
+    (6, "Word browser sort indexes and cascading word deletes", [
+        # One (sort key, word_id) index per browser order, so every page is a
+        # keyset range scan. The expressions must match BROWSE_ORDERS exactly.
+        'DROP INDEX IF EXISTS idx_progress_mastery',
+        'CREATE INDEX IF NOT EXISTS idx_progress_browse_mastery ON user_progress (mastery_level, word_id)',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_progress_browse_accuracy
+        ON user_progress (correct_answers * 1.0 / MAX(total_attempts, 1), word_id)
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_progress_browse_reviewed
+        ON user_progress (COALESCE(last_review_at, 0), word_id)
+        ''',
+        # A bulk delete is one DELETE on vocabulary; progress and history follow
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_vocabulary_delete_cascade AFTER DELETE ON vocabulary
+        BEGIN
+            DELETE FROM user_progress WHERE word_id = OLD.id;
+            DELETE FROM quiz_results WHERE word_id = OLD.id;
+        END
+        ''',
+    ]),
+    (7, "Learner profiles with per-user progress, sessions and stats", [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            shard TEXT,
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Everything recorded so far belongs to the original single learner
+        "INSERT OR IGNORE INTO users (id, name) VALUES (1, 'default')",
+        # Triggers naming the tables rebuilt below are recreated at the end
+        'DROP TRIGGER IF EXISTS trg_vocabulary_delete_cascade',
+        'DROP TRIGGER IF EXISTS trg_stats_vocabulary_insert',
+        'DROP TRIGGER IF EXISTS trg_stats_vocabulary_delete',
+        'DROP TRIGGER IF EXISTS trg_stats_session_update',
+        'DROP TRIGGER IF EXISTS trg_stats_session_streak',
+        # user_progress.word_id was UNIQUE on its own, so the table is rebuilt
+        _PROGRESS_TABLE.format(name='user_progress_v7'),
+        f'INSERT INTO user_progress_v7 (user_id, {_PROGRESS_COLUMNS}) '
+        f'SELECT 1, {_PROGRESS_COLUMNS} FROM user_progress',
+        'DROP TABLE user_progress',
+        'ALTER TABLE user_progress_v7 RENAME TO user_progress',
+        'ALTER TABLE daily_sessions ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1',
+        'ALTER TABLE quiz_results ADD COLUMN user_id INTEGER NOT NULL DEFAULT 1',
+        'DROP INDEX IF EXISTS idx_sessions_date',
+        'DROP INDEX IF EXISTS idx_sessions_completed',
+        # The word count is shared; the rest of user_stats becomes one row per learner
+        '''
+        CREATE TABLE IF NOT EXISTS vocabulary_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            vocabulary_size INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        'INSERT OR REPLACE INTO vocabulary_stats (id, vocabulary_size) SELECT 1, COUNT(*) FROM vocabulary',
+        _USER_STATS_TABLE.format(name='user_stats_v7'),
+        '''
+        INSERT INTO user_stats_v7 (user_id, total_words, mastered_words, completed_sessions,
+                                   score_sum, current_streak, longest_streak, last_streak_date)
+        SELECT 1, total_words, mastered_words, completed_sessions,
+               score_sum, current_streak, longest_streak, last_streak_date
+        FROM user_stats WHERE id = 1
+        ''',
+        'DROP TABLE user_stats',
+        'ALTER TABLE user_stats_v7 RENAME TO user_stats',
+        *_PER_USER_INDEXES,
+        *_PER_USER_TRIGGERS,
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_vocabulary_insert AFTER INSERT ON vocabulary
+        BEGIN
+            UPDATE vocabulary_stats SET vocabulary_size = vocabulary_size + 1 WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_vocabulary_delete AFTER DELETE ON vocabulary
+        BEGIN
+            UPDATE vocabulary_stats SET vocabulary_size = vocabulary_size - 1 WHERE id = 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_vocabulary_delete_cascade AFTER DELETE ON vocabulary
+        BEGIN
+            DELETE FROM user_progress WHERE word_id = OLD.id;
+            DELETE FROM quiz_results WHERE word_id = OLD.id;
+        END
+        ''',
+    ]),
+    (8, "Response-time and retention rollups over quiz_results", [
+        *_ANALYTICS_TABLES,
+        _backfill_analytics,
+        _rollup_trigger(_ISO_CLOCK),
+        # Per-word rollups follow a deleted word; learner-wide ones keep its history
+        'DROP TRIGGER IF EXISTS trg_vocabulary_delete_cascade',
+        _WORD_DELETE_CASCADE,
+    ]),
+    (9, "Integer epoch answer times", [
+        # The cascade names quiz_results, which is rebuilt below
+        'DROP TRIGGER IF EXISTS trg_vocabulary_delete_cascade',
+        *_EPOCH_RESULTS,
+        _WORD_DELETE_CASCADE,
+    ]),
+    (10, "Merged quiz pack log", [_MERGED_PACKS_TABLE]),
+]
+
+# Schema of a progress shard: one learner's progress, sessions, history and
+# stats in a file of its own. The shared word bank is attached read-only as
+# ``bank``, so unqualified ``vocabulary`` in queries resolves there.
+SHARD_MIGRATIONS: List[Tuple[int, str, List[Step]]] = [
+    (1, "Per-learner progress shard", [
+        _PROGRESS_TABLE.format(name='user_progress'),
+        '''
+        CREATE TABLE IF NOT EXISTS daily_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_date TEXT NOT NULL,
+            words_learned INTEGER DEFAULT 0,
+            quiz_score REAL DEFAULT 0.0,
+            total_time_minutes INTEGER DEFAULT 0,
+            session_completed BOOLEAN DEFAULT FALSE,
+            user_id INTEGER NOT NULL DEFAULT 1
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS quiz_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER,
+            session_date TEXT,
+            is_correct BOOLEAN,
+            response_time_seconds REAL,
+            user_id INTEGER NOT NULL DEFAULT 1
+        )
+        ''',
+        _USER_STATS_TABLE.format(name='user_stats'),
+        'CREATE INDEX IF NOT EXISTS idx_results_word ON quiz_results (word_id, session_date)',
+        *_PER_USER_INDEXES,
+        *_PER_USER_TRIGGERS,
+    ]),
+    (2, "Response-time and retention rollups over quiz_results", [
+        *_ANALYTICS_TABLES,
+        _backfill_analytics,
+        _rollup_trigger(_ISO_CLOCK),
+    ]),
+    (3, "Integer epoch answer times", _EPOCH_RESULTS),
+    (4, "Merged quiz pack log", [_MERGED_PACKS_TABLE]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+SHARD_VERSION = SHARD_MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version stored in the database file"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection,
+            migrations: List[Tuple[int, str, List[Step]]] = MIGRATIONS) -> int:
+    """Apply every pending migration, one transaction per version
+
+    The connection must be in autocommit mode (isolation_level=None).
+    ``migrations`` is MIGRATIONS for the main database or SHARD_MIGRATIONS
+    for a progress shard. Returns the resulting schema version.
+    """
+    version = get_version(conn)
+    if version >= migrations[-1][0]:
+        return version   # up to date, the usual startup: one PRAGMA read and no DDL
+    for target, _description, steps in migrations:
+        if target <= version:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have migrated while we waited for the lock
+            if get_version(conn) >= target:
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f'PRAGMA user_version = {target}')
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        version = target
+    return version
@@ -0,0 +1,121 @@
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# fetch(count, exclude_ids) -> up to ``count`` word dicts not in ``exclude_ids``
+WordFetcher = Callable[[int, Set[int]], List[Dict]]
+
+
+def list_fetcher(words: List[Dict]) -> WordFetcher:
+    """Serve a fixed word list in order"""
+    def fetch(count: int, exclude: Set[int]) -> List[Dict]:
+        return [w for w in words if w['id'] not in exclude][:count]
+    return fetch
+
+
+def due_fetcher(db) -> WordFetcher:
+    """Serve whatever is due now, most overdue first"""
+    def fetch(count: int, exclude: Set[int]) -> List[Dict]:
+        words = db.get_due_words(count + len(exclude))
+        return [w for w in words if w['id'] not in exclude][:count]
+    return fetch
+
+
+class QuestionPipeline:
+    """Keeps the next ``depth`` questions built on a background thread
+
+    A producer thread fetches upcoming words and turns them into questions
+    (shuffled choices included) while the current question is on screen, so
+    ``take`` normally returns immediately. Words already taken or queued are
+    never fetched again. ``invalidate`` bumps a generation counter and drops
+    the queue; anything the producer was building for the old generation is
+    discarded rather than queued, so a stale question can never be served.
+    """
+
+    def __init__(self, generator, fetch: WordFetcher, depth: int = 3, limit: Optional[int] = None):
+        self.generator = generator
+        self.fetch = fetch
+        self.depth = depth
+        self.limit = limit
+        self.generation = 0
+        self._queue: "deque[Tuple[Dict, object]]" = deque()
+        self._taken: Set[int] = set()
+        self._exhausted = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._produce, name="question-pipeline", daemon=True)
+        self._thread.start()
+
+    def _wanted(self) -> int:
+        """How many more questions the queue should hold (caller holds the lock)"""
+        wanted = self.depth - len(self._queue)
+        if self.limit is not None:
+            wanted = min(wanted, self.limit - len(self._taken) - len(self._queue))
+        return wanted
+
+    def _produce(self):
+        while True:
+            with self._cond:
+                while not self._closed and (self._exhausted or self._wanted() <= 0):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation = self.generation
+                count = self._wanted()
+                exclude = self._taken | {word['id'] for word, _ in self._queue}
+
+            error = None
+            try:
+                words = self.fetch(count, exclude)
+                built = [(word, self.generator.make(word, 0, 0)) for word in words]
+            except Exception as e:
+                words, built, error = [], [], e
+
+            with self._cond:
+                if generation != self.generation:
+                    continue
+                self._error = error  # re-raised by take() instead of leaving it waiting
+                self._queue.extend(built)
+                if len(words) < count:
+                    self._exhausted = True
+                self._cond.notify_all()
+
+    @property
+    def drained(self) -> bool:
+        """True once ``take`` has nothing left to return: source dry, limit reached or closed"""
+        with self._cond:
+            return not self._queue and (self._exhausted or self._closed or self._wanted() <= 0)
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Tuple[Dict, object]]:
+        """Next (word, question), or None once the source runs dry or the limit is reached
+
+        With ``timeout`` it also returns None if no question is ready in time;
+        ``drained`` tells the two apart.
+        """
+        with self._cond:
+            while not self._queue:
+                if self._error is not None:
+                    error, self._error = self._error, None
+                    raise error
+                if self._exhausted or self._closed or self._wanted() <= 0:
+                    return None
+                if not self._cond.wait(timeout):
+                    return None
+            word, question = self._queue.popleft()
+            self._taken.add(word['id'])
+            self._cond.notify_all()
+            return word, question
+
+    def invalidate(self):
+        """Drop every prepared question; the producer rebuilds from fresh data"""
+        with self._cond:
+            self.generation += 1
+            self._queue.clear()
+            self._exhausted = False
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
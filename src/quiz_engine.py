@@ -0,0 +1,220 @@
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .question_pipeline import QuestionPipeline, WordFetcher, due_fetcher, list_fetcher
+
+MIN_QUIZ_WORDS = 4   # one correct answer plus three distractors
+MAX_QUESTIONS = 10
+
+
+class Question(NamedTuple):
+    word_id: int
+    word: str
+    prompt: str
+    choices: List[str]
+    correct_answer: str
+    number: int   # 1-based position in the quiz
+    total: int
+
+
+class AnswerResult(NamedTuple):
+    word: str
+    selected: str
+    correct_answer: str
+    correct: bool
+    response_time: float
+
+
+class QuestionGenerator:
+    """Build multiple-choice questions from word dicts and a DistractorIndex
+
+    ``distractors`` is an index, or a callable returning the current one
+    (e.g. ``lambda: db.distractors``), looked up for every question so an
+    index rebuilt after a bulk edit is picked up.
+    """
+
+    def __init__(self, distractors, choice_count: int = 4, rng: Optional[random.Random] = None):
+        self._distractors = distractors
+        self.choice_count = choice_count
+        self.rng = rng or random.Random()
+
+    @property
+    def distractors(self):
+        source = self._distractors
+        return source() if callable(source) else source
+
+    def make(self, word_data: Dict, number: int, total: int) -> Question:
+        correct_answer = word_data['definition']
+        choices = [correct_answer] + self.distractors.choices(
+            word_data['id'], self.choice_count - 1, self.rng)
+        self.rng.shuffle(choices)
+        return Question(word_data['id'], word_data['word'],
+                        f"What does '{word_data['word']}' mean?",
+                        choices, correct_answer, number, total)
+
+
+class Grader:
+    """Decide whether a selected choice answers a question"""
+
+    def grade(self, question: Question, selected: str) -> bool:
+        return selected == question.correct_answer
+
+
+class QuizSession:
+    """State of one quiz run: the words, position, score and answer log"""
+
+    def __init__(self, words: List[Dict], limit: Optional[int] = None):
+        self.words = words[:MAX_QUESTIONS]
+        self.limit = len(self.words) if limit is None else limit
+        self.index = 0
+        self.score = 0
+        self.total = 0
+        self.exhausted = False   # set when a due-driven quiz runs out of cards early
+        self.answers: List[AnswerResult] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.exhausted or self.index >= self.limit
+
+    @property
+    def current_word(self) -> Dict:
+        return self.words[self.index]
+
+    @property
+    def score_percentage(self) -> float:
+        return (self.score / self.total * 100) if self.total > 0 else 0
+
+
+class QuizEngine:
+    """Quiz logic without any UI: question flow, grading and progress writes
+
+    Drivers call ``start`` (fixed words) or ``start_due`` (whatever the
+    scheduler says is due), then alternate ``current_question``/``answer``/
+    ``advance`` until ``session.finished``. Answers are handed to ``record``
+    (default ``db.record_answers``) one at a time, or with
+    ``write_through=False`` buffered and passed in one batch by ``flush``
+    (called automatically when the quiz ends), which is what bulk drivers want.
+
+    With ``prefetch`` > 0 the next questions are built ahead of time by a
+    QuestionPipeline; call ``invalidate`` when the vocabulary changes so
+    prepared questions are rebuilt from fresh data.
+    """
+
+    def __init__(self, db, rng: Optional[random.Random] = None,
+                 clock: Callable[[], float] = time.time, write_through: bool = True,
+                 record: Optional[Callable[[List[Dict]], object]] = None, prefetch: int = 0):
+        self.db = db
+        self.clock = clock
+        self.write_through = write_through
+        self.record = record or db.record_answers
+        self.prefetch = prefetch
+        self.generator = QuestionGenerator(lambda: db.distractors, rng=rng)
+        self.grader = Grader()
+        self.session: Optional[QuizSession] = None
+        self.pipeline: Optional[QuestionPipeline] = None
+        self._question: Optional[Question] = None
+        self._asked_at: Optional[float] = None
+        self._pending: List[Dict] = []
+
+    def start(self, words: List[Dict]) -> QuizSession:
+        """Begin a quiz over up to MAX_QUESTIONS words; raises ValueError if too few"""
+        if len(words) < MIN_QUIZ_WORDS:
+            raise ValueError(f"A quiz needs at least {MIN_QUIZ_WORDS} words")
+        session = QuizSession(words)
+        fetch = list_fetcher(session.words) if self.prefetch else None
+        return self._begin(session, fetch)
+
+    def start_due(self, count: int = MAX_QUESTIONS) -> QuizSession:
+        """Begin a quiz that pulls due cards as it goes, ending early if none are left"""
+        return self._begin(QuizSession([], limit=count), due_fetcher(self.db))
+
+    def _begin(self, session: QuizSession, fetch: Optional[WordFetcher]) -> QuizSession:
+        self.flush()
+        self.close()
+        self.session = session
+        self._question = None
+        if fetch is not None:
+            self.pipeline = QuestionPipeline(self.generator, fetch, depth=self.prefetch or 1,
+                                             limit=session.limit)
+        return session
+
+    def current_question(self, timeout: Optional[float] = None) -> Optional[Question]:
+        """The question for the current word (built once), or None when finished
+
+        With a pipeline and a ``timeout``, waits at most that long for the
+        question and returns None while it is still being built; the quiz is
+        over only if ``session.finished``.
+        """
+        session = self.session
+        if session is None or session.finished:
+            return None
+        if self._question is None:
+            number = session.index + 1
+            if self.pipeline is None:
+                question = self.generator.make(session.current_word, number, session.limit)
+            else:
+                taken = self.pipeline.take(timeout)
+                if taken is None:
+                    if timeout is not None and not self.pipeline.drained:
+                        return None
+                    session.exhausted = True
+                    self.flush()
+                    return None
+                word, question = taken
+                if len(session.words) <= session.index:
+                    session.words.append(word)
+                question = question._replace(number=number, total=session.limit)
+            self._question = question
+            self._asked_at = self.clock()
+        return self._question
+
+    def answer(self, selected: str, response_time: Optional[float] = None) -> AnswerResult:
+        """Grade the current question and record the answer"""
+        question = self.current_question()
+        if question is None:
+            raise RuntimeError("No question is waiting for an answer")
+        if response_time is None:
+            response_time = self.clock() - self._asked_at
+        correct = self.grader.grade(question, selected)
+
+        answer = {'word_id': question.word_id, 'is_correct': correct,
+                  'response_time': response_time}
+        if self.write_through:
+            self.record([answer])
+        else:
+            self._pending.append(answer)
+
+        session = self.session
+        session.total += 1
+        if correct:
+            session.score += 1
+        result = AnswerResult(question.word, selected, question.correct_answer, correct, response_time)
+        session.answers.append(result)
+        return result
+
+    def advance(self, timeout: Optional[float] = None) -> Optional[Question]:
+        """Move to the next word; returns its question as current_question does"""
+        self.session.index += 1
+        self._question = None
+        if self.session.finished:
+            self.flush()
+        return self.current_question(timeout)
+
+    def invalidate(self):
+        """Discard prepared questions (call after words are added, edited or removed)"""
+        if self.pipeline is not None:
+            self.pipeline.invalidate()
+
+    def close(self):
+        """Stop the prefetch thread of the current quiz"""
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+
+    def flush(self) -> int:
+        """Hand buffered answers to ``record`` as one batch; returns how many"""
+        pending, self._pending = self._pending, []
+        if pending:
+            self.record(pending)
+        return len(pending)
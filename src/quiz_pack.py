@@ -0,0 +1,402 @@
+"""Pre-rendered quiz packs for offline play.
+
+A server exports a selection of words (category, difficulty, due cards) as
+finished multiple-choice questions into one compact columnar file. A
+laptop memory-maps the pack and plays it with PackQuiz, which needs no
+database; the answers it saves are merged back into the learner's progress
+and history in a single transaction.
+
+Pack layout (little-endian, every section 8-byte aligned):
+
+  header    magic b'VQPK', version u16, choices per question u16,
+            questions u32, strings u32, meta bytes u32, string bytes u32
+  meta      JSON: pack_id, created_at, user_id, selection
+  word_id   u32[questions]
+  word      u32[questions]             string index
+  prompt    u32[questions]             string index
+  audio     u32[questions]             string index of the pronunciation, or NONE
+  choices   u32[questions * choices]   string index, NONE past a short row
+  correct   u8[questions]              index of the right choice
+  offsets   u32[strings + 1]           string start offsets into the blob
+  blob      UTF-8 string bytes
+
+Strings are deduplicated, so a definition that is the answer to one
+question and a distractor in ten others is stored once.
+
+Usage: python -m src.quiz_pack export pack.vqpack [--db vocabulary.db] [--user NAME]
+                                   [--category C] [--difficulty N] [--due] [--limit 200]
+       python -m src.quiz_pack info pack.vqpack
+       python -m src.quiz_pack merge answers.json [--db vocabulary.db] [--user NAME]
+"""
+import argparse
+import json
+import mmap
+import random
+import struct
+import sys
+import time
+import uuid
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .quiz_engine import AnswerResult, Grader, Question, QuestionGenerator, QuizSession
+
+MAGIC = b'VQPK'
+VERSION = 1
+NONE = 0xFFFFFFFF   # string index meaning "no string"
+
+_HEADER = struct.Struct('<4sHHIIII')
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(questions: int, choices: int, strings: int, meta_bytes: int) -> Dict[str, int]:
+    """Byte offset of every section; the blob runs to the end of the file"""
+    offsets, position = {}, _HEADER.size
+    for name, size in (('meta', meta_bytes), ('word_id', 4 * questions), ('word', 4 * questions),
+                       ('prompt', 4 * questions), ('audio', 4 * questions),
+                       ('choices', 4 * questions * choices), ('correct', questions),
+                       ('offsets', 4 * (strings + 1)), ('blob', 0)):
+        position = _align(position)
+        offsets[name] = position
+        position += size
+    return offsets
+
+
+class _Strings:
+    """Deduplicating string table for the writer"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def add(self, text: Optional[str]) -> int:
+        if text is None:
+            return NONE
+        i = self.index.get(text)
+        if i is None:
+            i = self.index[text] = len(self.encoded)
+            self.encoded.append(text.encode('utf-8'))
+        return i
+
+
+def _u32(values: List[int]) -> bytes:
+    column = array('I', values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_pack(path: str, questions: List[Question], audio: List[Optional[str]], meta: Dict,
+               choice_count: int) -> int:
+    """Write ``questions`` (with one audio reference each) as a pack; returns its size"""
+    strings = _Strings()
+    words = [strings.add(q.word) for q in questions]
+    prompts = [strings.add(q.prompt) for q in questions]
+    audio_refs = [strings.add(ref or None) for ref in audio]
+    choices, correct = [], bytearray()
+    for q in questions:
+        row = [strings.add(choice) for choice in q.choices[:choice_count]]
+        choices.extend(row + [NONE] * (choice_count - len(row)))
+        correct.append(q.choices.index(q.correct_answer))
+
+    string_offsets, position = [], 0
+    for encoded in strings.encoded:
+        string_offsets.append(position)
+        position += len(encoded)
+    string_offsets.append(position)
+
+    meta_bytes = json.dumps(meta).encode('utf-8')
+    layout = _layout(len(questions), choice_count, len(strings.encoded), len(meta_bytes))
+    sections = {
+        'meta': meta_bytes,
+        'word_id': _u32([q.word_id for q in questions]),
+        'word': _u32(words),
+        'prompt': _u32(prompts),
+        'audio': _u32(audio_refs),
+        'choices': _u32(choices),
+        'correct': bytes(correct),
+        'offsets': _u32(string_offsets),
+        'blob': b''.join(strings.encoded),
+    }
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, choice_count, len(questions), len(strings.encoded),
+                             len(meta_bytes), position))
+        for name, data in sections.items():
+            f.write(b'\0' * (layout[name] - f.tell()))
+            f.write(data)
+        return f.tell()
+
+
+class QuizPack:
+    """A memory-mapped quiz pack; questions are decoded only when asked for"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.choice_count, count, strings,
+             meta_bytes, blob_bytes) = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a quiz pack")
+            if version != VERSION:
+                raise ValueError(f"{path} is a version {version} quiz pack; "
+                                 f"this build reads version {VERSION}")
+            layout = _layout(count, self.choice_count, strings, meta_bytes)
+            if len(self._mmap) < layout['blob'] + blob_bytes:
+                raise ValueError(f"{path} is truncated")
+        except BaseException:
+            self._mmap.close()
+            raise
+
+        self._count = count
+        self._views: List[memoryview] = []
+        self.meta = json.loads(self._view(layout['meta'], meta_bytes).tobytes())
+        self.word_ids = self._column(layout['word_id'], count)
+        self._words = self._column(layout['word'], count)
+        self._prompts = self._column(layout['prompt'], count)
+        self._audio = self._column(layout['audio'], count)
+        self._choices = self._column(layout['choices'], count * self.choice_count)
+        self._correct = self._view(layout['correct'], count)
+        self._offsets = self._column(layout['offsets'], strings + 1)
+        self._blob = self._view(layout['blob'], blob_bytes)
+
+    def _view(self, offset: int, size: int) -> memoryview:
+        view = memoryview(self._mmap)[offset:offset + size]
+        self._views.append(view)
+        return view
+
+    def _column(self, offset: int, count: int):
+        """A u32 column: zero-copy on little-endian hosts, a swapped copy elsewhere"""
+        view = self._view(offset, 4 * count)
+        if sys.byteorder == 'big':
+            column = array('I', view.tobytes())
+            column.byteswap()
+            return column
+        column = view.cast('I')
+        self._views.append(column)
+        return column
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Unmap the file; questions already returned stay valid"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    @property
+    def pack_id(self) -> str:
+        return self.meta['pack_id']
+
+    def string(self, i: int) -> Optional[str]:
+        if i == NONE:
+            return None
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+    def audio(self, index: int) -> Optional[str]:
+        """Audio reference (the pronunciation) for question ``index``, if any"""
+        return self.string(self._audio[index])
+
+    def question(self, index: int, number: Optional[int] = None,
+                 total: Optional[int] = None) -> Question:
+        """Question ``index`` (0-based), numbered ``number`` of ``total`` when given"""
+        start = index * self.choice_count
+        choices = [self.string(i) for i in self._choices[start:start + self.choice_count] if i != NONE]
+        return Question(self.word_ids[index], self.string(self._words[index]),
+                        self.string(self._prompts[index]), choices,
+                        choices[self._correct[index]],
+                        index + 1 if number is None else number,
+                        self._count if total is None else total)
+
+
+class PackQuiz:
+    """Plays a QuizPack offline, following QuizEngine's question flow
+
+    Drivers call ``start``, then alternate ``current_question``/``answer``/
+    ``advance`` until ``session.finished``, exactly as with QuizEngine.
+    Answers are collected in ``answers`` as record_answers dicts carrying
+    their ``answered_at`` time; ``save_answers`` writes them for
+    ``merge_answers`` on the machine that holds the learner's database.
+    """
+
+    def __init__(self, pack: QuizPack, clock: Callable[[], float] = time.time):
+        self.pack = pack
+        self.clock = clock
+        self.grader = Grader()
+        self.session: Optional[QuizSession] = None
+        self.answers: List[Dict] = []
+        self._asked_at: Optional[float] = None
+
+    def start(self, limit: Optional[int] = None) -> QuizSession:
+        """Begin a quiz over the pack's questions, or its first ``limit``"""
+        count = len(self.pack) if limit is None else min(limit, len(self.pack))
+        self.session = QuizSession([], limit=count)
+        self._asked_at = self.clock()
+        return self.session
+
+    def current_question(self) -> Optional[Question]:
+        session = self.session
+        if session is None or session.finished:
+            return None
+        return self.pack.question(session.index, session.index + 1, session.limit)
+
+    def answer(self, selected: str, response_time: Optional[float] = None) -> AnswerResult:
+        """Grade the current question and log the answer"""
+        question = self.current_question()
+        if question is None:
+            raise RuntimeError("No question is waiting for an answer")
+        now = self.clock()
+        if response_time is None:
+            response_time = now - self._asked_at
+        correct = self.grader.grade(question, selected)
+        self.answers.append({'word_id': question.word_id, 'is_correct': correct,
+                             'response_time': response_time, 'answered_at': int(now)})
+
+        session = self.session
+        session.total += 1
+        if correct:
+            session.score += 1
+        result = AnswerResult(question.word, selected, question.correct_answer, correct, response_time)
+        session.answers.append(result)
+        return result
+
+    def advance(self) -> Optional[Question]:
+        """Move to the next question; returns it, or None when the quiz is over"""
+        self.session.index += 1
+        self._asked_at = self.clock()
+        return self.current_question()
+
+    def save_answers(self, path: str):
+        """Write the logged answers, tagged with the pack they came from"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'pack_id': self.pack.pack_id, 'user_id': self.pack.meta.get('user_id'),
+                       'answers': self.answers}, f)
+
+
+def export_pack(db, path: str, category: Optional[str] = None, difficulty: Optional[int] = None,
+                due: bool = False, limit: int = 200, choice_count: int = 4,
+                seed: Optional[int] = None) -> Dict:
+    """Render questions for ``db``'s learner over a word selection into a pack file
+
+    Questions are built the way QuizEngine builds them, from the same
+    distractor index, so a pack plays like a live quiz. Raises ValueError
+    when the selection is empty.
+    """
+    start = time.perf_counter()
+    words = db.select_words(category, difficulty, due, limit)
+    if not words:
+        raise ValueError("No words match the selection")
+    generator = QuestionGenerator(db.distractors, choice_count, rng=random.Random(seed))
+    questions = [generator.make(word, i + 1, len(words)) for i, word in enumerate(words)]
+    meta = {
+        'pack_id': uuid.uuid4().hex,
+        'created_at': int(time.time()),
+        'user_id': db.user_id,
+        'selection': {'category': category, 'difficulty': difficulty, 'due': due, 'limit': limit},
+    }
+    size = write_pack(path, questions, [word['pronunciation'] for word in words], meta, choice_count)
+    return {'pack_id': meta['pack_id'], 'questions': len(questions), 'bytes': size,
+            'seconds': time.perf_counter() - start}
+
+
+def load_answers(path: str) -> Tuple[str, Optional[int], List[Dict]]:
+    """(pack_id, user_id, answers) from a file written by PackQuiz.save_answers
+
+    ``user_id`` is the learner the pack was exported for.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data['pack_id'], data.get('user_id'), data['answers']
+
+
+def merge_answers(db, pack_id: str, answers: List[Dict]) -> Dict:
+    """Apply offline answers to ``db``'s learner in one transaction, oldest first
+
+    Answers for words deleted from the bank since the export are skipped, as
+    are answers older than their card's last review. A pack is merged at most
+    once per learner; merging it again applies nothing and reports
+    ``already_merged``.
+    """
+    start = time.perf_counter()
+    word_ids = sorted({a['word_id'] for a in answers})
+    with db.connection() as conn:
+        known = {row[0] for row in conn.execute(
+            'SELECT id FROM vocabulary WHERE id IN (SELECT value FROM json_each(?))',
+            (json.dumps(word_ids),))}
+    batch = sorted((a for a in answers if a['word_id'] in known), key=lambda a: a['answered_at'])
+    merged = db.merge_pack_answers(pack_id, batch)
+    return {'merged': merged or 0, 'skipped': len(answers) - (merged or 0),
+            'already_merged': merged is None, 'seconds': time.perf_counter() - start}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .database import VocabularyDatabase
+
+    parser = argparse.ArgumentParser(description="Export, inspect and merge offline quiz packs")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="write a quiz pack from a word selection")
+    export.add_argument('pack', help="output pack file")
+    export.add_argument('--category', help="only words in this category")
+    export.add_argument('--difficulty', type=int, help="only words at this difficulty level")
+    export.add_argument('--due', action='store_true', help="only cards due for review")
+    export.add_argument('--limit', type=int, default=200, help="questions in the pack")
+    export.add_argument('--seed', type=int, help="distractor choice seed, for reproducible packs")
+    info = commands.add_parser('info', help="describe a pack and show its first questions")
+    info.add_argument('pack', help="pack file")
+    merge = commands.add_parser('merge', help="merge answers saved by PackQuiz")
+    merge.add_argument('answers', help="answers JSON file")
+    for command in (export, merge):
+        command.add_argument('--db', default='vocabulary.db', help="database path")
+        command.add_argument('--user', help="learner name or id (default learner if omitted)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'info':
+        with QuizPack(args.pack) as pack:
+            print(f"Pack {pack.pack_id}: {len(pack)} questions, {pack.choice_count} choices each, "
+                  f"selection {pack.meta['selection']}")
+            for i in range(min(3, len(pack))):
+                question = pack.question(i)
+                print(f"  {question.number}. {question.prompt} -> {question.correct_answer}")
+        return 0
+
+    with VocabularyDatabase(args.db) as db:
+        learner = db if args.user is None else db.for_user(int(args.user) if args.user.isdigit()
+                                                           else args.user)
+        if args.command == 'merge':
+            pack_id, user_id, answers = load_answers(args.answers)
+            # Answers belong to the learner the pack was exported for
+            if user_id is not None:
+                if args.user is None:
+                    learner = db.for_user(user_id)
+                elif learner.user_id != user_id:
+                    parser.error(f"{args.answers} holds answers of learner {user_id}, "
+                                 f"not {args.user!r}")
+            report = merge_answers(learner, pack_id, answers)
+            if report['already_merged']:
+                print(f"Pack {pack_id} is already merged into learner {learner.user_id}; "
+                      f"nothing merged", file=sys.stderr)
+                return 1
+            print(f"Merged {report['merged']} answers from pack {pack_id} into learner "
+                  f"{learner.user_id}, skipped {report['skipped']}, in {report['seconds']:.3f}s")
+        else:
+            report = export_pack(learner, args.pack, args.category, args.difficulty, args.due,
+                                 args.limit, seed=args.seed)
+            print(f"Wrote {report['questions']} questions ({report['bytes']} bytes) to {args.pack} "
+                  f"in {report['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Answer-history retention and compaction.
+
+Deletes raw quiz_results rows older than the retention window from the main
+database and every learner shard, then vacuums the freed pages back to the
+filesystem. Analytics keep working on expired answers through the rollup
+tables, which already count every answer ever recorded.
+
+Usage: python -m src.retention [--db vocabulary.db] [--keep-days 365] [--vacuum-pages 0]
+"""
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+
+def compact(db, keep_days: int, vacuum_pages: int = 0) -> List[Dict]:
+    """Compact the main file and each shard; one report per file"""
+    reports = [dict(db.compact_history(keep_days, vacuum_pages=vacuum_pages), file=db.db_path)]
+    for user in db.get_users():
+        if user['shard'] is not None:
+            handle = db.for_user(user['id'])
+            reports.append(dict(handle.compact_history(keep_days, vacuum_pages=vacuum_pages),
+                                file=handle.shard_path))
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .database import HISTORY_TTL_DAYS, VocabularyDatabase
+
+    parser = argparse.ArgumentParser(description="Expire old answer history and reclaim space")
+    parser.add_argument('--db', default='vocabulary.db', help="database path")
+    parser.add_argument('--keep-days', type=int, default=HISTORY_TTL_DAYS,
+                        help="raw answers newer than this are kept")
+    parser.add_argument('--vacuum-pages', type=int, default=0,
+                        help="free pages to release per file (0 for all)")
+    args = parser.parse_args(argv)
+
+    with VocabularyDatabase(args.db) as db:
+        reports = compact(db, args.keep_days, args.vacuum_pages)
+    for report in reports:
+        vacuum = " (full VACUUM)" if report['full_vacuum'] else ""
+        print(f"{report['file']}: deleted {report['deleted']} answers, reclaimed "
+              f"{report['reclaimed_bytes'] / 1048576:.1f} MB{vacuum} in {report['seconds']:.2f}s")
+    print(f"Total reclaimed: {sum(r['reclaimed_bytes'] for r in reports) / 1048576:.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import math
+from typing import Dict, NamedTuple, Optional, Union
+
+# Answer grades, as in SM-2/FSRS review buttons
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+
+DAY = 86400
+RELEARN_DELAY = 10 * 60     # failed cards come back after ten minutes
+SLOW_ANSWER_SECONDS = 10.0  # correct but slower than this counts as HARD
+
+
+class CardState(NamedTuple):
+    """Scheduling state stored per word in user_progress"""
+    ease: float = 2.5
+    interval_days: float = 0.0
+    repetitions: int = 0
+    lapses: int = 0
+    stability: float = 0.0
+    difficulty: float = 0.0
+    due_at: int = 0
+    last_review_at: Optional[int] = None
+
+
+def grade_answer(is_correct: bool, response_time: float = 0.0) -> int:
+    """Map a multiple-choice answer to a review grade"""
+    if not is_correct:
+        return AGAIN
+    if response_time and response_time > SLOW_ANSWER_SECONDS:
+        return HARD
+    return GOOD
+
+
+class Scheduler:
+    """Base class for scheduling algorithms"""
+    name = ''
+
+    def review(self, state: CardState, grade: int, now: int) -> CardState:
+        """Return the card state after a review with the given grade at ``now``"""
+        raise NotImplementedError
+
+
+class SM2Scheduler(Scheduler):
+    """SuperMemo-2 with a short relearning step for lapses"""
+    name = 'sm2'
+
+    # SM-2 quality (0-5) for each grade
+    QUALITY = {AGAIN: 1, HARD: 3, GOOD: 4, EASY: 5}
+
+    def review(self, state: CardState, grade: int, now: int) -> CardState:
+        q = self.QUALITY[grade]
+        ease = max(1.3, state.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+
+        if q < 3:
+            return state._replace(ease=ease, interval_days=0.0, repetitions=0,
+                                  lapses=state.lapses + 1, due_at=now + RELEARN_DELAY,
+                                  last_review_at=now)
+
+        repetitions = state.repetitions + 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round(state.interval_days * ease)
+        return state._replace(ease=ease, interval_days=interval, repetitions=repetitions,
+                              due_at=now + int(interval * DAY), last_review_at=now)
+
+
+class FSRSScheduler(Scheduler):
+    """Free Spaced Repetition Scheduler (v4 model, default weights)"""
+    name = 'fsrs'
+
+    WEIGHTS = (0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49, 0.14, 0.94,
+               2.18, 0.05, 0.34, 1.26, 0.29, 2.61)
+
+    def __init__(self, desired_retention: float = 0.9, maximum_interval: int = 36500):
+        self.desired_retention = desired_retention
+        self.maximum_interval = maximum_interval
+
+    def _initial_difficulty(self, grade: int) -> float:
+        w = self.WEIGHTS
+        return min(max(w[4] - (grade - 3) * w[5], 1.0), 10.0)
+
+    def _next_interval(self, stability: float) -> float:
+        interval = 9 * stability * (1 / self.desired_retention - 1)
+        return min(max(round(interval), 1), self.maximum_interval)
+
+    def review(self, state: CardState, grade: int, now: int) -> CardState:
+        w = self.WEIGHTS
+
+        if state.stability <= 0:
+            # First review of a new card
+            stability = w[grade - 1]
+            difficulty = self._initial_difficulty(grade)
+        else:
+            elapsed_days = max(0.0, (now - (state.last_review_at or now)) / DAY)
+            retrievability = (1 + elapsed_days / (9 * state.stability)) ** -1
+
+            difficulty = state.difficulty - w[6] * (grade - 3)
+            difficulty = w[7] * self._initial_difficulty(GOOD) + (1 - w[7]) * difficulty
+            difficulty = min(max(difficulty, 1.0), 10.0)
+
+            if grade == AGAIN:
+                stability = (w[11] * difficulty ** -w[12] * ((state.stability + 1) ** w[13] - 1)
+                             * math.exp(w[14] * (1 - retrievability)))
+            else:
+                hard_penalty = w[15] if grade == HARD else 1.0
+                easy_bonus = w[16] if grade == EASY else 1.0
+                stability = state.stability * (
+                    math.exp(w[8]) * (11 - difficulty) * state.stability ** -w[9]
+                    * (math.exp(w[10] * (1 - retrievability)) - 1)
+                    * hard_penalty * easy_bonus + 1)
+
+        if grade == AGAIN:
+            return state._replace(stability=stability, difficulty=difficulty, interval_days=0.0,
+                                  repetitions=0, lapses=state.lapses + 1,
+                                  due_at=now + RELEARN_DELAY, last_review_at=now)
+
+        interval = self._next_interval(stability)
+        return state._replace(stability=stability, difficulty=difficulty, interval_days=float(interval),
+                              repetitions=state.repetitions + 1,
+                              due_at=now + interval * DAY, last_review_at=now)
+
+
+SCHEDULERS: Dict[str, type] = {
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler,
+}
+
+
+def get_scheduler(scheduler: Union[str, Scheduler]) -> Scheduler:
+    """Resolve a scheduler name (see SCHEDULERS) or pass an instance through"""
+    if isinstance(scheduler, Scheduler):
+        return scheduler
+    try:
+        return SCHEDULERS[scheduler]()
+    except KeyError:
+        raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {sorted(SCHEDULERS)}")
@@ -0,0 +1,161 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Upper bound for case-insensitive prefix ranges: sorts after any real character
+_PREFIX_END = '\U0010ffff'
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (Myers/Hyyrö bit-parallel, one pass over ``b``)"""
+    if not a:
+        return len(b)
+    m = len(a)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    pv, mv, score = mask, 0, m
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every token, each as a prefix"""
+    return ' '.join(f'"{token}"*' for token in _TOKEN.findall(text.lower()))
+
+
+class VocabularySearch:
+    """Word lookup for the management screen
+
+    Full-text queries over word, definition and example run against the
+    ``vocabulary_fts`` table, typo-tolerant lookup draws candidates from the
+    ``vocabulary_trigram`` table and ranks them by edit distance, and
+    autocomplete is a prefix range on the NOCASE word index. On SQLite builds
+    without FTS5 the first two fall back to LIKE scans.
+    """
+
+    def __init__(self, db, fuzzy_candidates: int = 1000):
+        self.db = db
+        self.fuzzy_candidates = fuzzy_candidates
+        with db.connection() as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.has_fts = 'vocabulary_fts' in tables
+        self.has_trigram = 'vocabulary_trigram' in tables
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Words starting with ``prefix`` (case-insensitive), alphabetically"""
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        with self.db.connection() as conn:
+            rows = conn.execute('''
+                SELECT word FROM vocabulary
+                WHERE word >= ? COLLATE NOCASE AND word < ? COLLATE NOCASE
+                ORDER BY word COLLATE NOCASE
+                LIMIT ?
+            ''', (prefix, prefix + _PREFIX_END, limit)).fetchall()
+        return [row[0] for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Words whose word, definition or example match every term (as prefixes)"""
+        match = _fts_query(query)
+        if not match:
+            return []
+        with self.db.connection() as conn:
+            if self.has_fts and all(len(token) <= 3 for token in _TOKEN.findall(query.lower())):
+                # Prefixes of up to three letters match a large share of the table;
+                # ranking all of it costs more than the ranking is worth while typing.
+                rows = conn.execute('''
+                    SELECT v.id, v.word, v.definition
+                    FROM vocabulary_fts f
+                    JOIN vocabulary v ON v.id = f.rowid
+                    WHERE vocabulary_fts MATCH ?
+                    LIMIT ?
+                ''', (match, limit)).fetchall()
+            elif self.has_fts:
+                # Matches on the word itself outrank matches in the definition or example
+                rows = conn.execute('''
+                    SELECT v.id, v.word, v.definition
+                    FROM vocabulary_fts f
+                    JOIN vocabulary v ON v.id = f.rowid
+                    WHERE vocabulary_fts MATCH ?
+                    ORDER BY bm25(vocabulary_fts, 10.0, 1.0, 0.5)
+                    LIMIT ?
+                ''', (match, limit)).fetchall()
+            else:
+                pattern = f'%{query.strip()}%'
+                rows = conn.execute('''
+                    SELECT id, word, definition FROM vocabulary
+                    WHERE word LIKE ? OR definition LIKE ? OR example_sentence LIKE ?
+                    LIMIT ?
+                ''', (pattern, pattern, pattern, limit)).fetchall()
+        return [{'id': row[0], 'word': row[1], 'definition': row[2]} for row in rows]
+
+    def fuzzy(self, word: str, limit: int = 10, max_distance: Optional[int] = None) -> List[Dict]:
+        """Words within ``max_distance`` edits of ``word``, closest first
+
+        By default short words tolerate one typo and longer words two.
+        Candidates are the words sharing the most trigrams with ``word``: one
+        edit destroys at most three trigrams, so anything with fewer shared
+        trigrams than that bound allows is skipped before computing distances.
+        """
+        word = word.strip().lower()
+        if not word:
+            return []
+        if max_distance is None:
+            max_distance = 1 if len(word) <= 6 else 2
+        trigrams = {word[i:i + 3] for i in range(len(word) - 2)}
+        low, high = len(word) - max_distance, len(word) + max_distance
+        with self.db.connection() as conn:
+            if self.has_trigram and trigrams:
+                shared: Counter = Counter()
+                for trigram in trigrams:
+                    shared.update(row[0] for row in conn.execute(
+                        'SELECT rowid FROM vocabulary_trigram WHERE vocabulary_trigram MATCH ?',
+                        ('"{}"'.format(trigram.replace('"', '""')),)))
+                needed = max(1, len(trigrams) - 3 * max_distance)
+                ids = [word_id for word_id, count in shared.most_common(self.fuzzy_candidates)
+                       if count >= needed]
+                rows = conn.execute(
+                    'SELECT id, word, definition FROM vocabulary WHERE id IN ({}) '
+                    'AND length(word) BETWEEN ? AND ?'.format(', '.join('?' * len(ids))),
+                    ids + [low, high]).fetchall() if ids else []
+            else:
+                rows = conn.execute(
+                    'SELECT id, word, definition FROM vocabulary WHERE length(word) BETWEEN ? AND ?',
+                    (low, high)).fetchall()
+
+        results = []
+        for word_id, candidate, definition in rows:
+            distance = edit_distance(word, candidate.lower())
+            if distance <= max_distance:
+                results.append({'id': word_id, 'word': candidate, 'definition': definition,
+                                'distance': distance})
+        results.sort(key=lambda r: (r['distance'], r['word']))
+        return results[:limit]
+
+    def lookup(self, text: str, limit: int = 20) -> List[Dict]:
+        """Search-box results: full-text hits, topped up with near-miss spellings"""
+        results = self.search(text, limit)
+        if len(results) < limit and len(_TOKEN.findall(text)) == 1:
+            seen = {r['id'] for r in results}
+            for match in self.fuzzy(text, limit):
+                if match['id'] not in seen and len(results) < limit:
+                    results.append(match)
+        return results
@@ -0,0 +1,158 @@
+"""Headless quiz load driver.
+
+Replays synthetic learners through QuizEngine against a vocabulary database
+and reports questions/sec and answer-write throughput. Each learner answers
+correctly with its own probability and a random response time.
+
+Usage: python -m src.simulate [--db sim.db] [--learners 1000] [--workers 4] [--batch]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .quiz_engine import MAX_QUESTIONS, MIN_QUIZ_WORDS, QuizEngine
+
+
+def synthetic_words(count: int, seed: int = 0):
+    """(word, definition, example, pronunciation, difficulty, category) rows"""
+    rng = random.Random(seed)
+    categories = ['general', 'science', 'business', 'travel']
+    for i in range(count):
+        yield (f"word{i:07d}", f"Synthetic definition {i} " + "x" * rng.randint(0, 40),
+               "", "", rng.randint(1, 3), rng.choice(categories))
+
+
+def pick_words(db, count: int = MAX_QUESTIONS) -> List[Dict]:
+    """Due cards first, then unmastered words, then anything already reviewed"""
+    for fetch in (db.get_due_words, db.get_daily_words, db.get_review_words):
+        words = fetch(count)
+        if len(words) >= MIN_QUIZ_WORDS:
+            return words
+    return []
+
+
+class Stats:
+    """Counters shared by all learner threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.quizzes = 0
+        self.questions = 0
+        self.correct = 0
+        self.write_seconds = 0.0
+
+    def add(self, questions: int, correct: int, write_seconds: float):
+        with self.lock:
+            self.quizzes += 1
+            self.questions += questions
+            self.correct += correct
+            self.write_seconds += write_seconds
+
+
+def run_learner(db, learner: int, quizzes: int, batch: bool, seed: int, stats: Stats,
+                prefetch: int = 0, due: bool = False):
+    rng = random.Random(seed * 1000003 + learner)
+    accuracy = rng.uniform(0.5, 0.95)
+    engine = QuizEngine(db, rng=rng, write_through=not batch, prefetch=prefetch)
+    for _ in range(quizzes):
+        if due:
+            engine.start_due(MAX_QUESTIONS)
+        else:
+            words = pick_words(db)
+            if not words:
+                break
+            engine.start(words)
+        write_seconds = 0.0
+        question = engine.current_question()
+        while question is not None:
+            if rng.random() < accuracy:
+                selected = question.correct_answer
+            else:
+                selected = rng.choice([c for c in question.choices if c != question.correct_answer])
+            start = time.perf_counter()
+            engine.answer(selected, rng.uniform(1.0, 12.0))
+            question = engine.advance()  # flushes buffered answers after the last question
+            write_seconds += time.perf_counter() - start
+        stats.add(engine.session.total, engine.session.score, write_seconds)
+    engine.close()
+
+
+def simulate(db, learners: int = 1000, quizzes: int = 1, workers: int = 4,
+             batch: bool = False, seed: int = 0, prefetch: int = 0, due: bool = False) -> Dict:
+    """Run the learners and return a throughput report"""
+    db.distractors  # build the index once, before the threads race for it
+    stats = Stats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_learner, db, learner, quizzes, batch, seed, stats, prefetch, due)
+                   for learner in range(learners)]
+        for future in futures:
+            future.result()
+    seconds = time.perf_counter() - start
+    transactions = stats.quizzes if batch else stats.questions
+    return {
+        'learners': learners,
+        'workers': workers,
+        'mode': 'batch' if batch else 'per-answer',
+        'prefetch': prefetch,
+        'source': 'due' if due else 'word list',
+        'quizzes': stats.quizzes,
+        'questions': stats.questions,
+        'accuracy': stats.correct / stats.questions if stats.questions else 0.0,
+        'seconds': seconds,
+        'questions_per_second': stats.questions / seconds if seconds else 0.0,
+        'answers_written_per_second': stats.questions / seconds if seconds else 0.0,
+        'write_transactions': transactions,
+        'mean_write_ms': stats.write_seconds / transactions * 1000 if transactions else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .database import VocabularyDatabase
+
+    parser = argparse.ArgumentParser(description="Replay synthetic learners against a database")
+    parser.add_argument('--db', help="database path (default: a temporary database)")
+    parser.add_argument('--learners', type=int, default=1000)
+    parser.add_argument('--quizzes', type=int, default=1, help="quizzes per learner")
+    parser.add_argument('--workers', type=int, default=4, help="concurrent learners")
+    parser.add_argument('--batch', action='store_true',
+                        help="write each quiz in one transaction instead of per answer")
+    parser.add_argument('--prefetch', type=int, default=0,
+                        help="questions to build ahead on a background thread")
+    parser.add_argument('--due', action='store_true',
+                        help="draw each question from the cards currently due")
+    parser.add_argument('--seed-words', type=int, default=2000,
+                        help="synthetic words to add when the database is smaller")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, 'simulate.db')
+        with VocabularyDatabase(db_path, pool_size=max(8, args.workers)) as db:
+            if db.get_user_stats()['vocabulary_size'] < args.seed_words:
+                db.import_words(synthetic_words(args.seed_words, args.seed))
+            report = simulate(db, args.learners, args.quizzes, args.workers, args.batch, args.seed,
+                              args.prefetch, args.due)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['quizzes']} quizzes, {report['questions']} questions "
+              f"({report['mode']}, {report['workers']} workers) in {report['seconds']:.2f}s")
+        print(f"{report['questions_per_second']:.0f} questions/s, "
+              f"{report['answers_written_per_second']:.0f} answers written/s, "
+              f"{report['write_transactions']} write transactions "
+              f"(mean {report['mean_write_ms']:.2f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,479 @@
+"""Persistent Tk screens for VocabularyApp.
+
+Every screen is built once and then re-rendered in place: text goes through
+StringVars or ``config`` and optional widgets are packed/unpacked, so moving
+between words or questions creates no new Tk objects.
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Set
+
+BG = '#f0f0f0'
+CARD_BG = '#ecf0f1'
+
+
+class View(tk.Frame):
+    """A screen that lives inside the content frame and is shown or hidden"""
+
+    def __init__(self, parent):
+        super().__init__(parent, bg=BG)
+
+    def show(self):
+        self.pack(expand=True, fill='both')
+
+    def hide(self):
+        self.pack_forget()
+
+
+class StatsBar(tk.Frame):
+    """One-line summary of get_user_stats"""
+
+    def __init__(self, parent):
+        super().__init__(parent, bg=BG)
+        self.text = tk.StringVar(value="Loading stats...")
+        tk.Label(self, textvariable=self.text, font=("Arial", 12), bg=BG, fg='#7f8c8d').pack()
+
+    def render(self, stats: Dict):
+        self.text.set(f"Words Learned: {stats['total_words']}/{stats['vocabulary_size']} | "
+                      f"Mastered: {stats['mastered_words']} | "
+                      f"Avg Score: {stats['average_score']}% | "
+                      f"Streak: {stats['current_streak']} days")
+
+
+class WelcomeView(View):
+    def __init__(self, parent):
+        super().__init__(parent)
+        tk.Label(self, text="Welcome to Daily Vocabulary Learning!",
+                 font=("Arial", 20), bg=BG, fg='#2c3e50').pack(pady=50)
+        tk.Label(self, text="Choose an activity to improve your vocabulary:",
+                 font=("Arial", 14), bg=BG, fg='#34495e').pack(pady=20)
+
+        features_text = """
+        📚 Daily Learning: Learn new words with definitions and examples
+        🔄 Review Words: Practice previously learned vocabulary
+        🎯 Take Quiz: Test your knowledge with multiple-choice questions
+        """
+        tk.Label(self, text=features_text, font=("Arial", 12), bg=BG, fg='#7f8c8d',
+                 justify='left').pack(pady=30)
+
+
+class LearningView(View):
+    """Word card with previous/next navigation and a listen button"""
+
+    def __init__(self, parent, on_previous: Callable, on_next: Callable, on_listen: Callable):
+        super().__init__(parent)
+        self.progress = tk.StringVar()
+        self.word = tk.StringVar()
+        self.pronunciation = tk.StringVar()
+        self.definition = tk.StringVar()
+        self.example = tk.StringVar()
+
+        tk.Label(self, textvariable=self.progress, font=("Arial", 12),
+                 bg=BG, fg='#7f8c8d').pack(pady=10)
+
+        card = tk.Frame(self, bg=CARD_BG, relief='raised', bd=2)
+        card.pack(pady=20, padx=40, fill='x')
+        self.word_label = tk.Label(card, textvariable=self.word, font=("Arial", 28, "bold"),
+                                   bg=CARD_BG, fg='#2c3e50')
+        self.word_label.pack(pady=20)
+        self.pron_label = tk.Label(card, textvariable=self.pronunciation,
+                                   font=("Arial", 14, "italic"), bg=CARD_BG, fg='#7f8c8d')
+        self.def_label = tk.Label(card, textvariable=self.definition, font=("Arial", 16),
+                                  bg=CARD_BG, fg='#34495e', wraplength=600)
+        self.def_label.pack(pady=15)
+        self.example_label = tk.Label(card, textvariable=self.example, font=("Arial", 14, "italic"),
+                                      bg=CARD_BG, fg='#7f8c8d', wraplength=600)
+        tk.Button(card, text="🔊 Listen", command=on_listen, font=("Arial", 11),
+                  bg='#16a085', fg='white', padx=10, pady=2).pack(pady=(0, 15))
+
+        nav_frame = tk.Frame(self, bg=BG)
+        nav_frame.pack(pady=30)
+        self.prev_btn = tk.Button(nav_frame, text="Previous", command=on_previous,
+                                  font=("Arial", 12), bg='#95a5a6', fg='white', padx=20, pady=5)
+        self.next_btn = tk.Button(nav_frame, text="Next", command=on_next,
+                                  font=("Arial", 12), bg='#3498db', fg='white', padx=20, pady=5)
+        self.next_btn.pack(side='right', padx=10)
+
+    def render(self, word_data: Dict, index: int, total: int):
+        self.progress.set(f"Word {index + 1} of {total}")
+        self.word.set(word_data['word'])
+        self.definition.set(word_data['definition'])
+
+        if word_data['pronunciation']:
+            self.pronunciation.set(f"/{word_data['pronunciation']}/")
+            self.pron_label.pack(pady=5, after=self.word_label)
+        else:
+            self.pron_label.pack_forget()
+
+        if word_data['example']:
+            self.example.set(f"Example: {word_data['example']}")
+            self.example_label.pack(pady=10, padx=20, after=self.def_label)
+        else:
+            self.example_label.pack_forget()
+
+        if index > 0:
+            self.prev_btn.pack(side='left', padx=10)
+        else:
+            self.prev_btn.pack_forget()
+        self.next_btn.config(text="Next" if index < total - 1 else "Finish")
+
+
+class SessionCompleteView(View):
+    def __init__(self, parent, on_quiz: Callable, on_home: Callable):
+        super().__init__(parent)
+        self.summary = tk.StringVar()
+        tk.Label(self, text="Learning Session Complete!", font=("Arial", 24, "bold"),
+                 bg=BG, fg='#27ae60').pack(pady=50)
+        tk.Label(self, textvariable=self.summary, font=("Arial", 16),
+                 bg=BG, fg='#34495e').pack(pady=20)
+        tk.Button(self, text="Take Quiz on These Words", command=on_quiz,
+                  font=("Arial", 14), bg='#e74c3c', fg='white', padx=20, pady=10).pack(pady=20)
+        tk.Button(self, text="Back to Home", command=on_home,
+                  font=("Arial", 12), bg='#95a5a6', fg='white', padx=20, pady=5).pack(pady=10)
+
+    def render(self, words_learned: int):
+        self.summary.set(f"You've studied {words_learned} words today.")
+
+
+class QuizView(View):
+    """Multiple-choice question with a fixed set of reusable radiobuttons"""
+
+    def __init__(self, parent, on_submit: Callable, on_next: Callable, choice_count: int = 4):
+        super().__init__(parent)
+        self.progress = tk.StringVar()
+        self.prompt = tk.StringVar()
+        self.selected = tk.StringVar()
+
+        tk.Label(self, textvariable=self.progress, font=("Arial", 12),
+                 bg=BG, fg='#7f8c8d').pack(pady=10)
+        tk.Label(self, textvariable=self.prompt, font=("Arial", 18, "bold"),
+                 bg=BG, fg='#2c3e50').pack(pady=30)
+
+        self.choice_buttons: List[tk.Radiobutton] = []
+        for _ in range(choice_count):
+            rb = tk.Radiobutton(self, variable=self.selected, font=("Arial", 14), bg=BG,
+                                wraplength=600, justify='left')
+            rb.pack(pady=10, padx=40, anchor='w')
+            self.choice_buttons.append(rb)
+
+        self.submit_btn = tk.Button(self, text="Submit Answer", command=on_submit,
+                                    font=("Arial", 14), bg='#3498db', fg='white', padx=20, pady=10)
+        self.submit_btn.pack(pady=30)
+        self.feedback_label = tk.Label(self, font=("Arial", 14, "bold"), bg=BG)
+        self.next_btn = tk.Button(self, text="Next Question", command=on_next,
+                                  font=("Arial", 12), bg='#95a5a6', fg='white', padx=20, pady=5)
+
+    def render(self, question):
+        self.progress.set(f"Question {question.number} of {question.total}")
+        self.prompt.set(question.prompt)
+        self.selected.set('')
+        for i, rb in enumerate(self.choice_buttons):
+            if i < len(question.choices):
+                rb.config(text=question.choices[i], value=question.choices[i])
+                rb.pack(pady=10, padx=40, anchor='w', before=self.submit_btn)
+            else:
+                rb.pack_forget()
+        self.submit_btn.config(state='normal')
+        self.feedback_label.pack_forget()
+        self.next_btn.pack_forget()
+
+    def show_feedback(self, result):
+        self.submit_btn.config(state='disabled')
+        if result.correct:
+            self.feedback_label.config(text="Correct!", fg="#27ae60")
+        else:
+            self.feedback_label.config(text=f"Incorrect. The answer is: {result.correct_answer}",
+                                       fg="#e74c3c")
+        self.feedback_label.pack(pady=20)
+        self.next_btn.pack(pady=10)
+
+
+class ResultsView(View):
+    def __init__(self, parent, on_retry: Callable, on_home: Callable):
+        super().__init__(parent)
+        self.score = tk.StringVar()
+        tk.Label(self, text="Quiz Complete!", font=("Arial", 24, "bold"),
+                 bg=BG, fg='#2c3e50').pack(pady=30)
+        tk.Label(self, textvariable=self.score, font=("Arial", 18),
+                 bg=BG, fg='#34495e').pack(pady=20)
+        self.feedback_label = tk.Label(self, font=("Arial", 14), bg=BG)
+        self.feedback_label.pack(pady=15)
+
+        button_frame = tk.Frame(self, bg=BG)
+        button_frame.pack(pady=30)
+        tk.Button(button_frame, text="Retake Quiz", command=on_retry,
+                  font=("Arial", 12), bg='#e74c3c', fg='white', padx=15, pady=5).pack(side='left', padx=10)
+        tk.Button(button_frame, text="Back to Home", command=on_home,
+                  font=("Arial", 12), bg='#95a5a6', fg='white', padx=15, pady=5).pack(side='left', padx=10)
+
+    def render(self, score: int, total: int, percentage: float):
+        self.score.set(f"Score: {score}/{total} ({percentage:.1f}%)")
+        if percentage >= 80:
+            feedback, color = "Excellent work! You're mastering these words.", "#27ae60"
+        elif percentage >= 60:
+            feedback, color = "Good job! Keep practicing to improve.", "#f39c12"
+        else:
+            feedback, color = "Keep studying. Review the words and try again.", "#e74c3c"
+        self.feedback_label.config(text=feedback, fg=color)
+
+
+class WordBrowser(tk.Frame):
+    """Scrollable word list over the whole vocabulary, whatever its size
+
+    The Treeview holds a fixed set of ``rows`` items that are re-filled in
+    place as the list scrolls, so only visible rows are ever materialized.
+    Behind them sits a buffer of at most ``buffer_pages`` pages fetched by
+    keyset cursor through ``on_fetch(token, order, descending, after, before,
+    seek, limit)``; results come back through ``receive``. Selection is kept
+    by word id, so it survives scrolling and re-sorting.
+    """
+
+    COLUMNS = (('word', "Word", 140), ('definition', "Definition", 290), ('mastery', "Mastery", 70),
+               ('accuracy', "Accuracy", 75), ('reviewed', "Last Reviewed", 110))
+    ORDERS = (('added', "Date added"), ('mastery', "Mastery"), ('accuracy', "Accuracy"),
+              ('last_reviewed', "Last reviewed"))
+
+    def __init__(self, parent, on_fetch: Callable, on_delete: Callable, on_update: Callable,
+                 on_reset: Callable, rows: int = 10, page_size: int = 100, buffer_pages: int = 5):
+        super().__init__(parent, bg=BG)
+        self.on_fetch = on_fetch
+        self.visible = rows
+        self.page_size = page_size
+        self.buffer_limit = page_size * buffer_pages
+        self.total = 0
+        self.selected_ids: Set[int] = set()
+        self._rows: List[Dict] = []
+        self._top = 0          # buffer index of the first visible row
+        self._offset = 0       # estimated position of _rows[0] in the whole list
+        self._at_start = self._at_end = False
+        self._token = 0
+        self._pending: Optional[int] = None
+
+        controls = tk.Frame(self, bg=BG)
+        controls.pack(fill='x', pady=(0, 5))
+        tk.Label(controls, text="Sort by:", font=("Arial", 11), bg=BG).pack(side='left')
+        self.order = tk.StringVar(value=self.ORDERS[0][1])
+        sort_box = ttk.Combobox(controls, textvariable=self.order, state='readonly', width=14,
+                                values=[label for _, label in self.ORDERS])
+        sort_box.pack(side='left', padx=5)
+        sort_box.bind('<<ComboboxSelected>>', lambda _e: self.reload(keep_position=False))
+        self.descending = tk.BooleanVar(value=False)
+        tk.Checkbutton(controls, text="Descending", variable=self.descending, bg=BG,
+                       command=lambda: self.reload(keep_position=False)).pack(side='left')
+        self.summary = tk.StringVar()
+        tk.Label(controls, textvariable=self.summary, font=("Arial", 10), bg=BG,
+                 fg='#7f8c8d').pack(side='right')
+
+        body = tk.Frame(self, bg=BG)
+        body.pack(fill='both', expand=True)
+        self.tree = ttk.Treeview(body, columns=[name for name, _, _ in self.COLUMNS], show='headings',
+                                 height=rows, selectmode='extended')
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, stretch=name == 'definition')
+        self._slots = [self.tree.insert('', 'end') for _ in range(rows)]
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient='vertical', command=self._on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda _e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda _e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda _e: self.scroll(-self.visible) or 'break')
+        self.tree.bind('<Next>', lambda _e: self.scroll(self.visible) or 'break')
+        self.tree.bind('<Home>', lambda _e: self.jump(0.0) or 'break')
+        self.tree.bind('<End>', lambda _e: self.jump(1.0) or 'break')
+
+        actions = tk.Frame(self, bg=BG)
+        actions.pack(fill='x', pady=(5, 0))
+        self.category = tk.StringVar()
+        tk.Entry(actions, textvariable=self.category, font=("Arial", 11), width=12).pack(side='left')
+        tk.Button(actions, text="Set Category", font=("Arial", 10),
+                  command=lambda: self._bulk(on_update, category=self.category.get().strip() or None)
+                  ).pack(side='left', padx=(5, 15))
+        self.difficulty = tk.IntVar(value=1)
+        tk.Spinbox(actions, from_=1, to=5, textvariable=self.difficulty, width=3,
+                   font=("Arial", 11)).pack(side='left')
+        tk.Button(actions, text="Set Difficulty", font=("Arial", 10),
+                  command=lambda: self._bulk(on_update, difficulty=self.difficulty.get())
+                  ).pack(side='left', padx=(5, 15))
+        tk.Button(actions, text="Delete", font=("Arial", 10), bg='#e74c3c', fg='white',
+                  command=lambda: self._bulk(on_delete)).pack(side='right')
+        tk.Button(actions, text="Reset Progress", font=("Arial", 10),
+                  command=lambda: self._bulk(on_reset)).pack(side='right', padx=5)
+
+    @property
+    def order_key(self) -> str:
+        return next(key for key, label in self.ORDERS if label == self.order.get())
+
+    def _request(self, after=None, before=None, seek=None):
+        """Ask for one page; replies to superseded requests are ignored"""
+        if self._pending is not None and (after is not None or before is not None):
+            return  # already paging; the next scroll step will ask again
+        self._token += 1
+        self._pending = self._token
+        self.on_fetch(self._token, self.order_key, self.descending.get(), after, before, seek,
+                      self.page_size)
+
+    def reload(self, keep_position: bool = True):
+        """Refetch from the first visible row (or from the top) after a change"""
+        if keep_position and self._rows:
+            key, word_id = self._rows[self._top]['cursor']
+            # A cursor just before the first visible row, so that row is included
+            self._pending = None
+            self._request(after=(key, word_id + 1 if self.descending.get() else word_id - 1))
+            self._reset_buffer(self._offset + self._top, at_start=self._at_start and self._top == 0)
+        else:
+            self.jump(0.0)
+
+    def jump(self, fraction: float):
+        """Show the list from roughly ``fraction`` of the way through"""
+        fraction = min(max(fraction, 0.0), 1.0)
+        self._pending = None
+        self._request(seek=fraction)
+        self._reset_buffer(round(fraction * self.total), at_start=fraction == 0.0)
+
+    def _reset_buffer(self, offset: int, at_start: bool):
+        self._rows, self._top, self._offset = [], 0, offset
+        self._at_start, self._at_end = at_start, False
+
+    def receive(self, token: int, rows: List[Dict], after, before, seek):
+        """Merge a fetched page into the buffer"""
+        if token != self._pending:
+            return
+        self._pending = None
+        full = len(rows) == self.page_size
+        if before is not None or (seek is not None and seek >= 1):
+            self._rows[:0] = rows
+            self._top += len(rows)
+            self._offset -= len(rows)
+            self._at_start = not full
+            if seek is not None:
+                self._at_end = True
+                self._offset = max(self.total - len(rows), 0)
+                self._top = max(len(rows) - self.visible, 0)
+            excess = len(self._rows) - self.buffer_limit
+            if excess > 0:
+                del self._rows[-excess:]
+                self._at_end = False
+        else:
+            self._rows.extend(rows)
+            self._at_end = not full
+            excess = len(self._rows) - self.buffer_limit
+            if excess > 0:
+                del self._rows[:excess]
+                self._top -= excess
+                self._offset += excess
+                self._at_start = False
+        if self._at_start:
+            self._offset = 0
+        self.scroll(0)
+
+    def scroll(self, delta: int):
+        """Move the visible window by ``delta`` rows, paging in more rows as needed"""
+        top = self._top + delta
+        if top + self.visible > len(self._rows) and not self._at_end and self._rows:
+            self._request(after=self._rows[-1]['cursor'])
+        if top < 0 and not self._at_start and self._rows:
+            self._request(before=self._rows[0]['cursor'])
+        self._top = max(0, min(top, len(self._rows) - self.visible))
+        self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.jump(float(amount))
+        else:
+            self.scroll(int(amount) * (self.visible if unit == 'pages' else 1))
+
+    def _render(self):
+        """Fill the fixed item slots from the buffer"""
+        window = self._rows[self._top:self._top + self.visible]
+        selection = []
+        for i, slot in enumerate(self._slots):
+            if i < len(window):
+                row = window[i]
+                reviewed = (time.strftime('%Y-%m-%d', time.localtime(row['last_review_at']))
+                            if row['last_review_at'] else "never")
+                accuracy = f"{row['accuracy']:.0%}" if row['accuracy'] is not None else "-"
+                self.tree.item(slot, values=(row['word'], row['definition'], row['mastery_level'],
+                                             accuracy, reviewed))
+                self.tree.move(slot, '', i)
+                if row['id'] in self.selected_ids:
+                    selection.append(slot)
+            else:
+                self.tree.detach(slot)
+        self.tree.selection_set(selection)
+
+        total = max(self.total, 1)
+        first = min((self._offset + self._top) / total, 1.0)
+        self.scrollbar.set(first, min(first + len(window) / total, 1.0))
+        self.summary.set(f"{self.total} words, {len(self.selected_ids)} selected")
+
+    def _on_select(self, _event):
+        chosen = set(self.tree.selection())
+        window = self._rows[self._top:self._top + self.visible]
+        for slot, row in zip(self._slots, window):
+            if slot in chosen:
+                self.selected_ids.add(row['id'])
+            else:
+                self.selected_ids.discard(row['id'])
+        self.summary.set(f"{self.total} words, {len(self.selected_ids)} selected")
+
+    def _bulk(self, action: Callable, **fields):
+        if self.selected_ids:
+            action(sorted(self.selected_ids), **fields)
+
+
+class ManagementView(View):
+    """Word browser, search box with live results, and the add-word form"""
+
+    def __init__(self, parent, on_add: Callable, on_back: Callable, browser_callbacks: Dict):
+        super().__init__(parent)
+        tk.Label(self, text="Manage Vocabulary Words", font=("Arial", 20, "bold"),
+                 bg=BG, fg='#2c3e50').pack(pady=10)
+
+        tabs = ttk.Notebook(self)
+        tabs.pack(fill='both', expand=True, padx=20)
+        self.browser = WordBrowser(tabs, **browser_callbacks)
+        tabs.add(self.browser, text="Browse")
+
+        search_frame = tk.Frame(tabs, bg=BG, padx=20, pady=10)
+        tabs.add(search_frame, text="Search")
+        self.search_text = tk.StringVar()
+        tk.Entry(search_frame, textvariable=self.search_text, font=("Arial", 12),
+                 width=50).pack(fill='x')
+        self.results = tk.Listbox(search_frame, font=("Arial", 11), height=12, activestyle='none')
+        self.results.pack(fill='both', expand=True, pady=(5, 0))
+
+        self.add_frame = tk.Frame(tabs, bg=BG, padx=20, pady=15)
+        tabs.add(self.add_frame, text="Add Word")
+
+        self.word_entry = self._field(0, "Word:", 30)
+        self.def_entry = self._field(1, "Definition:", 50)
+        self.example_entry = self._field(2, "Example:", 50)
+        self.pron_entry = self._field(3, "Pronunciation:", 30)
+
+        tk.Button(self.add_frame, text="Add Word", command=on_add, font=("Arial", 12),
+                  bg='#27ae60', fg='white', padx=20, pady=5).grid(row=4, column=1, pady=15, sticky='e')
+
+        self.back_btn = tk.Button(self, text="Back to Home", command=on_back, font=("Arial", 12),
+                                  bg='#95a5a6', fg='white', padx=20, pady=5)
+        self.back_btn.pack(pady=10)
+
+    def _field(self, row: int, label: str, width: int) -> tk.Entry:
+        tk.Label(self.add_frame, text=label, font=("Arial", 12), bg=BG).grid(
+            row=row, column=0, sticky='w', pady=5)
+        entry = tk.Entry(self.add_frame, font=("Arial", 12), width=width)
+        entry.grid(row=row, column=1, padx=10, pady=5)
+        return entry
+
+    def clear(self):
+        for entry in (self.word_entry, self.def_entry, self.example_entry, self.pron_entry):
+            entry.delete(0, tk.END)
+
+    def render_results(self, results: List[Dict]):
+        self.results.delete(0, tk.END)
+        for result in results:
+            self.results.insert(tk.END, f"{result['word']} - {result['definition']}")
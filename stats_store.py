@@ -0,0 +1,186 @@
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Answer log: an 8-byte header (magic + generation) followed by fixed-size
+# records of (word id, correct flag, unix time). Word ids index into the
+# companion words file, whose first line carries the same generation.
+LOG_MAGIC = b'VTSL'
+LOG_HEADER = struct.Struct('<4sI')
+RECORD = struct.Struct('<IBd')
+WORDS_MAGIC = '#vtsw'
+
+
+def atomic_write(path: str, data: bytes):
+    """Write a file via temp file + fsync + rename, so readers never see a partial file"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class StatsStore:
+    """Per-word correct/wrong counters backed by an append-only answer log
+
+    Counters live in memory. Each answer appends one fixed-size record, and
+    every ``compact_every`` answers the counters are folded into an atomically
+    written snapshot and the log starts a new generation. On open the snapshot
+    is loaded and the log replayed; a torn trailing record from a crash is
+    dropped, and a log from an older generation (already in the snapshot) is
+    discarded.
+    """
+
+    def __init__(self, data_dir: str = "data", compact_every: int = 10000,
+                 legacy_file: Optional[str] = None, fsync: bool = False):
+        self.snapshot_path = os.path.join(data_dir, "stats.snapshot.json")
+        self.log_path = os.path.join(data_dir, "stats.log")
+        self.words_path = os.path.join(data_dir, "stats.words")
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+        os.makedirs(data_dir, exist_ok=True)
+        self.generation = 0
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._word_ids: Dict[str, int] = {}
+        self._words: List[str] = []
+        self._pending = 0
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.generation = snapshot['generation']
+            self.stats = snapshot['stats']
+        elif legacy_file and os.path.exists(legacy_file):
+            # One-time migration from the old whole-file stats.json
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                self.stats = json.load(f)
+        self._replay()
+        self._log = open(self.log_path, 'ab')
+        self._words_file = open(self.words_path, 'a', encoding='utf-8', newline='\n')
+        if not os.path.exists(self.snapshot_path):
+            self.compact()
+
+    def _replay(self):
+        """Apply the current generation's log on top of the snapshot"""
+        words = self._read_words()
+        records = self._read_log()
+        if words is None or records is None:
+            self._start_generation()
+            return
+
+        self._words = words
+        self._word_ids = {word: i for i, word in enumerate(words)}
+        for word_id, correct, _timestamp in records:
+            if word_id < len(words):
+                self._apply(words[word_id], correct)
+        self._pending = len(records)
+
+    def _read_words(self) -> Optional[List[str]]:
+        """Words of the current generation, or None if the file is missing or stale"""
+        if not os.path.exists(self.words_path):
+            return None
+        with open(self.words_path, 'r', encoding='utf-8', newline='\n') as f:
+            content = f.read()
+        lines = content.split('\n')
+        if lines[0] != f"{WORDS_MAGIC} {self.generation}":
+            return None
+        complete = lines[1:-1]  # the last element is '' or a torn line
+        if lines[-1]:
+            with open(self.words_path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write('\n'.join(lines[:-1]) + '\n')
+        return complete
+
+    def _read_log(self) -> Optional[List[tuple]]:
+        """Records of the current generation, or None if the log is missing or stale"""
+        if not os.path.exists(self.log_path):
+            return None
+        with open(self.log_path, 'rb') as f:
+            data = f.read()
+        if len(data) < LOG_HEADER.size:
+            return None
+        magic, generation = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC or generation != self.generation:
+            return None
+        usable = LOG_HEADER.size + (len(data) - LOG_HEADER.size) // RECORD.size * RECORD.size
+        if usable != len(data):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(usable)
+        return list(RECORD.iter_unpack(data[LOG_HEADER.size:usable]))
+
+    def _start_generation(self):
+        """Reset the words file and log to empty files for the current generation"""
+        self._words = []
+        self._word_ids = {}
+        self._pending = 0
+        atomic_write(self.words_path, f"{WORDS_MAGIC} {self.generation}\n".encode('utf-8'))
+        atomic_write(self.log_path, LOG_HEADER.pack(LOG_MAGIC, self.generation))
+
+    def _apply(self, word: str, correct: bool):
+        entry = self.stats.setdefault(word, {"correct": 0, "wrong": 0})
+        entry["correct" if correct else "wrong"] += 1
+
+    def record(self, word: str, correct: bool):
+        """Count one answer and append it to the log"""
+        with self._lock:
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                word_id = len(self._words)
+                self._words.append(word)
+                self._word_ids[word] = word_id
+                self._words_file.write(word + '\n')
+                self._words_file.flush()
+            self._log.write(RECORD.pack(word_id, 1 if correct else 0, time.time()))
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self._apply(word, correct)
+            self._pending += 1
+            if self._pending >= self.compact_every:
+                self._compact_locked()
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of all counters"""
+        with self._lock:
+            return {word: dict(counts) for word, counts in self.stats.items()}
+
+    def replace(self, stats: Dict[str, Dict[str, int]]):
+        """Overwrite all counters (used by the legacy save_stats API)"""
+        with self._lock:
+            self.stats = {word: dict(counts) for word, counts in stats.items()}
+            self._compact_locked()
+
+    def compact(self):
+        """Fold the log into a new snapshot and start an empty log"""
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        # Snapshot first: once it names generation N+1, any log still tagged N
+        # is known to be folded in and will be ignored if we crash right here.
+        self.generation += 1
+        data = json.dumps({"generation": self.generation, "stats": self.stats}, ensure_ascii=False)
+        atomic_write(self.snapshot_path, data.encode('utf-8'))
+        if hasattr(self, '_log'):
+            self._log.close()
+            self._words_file.close()
+        self._start_generation()
+        self._log = open(self.log_path, 'ab')
+        self._words_file = open(self.words_path, 'a', encoding='utf-8', newline='\n')
+
+    def close(self):
+        with self._lock:
+            self._log.close()
+            self._words_file.close()
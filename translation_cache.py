@@ -0,0 +1,190 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+API_URL = "https://api-b2b.backenster.com/b1/api/v3/translate"
+FAILED_MARKER = "(번역 실패)"  # legacy translations.json value for failed lookups
+
+
+class TranslationCache:
+    """SQLite-backed translation cache
+
+    Lookups are primary-key reads and writes touch only the changed rows, so
+    nothing is ever rewritten wholesale. Failed lookups are stored as negative
+    entries that expire after ``negative_ttl`` seconds instead of being kept
+    forever.
+    """
+
+    def __init__(self, path: str = "translations.db", negative_ttl: float = 3600,
+                 legacy_json: Optional[str] = None):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                text TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                translation TEXT,
+                updated_at INTEGER NOT NULL,
+                PRIMARY KEY (text, source, target)
+            ) WITHOUT ROWID
+        ''')
+        if legacy_json and os.path.exists(legacy_json) and len(self) == 0:
+            self.import_json(legacy_json)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, text: str, source: str = "en", target: str = "ko") -> Tuple[bool, Optional[str]]:
+        """Return (hit, translation); a fresh negative entry is a hit with None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT translation, updated_at FROM translations WHERE text = ? AND source = ? AND target = ?',
+                (text, source, target)).fetchone()
+        if row is None:
+            return False, None
+        translation, updated_at = row
+        if translation is None and time.time() - updated_at > self.negative_ttl:
+            return False, None
+        return True, translation
+
+    def get(self, text: str, source: str = "en", target: str = "ko") -> Optional[str]:
+        """Return the cached translation, or None"""
+        return self.lookup(text, source, target)[1]
+
+    def put_many(self, items: Iterable[Tuple[str, Optional[str]]], source: str = "en", target: str = "ko"):
+        """Store (text, translation) pairs in one transaction; None marks a failure"""
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)',
+                    ((text, source, target, translation, now) for text, translation in items))
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def put(self, text: str, translation: Optional[str], source: str = "en", target: str = "ko"):
+        self.put_many([(text, translation)], source, target)
+
+    def missing(self, texts: Iterable[str], source: str = "en", target: str = "ko") -> List[str]:
+        """Texts with no usable entry (absent, or an expired failure), in order, deduplicated"""
+        result = []
+        seen = set()
+        for text in texts:
+            if text not in seen:
+                seen.add(text)
+                if not self.lookup(text, source, target)[0]:
+                    result.append(text)
+        return result
+
+    def import_json(self, path: str, source: str = "en", target: str = "ko") -> int:
+        """Import a legacy translations.json, skipping its permanent failure markers"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        items = [(text, value) for text, value in data.items() if value and value != FAILED_MARKER]
+        self.put_many(items, source, target)
+        return len(items)
+
+
+class Translator:
+    """Lingvanex client backed by a TranslationCache
+
+    Requests retry with exponential backoff on network errors, 429 and 5xx.
+    ``preload`` fetches uncached words on a bounded thread pool and writes each
+    batch of results to the cache in a single transaction.
+    """
+
+    def __init__(self, api_key: str, cache: TranslationCache, api_url: str = API_URL,
+                 timeout: float = 5.0, retries: int = 3, backoff: float = 0.5):
+        self.api_key = api_key
+        self.cache = cache
+        self.api_url = api_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """One keep-alive session per thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update({
+                "accept": "application/json",
+                "content-type": "application/json",
+                "Authorization": self.api_key
+            })
+        return session
+
+    def fetch(self, text: str, source: str = "en", target: str = "ko") -> Optional[str]:
+        """Call the API without touching the cache; None if it could not translate"""
+        payload = {"text": text, "from": source, "to": target, "platform": "api"}
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * (0.5 + random.random()))
+            try:
+                response = self._session().post(self.api_url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = e
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                error = f"HTTP {response.status_code}"
+                continue
+            try:
+                response.raise_for_status()
+                return response.json().get("result") or None
+            except (requests.RequestException, ValueError) as e:
+                error = e
+                break
+        print(f"[ERROR] 번역 실패: {text}, 에러: {error}")
+        return None
+
+    def translate(self, text: str, source: str = "en", target: str = "ko") -> Optional[str]:
+        """Cached translation; failures are negatively cached for the cache's TTL"""
+        hit, translation = self.cache.lookup(text, source, target)
+        if hit:
+            return translation
+        translation = self.fetch(text, source, target)
+        self.cache.put(text, translation, source, target)
+        return translation
+
+    def preload(self, texts: Iterable[str], source: str = "en", target: str = "ko",
+                max_workers: int = 8, batch_size: int = 50) -> Dict:
+        """Fetch every uncached text concurrently; returns a summary"""
+        pending = self.cache.missing(texts, source, target)
+        start = time.perf_counter()
+        translated = failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i:i + batch_size]
+                results = list(pool.map(lambda t: self.fetch(t, source, target), batch))
+                self.cache.put_many(zip(batch, results), source, target)
+                ok = sum(1 for r in results if r)
+                translated += ok
+                failed += len(batch) - ok
+        return {
+            'requested': len(pending),
+            'translated': translated,
+            'failed': failed,
+            'seconds': time.perf_counter() - start
+        }
@@ -1,13 +1,183 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
 import requests
 
-def get_meaning(word):
-    """Free Dictionary API에서 단어 뜻 가져오기"""
-    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
+API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+CACHE_FILE = os.path.join("data", "dictionary_cache.db")
+
+
+class DictionaryClient:
+    """Free Dictionary API 클라이언트 (메모리 LRU + 디스크 캐시 + 백그라운드 프리페치)
+
+    Full entries (every meaning and definition) are cached in memory and in a
+    SQLite file keyed by the lower-cased word, so a word is fetched from the
+    network at most once. Unknown words are remembered for ``not_found_ttl``
+    seconds; network errors are not cached.
+    """
+
+    def __init__(self, cache_path: str = CACHE_FILE, memory_size: int = 1024,
+                 timeout: float = 5.0, not_found_ttl: float = 86400, max_workers: int = 2):
+        self.memory_size = memory_size
+        self.timeout = timeout
+        self.not_found_ttl = not_found_ttl
+        self._memory: "OrderedDict[str, Optional[list]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dictionary")
+
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                word TEXT PRIMARY KEY,
+                data TEXT,
+                fetched_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        self._db.commit()
+
+    def _session(self) -> requests.Session:
+        """One keep-alive session per worker thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    @staticmethod
+    def _key(word: str) -> str:
+        return word.strip().lower()
+
+    def _remember(self, key: str, entry: Optional[list]):
+        """Put an entry in the in-memory LRU"""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _cached(self, key: str):
+        """Return (hit, entry) from memory, then disk"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return True, self._memory[key]
+            row = self._db.execute('SELECT data, fetched_at FROM entries WHERE word = ?', (key,)).fetchone()
+        if row is None:
+            return False, None
+        data, fetched_at = row
+        if data is None and time.time() - fetched_at > self.not_found_ttl:
+            return False, None
+        entry = json.loads(data) if data is not None else None
+        self._remember(key, entry)
+        return True, entry
+
+    def _fetch(self, key: str) -> Optional[list]:
+        """Fetch from the network and store the result"""
         try:
-            return data[0]['meanings'][0]['definitions'][0]['definition']
-        except (IndexError, KeyError):
+            response = self._session().get(API_URL.format(word=key), timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"[ERROR] 사전 조회 실패: {key}, 에러: {e}")
             return None
-    return None
\ No newline at end of file
+
+        if response.status_code == 200:
+            try:
+                entry = response.json()
+            except ValueError as e:
+                print(f"[ERROR] 사전 조회 실패: {key}, 에러: {e}")
+                return None
+        elif response.status_code == 404:
+            entry = None
+        else:
+            print(f"[ERROR] 사전 조회 실패: {key}, HTTP {response.status_code}")
+            return None
+
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?)',
+                             (key, json.dumps(entry, ensure_ascii=False) if entry is not None else None,
+                              int(time.time())))
+            self._db.commit()
+        self._remember(key, entry)
+        return entry
+
+    def prefetch(self, word: str) -> Future:
+        """Start loading a word in the background; returns a future of its entry"""
+        key = self._key(word)
+        hit, entry = self._cached(key)
+        if hit:
+            return self._resolved(entry)
+
+        with self._lock:
+            # A fetch may have finished and left _inflight since _cached looked
+            if key in self._memory:
+                return self._resolved(self._memory[key])
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._fetch, key)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _f, k=key: self._forget_inflight(k))
+        return future
+
+    @staticmethod
+    def _resolved(entry: Optional[list]) -> Future:
+        future = Future()
+        future.set_result(entry)
+        return future
+
+    def _forget_inflight(self, key: str):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def get_entry(self, word: str) -> Optional[list]:
+        """Full API response for a word (all entries), or None"""
+        return self.prefetch(word).result()
+
+    def get_meanings(self, word: str) -> List[Dict]:
+        """Every definition of a word as {'part_of_speech', 'definition', 'example'}"""
+        meanings = []
+        for entry in self.get_entry(word) or []:
+            for meaning in entry.get('meanings', []):
+                for definition in meaning.get('definitions', []):
+                    meanings.append({
+                        'part_of_speech': meaning.get('partOfSpeech'),
+                        'definition': definition.get('definition'),
+                        'example': definition.get('example')
+                    })
+        return meanings
+
+    def get_meaning(self, word: str) -> Optional[str]:
+        """First definition of a word, or None"""
+        meanings = self.get_meanings(word)
+        return meanings[0]['definition'] if meanings else None
+
+
+_client: Optional[DictionaryClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> DictionaryClient:
+    """Shared client used by the module-level helpers"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = DictionaryClient()
+        return _client
+
+
+def get_meaning(word):
+    """Free Dictionary API에서 단어 뜻 가져오기 (캐시 사용)"""
+    return get_client().get_meaning(word)
+
+
+def prefetch(word) -> Future:
+    """다음 문제 단어의 뜻을 백그라운드에서 미리 가져오기"""
+    return get_client().prefetch(word)
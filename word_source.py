@@ -0,0 +1,98 @@
+import mmap
+import os
+import random
+import re
+import struct
+from array import array
+from typing import Iterator, Optional
+
+from stats_store import atomic_write
+
+# Index file: header (magic, source mtime_ns, source size, word count) followed
+# by one uint64 byte offset per word. A stale header means the source changed.
+INDEX_MAGIC = b'VTWIDX01'
+INDEX_HEADER = struct.Struct('<8sQQQ')
+WORD_LINE = re.compile(rb'^[^\S\n]*\S', re.MULTILINE)  # start of each non-blank line
+
+
+class WordSource:
+    """Read-only, memory-mapped word list (one word per line)
+
+    The file is mapped rather than read, and words are located through an
+    array of line offsets built on first use and cached next to the file as
+    ``<path>.idx``. Only the words actually asked for are decoded, so opening
+    a list of millions of words costs one index read.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._offsets: Optional[array] = None
+        self._file = None
+        self._map = None
+
+    def _open(self):
+        if self._offsets is not None:
+            return
+        stat = os.stat(self.path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        offsets = self._read_index(stat)
+        if offsets is None:
+            offsets = self._build_index()
+            self._write_index(stat, offsets)
+        self._offsets = offsets
+
+    def _read_index(self, stat) -> Optional[array]:
+        try:
+            with open(self.index_path, 'rb') as f:
+                header = f.read(INDEX_HEADER.size)
+                if len(header) < INDEX_HEADER.size:
+                    return None
+                magic, mtime_ns, size, count = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC or mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(f, count)
+                return offsets
+        except (OSError, EOFError):
+            return None
+
+    def _write_index(self, stat, offsets: array):
+        header = INDEX_HEADER.pack(INDEX_MAGIC, stat.st_mtime_ns, stat.st_size, len(offsets))
+        try:
+            atomic_write(self.index_path, header + offsets.tobytes())
+        except OSError:
+            pass  # read-only location: the index is rebuilt on the next start
+
+    def _build_index(self) -> array:
+        """Offsets of every line that has a non-blank word"""
+        return array('Q', (m.start() for m in WORD_LINE.finditer(self._map)))
+
+    def __len__(self) -> int:
+        self._open()
+        return len(self._offsets)
+
+    def __getitem__(self, i: int) -> str:
+        self._open()
+        start = self._offsets[i]
+        end = self._map.find(b'\n', start)
+        if end < 0:
+            end = len(self._map)
+        return self._map[start:end].decode('utf-8').strip()
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def random(self, rng: Optional[random.Random] = None) -> str:
+        """A uniformly random word, decoding only that word"""
+        rng = rng or random
+        return self[rng.randrange(len(self))]
+
+    def close(self):
+        if self._map:
+            self._map.close()
+        if self._file:
+            self._file.close()
+        self._offsets = self._map = self._file = None